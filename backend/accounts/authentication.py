@@ -0,0 +1,84 @@
+from django.utils.functional import cached_property
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from accounts.models import User
+from accounts.services.revocation_service import is_revoked, is_user_revoked
+from accounts.tokens import CLAIMS
+
+
+class TokenPrincipal:
+    """
+    Authenticated user built from a validated access token.
+
+    ``pk`` / ``id``, ``role``, ``is_active``, ``client_id`` and
+    ``staff_id`` come from the token's signed claims, which is all permission checks and for_user()
+    scoping need. Any other attribute (``username``, ``email``, ...) loads
+    the User row once, on first access.
+    """
+
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, token):
+        self.token = token
+        self.pk = self.id = token[api_settings.USER_ID_CLAIM]
+        self.role = token["role"]
+        self.is_active = token["is_active"]
+        self.client_id = token.get("client_id")
+        self.staff_id = token.get("staff_id")
+
+    @cached_property
+    def user(self):
+        return User.objects.get(**{api_settings.USER_ID_FIELD: self.pk})
+
+    def __getattr__(self, name):
+        # Only reached for attributes not set above
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.user, name)
+
+    def __eq__(self, other):
+        return getattr(other, "pk", None) == self.pk
+
+    def __hash__(self):
+        return hash(self.pk)
+
+    def __str__(self):
+        return f"user {self.pk} - {self.role}"
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that serves requests from the token's claims
+    instead of loading the User row: no auth queries per request.
+
+    Tokens issued without the claims (before ClaimsRefreshToken) still
+    authenticate through the database lookup. Revoked access tokens
+    (logout, and every token of a deactivated or deleted user) are
+    rejected via the in-process revocation index.
+    """
+
+    def get_validated_token(self, raw_token):
+        token = super().get_validated_token(raw_token)
+
+        if (
+            is_revoked(token[api_settings.JTI_CLAIM])
+            or is_user_revoked(token[api_settings.USER_ID_CLAIM], token["iat"])
+        ):
+            raise InvalidToken("Token has been revoked.")
+
+        return token
+
+    def get_user(self, validated_token):
+        if not all(claim in validated_token for claim in CLAIMS):
+            return super().get_user(validated_token)
+
+        principal = TokenPrincipal(validated_token)
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not principal.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+
+        return principal
@@ -0,0 +1,55 @@
+"""
+Fixed-size bloom filter over strings.
+
+``m`` bits and ``k`` probes are derived from the expected number of
+items and the target false-positive rate. Probes use double hashing
+over one blake2b digest, so a lookup is one hash plus ``k`` bit tests
+whatever the number of items. A negative answer is exact; a positive
+one may be false with roughly the target probability.
+"""
+import hashlib
+import math
+
+
+class BloomFilter:
+
+    def __init__(self, capacity, error_rate=0.01):
+        capacity = max(capacity, 1)
+
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.probes = max(1, round(self.size / capacity * math.log(2)))
+        self.capacity = capacity
+        self.count = 0
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+
+        return ((first + i * second) % self.size for i in range(self.probes))
+
+    def add(self, item):
+        """
+        Add ``item``; re-adding an item does not count it twice.
+
+        ``count`` only grows when a bit is set, so a new item that is a
+        false positive is not counted: it runs slightly below the true
+        number of items (by about the false-positive rate).
+        """
+        added = False
+
+        for position in self._positions(item):
+            mask = 1 << (position & 7)
+            if not self.bits[position >> 3] & mask:
+                self.bits[position >> 3] |= mask
+                added = True
+
+        if added:
+            self.count += 1
+
+    def __contains__(self, item):
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
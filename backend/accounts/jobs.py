@@ -0,0 +1,7 @@
+from core.services.job_service import job
+from accounts.services.revocation_service import compact_expired_tokens
+
+
+@job("accounts.compact_tokens", timeout=1800)
+def compact_tokens():
+    compact_expired_tokens()
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from accounts.services.revocation_service import COMPACT_BATCH_SIZE, compact_expired_tokens
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired refresh token (outstanding / blacklisted) and "
+        "revoked access token rows in small batches. Safe to run while "
+        "the API is serving; schedule it (e.g. hourly cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=COMPACT_BATCH_SIZE,
+            help="Rows deleted per transaction.",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.0,
+            help="Seconds to sleep between batches.",
+        )
+
+    def handle(self, *args, **options):
+        deleted = compact_expired_tokens(
+            batch_size=options["batch_size"],
+            pause=options["pause"],
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Deleted {deleted['outstanding']} expired refresh tokens and "
+            f"{deleted['revoked_access']} expired revoked access tokens."
+        ))
@@ -1 +1,2 @@
-from .user import User
\ No newline at end of file
+from .user import User
+from .revoked_token import RevokedAccessToken
\ No newline at end of file
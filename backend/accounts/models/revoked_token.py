@@ -0,0 +1,17 @@
+from django.db import models
+
+
+class RevokedAccessToken(models.Model):
+    """
+    Access tokens revoked before they expire (logout). Checked on every
+    request through the in-process bloom filter in
+    accounts.services.revocation_service; rows past ``expires_at`` are
+    removed by ``compact_tokens``.
+    """
+
+    jti = models.CharField(max_length=255, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return self.jti
@@ -1 +1,2 @@
-from .profile_serializer import *
\ No newline at end of file
+from .profile_serializer import *
+from .token_serializer import *
\ No newline at end of file
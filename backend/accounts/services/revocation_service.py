@@ -0,0 +1,214 @@
+"""
+Access token revocation and token table compaction.
+
+Revoked access token ids (``jti``) live in RevokedAccessToken. Each
+process mirrors them in a bloom filter, so checking a request's token
+costs one hash and a few bit tests. Only a filter hit (a revoked token
+or a rare false positive) is confirmed against the table.
+
+The filter is refreshed incrementally: at most every REFRESH_SECONDS it
+loads the rows revoked since the newest one it has seen (minus
+COMMIT_SLACK, for transactions that committed late). It is
+rebuilt from scratch every REBUILD_SECONDS, or once it fills past its
+capacity, so compacted rows fall out of it. Other processes therefore
+see a revocation within REFRESH_SECONDS; the revoking process sees it
+immediately.
+
+Deactivating or deleting a user revokes all of their access tokens at
+once: a row keyed ``user:<id>`` rejects every token issued to them
+before its ``revoked_at``, until the longest of those tokens expires.
+"""
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from accounts.bloom import BloomFilter
+from accounts.models import RevokedAccessToken
+
+
+REFRESH_SECONDS = 2.0
+COMMIT_SLACK = timedelta(minutes=1)
+REBUILD_SECONDS = 60 * 60
+MIN_CAPACITY = 1024
+
+COMPACT_BATCH_SIZE = 1000
+
+
+class RevocationIndex:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.bloom = None
+        self.watermark = None
+        self.refreshed_at = 0.0
+        self.rebuilt_at = 0.0
+
+    def rebuild(self):
+        rows = list(RevokedAccessToken.objects.values_list("jti", "revoked_at"))
+
+        # Room to grow before the false-positive rate degrades
+        bloom = BloomFilter(max(MIN_CAPACITY, 2 * len(rows)))
+        for jti, _ in rows:
+            bloom.add(jti)
+
+        self.bloom = bloom
+        self.watermark = max((revoked_at for _, revoked_at in rows), default=None)
+        self.rebuilt_at = self.refreshed_at = time.monotonic()
+
+    def refresh(self):
+        rows = RevokedAccessToken.objects.values_list("jti", "revoked_at")
+        if self.watermark is not None:
+            rows = rows.filter(revoked_at__gte=self.watermark - COMMIT_SLACK)
+
+        for jti, revoked_at in rows:
+            # Rows inside the slack window are seen again; adds are idempotent
+            self.bloom.add(jti)
+            self.watermark = max(self.watermark or revoked_at, revoked_at)
+
+        self.refreshed_at = time.monotonic()
+
+    def sync(self):
+        now = time.monotonic()
+
+        if self.bloom is not None and now - self.refreshed_at < REFRESH_SECONDS:
+            return
+
+        with self.lock:
+            if (
+                self.bloom is None
+                or now - self.rebuilt_at >= REBUILD_SECONDS
+                or self.bloom.count >= self.bloom.capacity
+            ):
+                self.rebuild()
+            elif now - self.refreshed_at >= REFRESH_SECONDS:
+                self.refresh()
+
+    def add(self, jti):
+        with self.lock:
+            if self.bloom is not None:
+                self.bloom.add(jti)
+
+    def might_contain(self, jti):
+        self.sync()
+        return jti in self.bloom
+
+
+index = RevocationIndex()
+
+
+def is_revoked(jti):
+    if not index.might_contain(jti):
+        return False
+
+    # Filter hit: confirm (false positives are possible)
+    return RevokedAccessToken.objects.filter(jti=jti).exists()
+
+
+def revoke_access_token(token):
+    """
+    Revoke a validated access token until it expires.
+    """
+    jti = token["jti"]
+    expires_at = datetime.fromtimestamp(token["exp"], tz=dt_timezone.utc)
+
+    RevokedAccessToken.objects.get_or_create(jti=jti, defaults={"expires_at": expires_at})
+    transaction.on_commit(lambda: index.add(jti))
+
+
+def user_key(user_id):
+    return f"user:{user_id}"
+
+
+def is_user_revoked(user_id, issued_at):
+    """
+    True when the user's tokens were revoked at or after ``issued_at``
+    (the token's ``iat``, a timestamp).
+    """
+    key = user_key(user_id)
+    if not index.might_contain(key):
+        return False
+
+    return RevokedAccessToken.objects.filter(
+        jti=key,
+        revoked_at__gte=datetime.fromtimestamp(issued_at, tz=dt_timezone.utc),
+    ).exists()
+
+
+def revoke_user_tokens(user_id):
+    """
+    Revoke every token issued to the user so far: their access tokens
+    (until the last one expires) and outstanding refresh tokens.
+    """
+    now = timezone.now()
+    key = user_key(user_id)
+
+    RevokedAccessToken.objects.update_or_create(
+        jti=key,
+        defaults={"revoked_at": now, "expires_at": now + api_settings.ACCESS_TOKEN_LIFETIME},
+    )
+
+    BlacklistedToken.objects.bulk_create(
+        [
+            BlacklistedToken(token_id=token_id)
+            for token_id in OutstandingToken.objects.filter(
+                user_id=user_id, expires_at__gt=now, blacklistedtoken__isnull=True,
+            ).values_list("id", flat=True)
+        ],
+        ignore_conflicts=True,
+    )
+
+    transaction.on_commit(lambda: index.add(key))
+
+
+# ---------------------------------------------------
+# Compaction
+# ---------------------------------------------------
+def compact_expired_tokens(batch_size=COMPACT_BATCH_SIZE, pause=0.0):
+    """
+    Delete expired outstanding / blacklisted refresh tokens and revoked
+    access tokens, ``batch_size`` rows per short transaction, so no long
+    lock is held on the token tables. Returns rows deleted per model.
+    """
+    now = timezone.now()
+
+    return {
+        "outstanding": _delete_in_batches(
+            OutstandingToken.objects.filter(expires_at__lte=now),
+            batch_size,
+            pause,
+            # Blacklist rows first: one DELETE each instead of a cascade collect
+            before=lambda ids: BlacklistedToken.objects.filter(token_id__in=ids).delete(),
+        ),
+        "revoked_access": _delete_in_batches(
+            RevokedAccessToken.objects.filter(expires_at__lte=now),
+            batch_size,
+            pause,
+        ),
+    }
+
+
+def _delete_in_batches(queryset, batch_size, pause, before=None):
+    deleted = 0
+
+    while True:
+        with transaction.atomic():
+            ids = list(queryset.order_by("id").values_list("id", flat=True)[:batch_size])
+
+            if not ids:
+                return deleted
+
+            if before:
+                before(ids)
+
+            queryset.model.objects.filter(id__in=ids).delete()
+
+        deleted += len(ids)
+
+        if pause:
+            # Let other writers through between batches
+            time.sleep(pause)
@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.services.revocation_service import revoke_user_tokens
+
+
+# Claims tokens are served without loading the User row, so a
+# deactivated or deleted user's tokens are revoked outright
+@receiver(post_save, sender="accounts.User")
+def revoke_inactive_user_tokens(sender, instance, created, **kwargs):
+    if not created and not instance.is_active:
+        revoke_user_tokens(instance.pk)
+
+
+@receiver(post_delete, sender="accounts.User")
+def revoke_deleted_user_tokens(sender, instance, **kwargs):
+    revoke_user_tokens(instance.pk)
@@ -1,3 +1,221 @@
+import io
+import time
+import uuid
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from accounts.bloom import BloomFilter
+from accounts.models import RevokedAccessToken, User
+from accounts.services import revocation_service
+from accounts.services.revocation_service import index as revocation_index, user_key
+from accounts.tokens import ClaimsRefreshToken
+
+
+class AccessTokenTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("agent", role=User.Role.STAFF)
+        cls.other = User.objects.create_user("admin", role=User.Role.ADMIN)
+
+    def setUp(self):
+        revocation_index.rebuild()
+
+    def get_me(self, token):
+        api = APIClient()
+        api.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        return api.get("/api/me/")
+
+    def refresh(self, refresh):
+        return APIClient().post("/api/token/refresh/", {"refresh": str(refresh)}, format="json")
+
+    def deactivate(self, user):
+        with self.captureOnCommitCallbacks(execute=True):
+            user.is_active = False
+            user.save()
+
+    def test_claims(self):
+        refresh = ClaimsRefreshToken.for_user(self.user)
+        token = refresh.access_token
+
+        self.assertEqual(token["role"], User.Role.STAFF)
+        self.assertIs(token["is_active"], True)
+
+        self.assertEqual(self.get_me(token).status_code, 200)
+
+    def test_deactivation_revokes_tokens(self):
+        refresh = ClaimsRefreshToken.for_user(self.user)
+        token = refresh.access_token
+        other_token = ClaimsRefreshToken.for_user(self.other).access_token
+
+        self.deactivate(self.user)
+
+        self.assertEqual(self.get_me(token).status_code, 401)
+        self.assertEqual(self.refresh(refresh).status_code, 401)
+        self.assertEqual(self.get_me(other_token).status_code, 200)
+
+        # Reactivated later: new tokens work, old refresh tokens stay revoked
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = True
+            self.user.save()
+        RevokedAccessToken.objects.filter(jti=user_key(self.user.pk)).update(
+            revoked_at=timezone.now() - timedelta(minutes=5),
+        )
+
+        self.assertEqual(self.get_me(ClaimsRefreshToken.for_user(self.user).access_token).status_code, 200)
+        self.assertEqual(self.refresh(refresh).status_code, 401)
+
+    def test_inactive_claim_rejected(self):
+        token = ClaimsRefreshToken.for_user(self.user).access_token
+        token["is_active"] = False
+
+        response = self.get_me(token)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()["detail"], "User is inactive")
+
+    def test_deletion_revokes_tokens(self):
+        token = ClaimsRefreshToken.for_user(self.user).access_token
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.delete()
+
+        self.assertEqual(self.get_me(token).status_code, 401)
+
+    def test_logout_revokes_access_token(self):
+        refresh = ClaimsRefreshToken.for_user(self.user)
+        token = refresh.access_token
+        other_token = ClaimsRefreshToken.for_user(self.user).access_token
+
+        api = APIClient()
+        api.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        with self.captureOnCommitCallbacks(execute=True):
+            response = api.post("/api/logout/", {"refresh": str(refresh)}, format="json")
+        self.assertEqual(response.status_code, 205, response.content)
+
+        self.assertTrue(RevokedAccessToken.objects.filter(jti=token["jti"]).exists())
+        self.assertEqual(self.get_me(token).status_code, 401)
+        self.assertEqual(self.refresh(refresh).status_code, 401)
+
+        # Other sessions of the same user are unaffected
+        self.assertEqual(self.get_me(other_token).status_code, 200)
+
+
+class RevocationIndexTests(TestCase):
+
+    def setUp(self):
+        # Loaded again from the database on next use
+        self.addCleanup(setattr, revocation_index, "bloom", None)
+
+    def revoke(self, jti, revoked_at=None, expires_in=timedelta(minutes=5)):
+        row = RevokedAccessToken.objects.create(jti=jti, expires_at=timezone.now() + expires_in)
+        if revoked_at is not None:
+            RevokedAccessToken.objects.filter(pk=row.pk).update(revoked_at=revoked_at)
+        return jti
+
+    def test_bloom_has_no_false_negatives(self):
+        bloom = BloomFilter(500)
+        items = [uuid.uuid4().hex for _ in range(500)]
+
+        for item in items:
+            bloom.add(item)
+        count = bloom.count
+        bloom.add(items[0])
+
+        self.assertTrue(all(item in bloom for item in items))
+        # New items that are false positives go uncounted
+        self.assertEqual(bloom.count, count)
+        self.assertGreater(count, 480)
+        self.assertLessEqual(count, 500)
+
+        # Around the 1% target past the items it holds
+        false_positives = sum(uuid.uuid4().hex in bloom for _ in range(5000))
+        self.assertLess(false_positives, 150)
+
+    def test_add_and_incremental_refresh(self):
+        index = revocation_index  # is_revoked() goes through the module's index
+        first = self.revoke("first")
+        index.rebuild()
+
+        # Revoked in this process: visible at once
+        index.add("added")
+        self.assertIn("added", index.bloom)
+
+        # Committed late by another process: older than the newest row
+        # seen, but inside COMMIT_SLACK
+        watermark = RevokedAccessToken.objects.get(jti=first).revoked_at
+        late = self.revoke("late", revoked_at=watermark - revocation_service.COMMIT_SLACK / 2)
+        later = self.revoke("later")
+
+        index.refreshed_at = 0.0
+        self.assertTrue(index.might_contain(late))
+        self.assertTrue(index.might_contain(later))
+        self.assertTrue(index.might_contain(first))
+        self.assertTrue(index.might_contain("added"))
+
+        self.assertTrue(revocation_service.is_revoked(later))
+        self.assertFalse(revocation_service.is_revoked("never"))
+
+    def test_rebuild_drops_expired_entries(self):
+        index = revocation_service.RevocationIndex()
+        expired = self.revoke("expired", expires_in=-timedelta(seconds=1))
+        live = self.revoke("live")
+        index.rebuild()
+
+        revocation_service.compact_expired_tokens()
+
+        # Refreshes only add; the periodic rebuild forgets compacted rows
+        index.refreshed_at = 0.0
+        self.assertTrue(index.might_contain(expired))
+
+        index.refreshed_at = 0.0
+        index.rebuilt_at = time.monotonic() - revocation_service.REBUILD_SECONDS - 1
+        self.assertFalse(index.might_contain(expired))
+        self.assertTrue(index.might_contain(live))
+
+
+class CompactTokensTests(TestCase):
+
+    def test_deletes_expired_tokens_in_batches(self):
+        user = User.objects.create_user("agent", role=User.Role.STAFF)
+        now = timezone.now()
+
+        def outstanding(expires_at, blacklisted=False):
+            token = OutstandingToken.objects.create(
+                user=user, jti=uuid.uuid4().hex, token="x", expires_at=expires_at,
+            )
+            if blacklisted:
+                BlacklistedToken.objects.create(token=token)
+            return token
+
+        expired = [outstanding(now - timedelta(days=1), blacklisted=i % 2 == 0) for i in range(5)]
+        live = [outstanding(now + timedelta(days=1)), outstanding(now + timedelta(days=1), blacklisted=True)]
+
+        RevokedAccessToken.objects.bulk_create([
+            RevokedAccessToken(jti=f"old-{i}", expires_at=now - timedelta(minutes=1)) for i in range(3)
+        ] + [RevokedAccessToken(jti="current", expires_at=now + timedelta(minutes=5))])
+
+        out = io.StringIO()
+        with CaptureQueriesContext(connection) as ctx:
+            call_command("compact_tokens", batch_size=2, stdout=out)
+
+        self.assertIn("Deleted 5 expired refresh tokens and 3 expired revoked access tokens.", out.getvalue())
+
+        self.assertEqual(
+            sorted(OutstandingToken.objects.values_list("id", flat=True)),
+            sorted(token.id for token in live),
+        )
+        self.assertEqual(list(BlacklistedToken.objects.values_list("token_id", flat=True)), [live[1].id])
+        self.assertEqual(list(RevokedAccessToken.objects.values_list("jti", flat=True)), ["current"])
+        self.assertFalse(OutstandingToken.objects.filter(id__in=[token.id for token in expired]).exists())
 
-# Create your tests here.
+        # Batches of 2: 5 refresh tokens in 3 DELETEs, 3 revoked rows in 2
+        deletes = [q["sql"].split(" WHERE")[0] for q in ctx.captured_queries if q["sql"].startswith("DELETE")]
+        self.assertEqual(deletes.count('DELETE FROM "token_blacklist_outstandingtoken"'), 3)
+        self.assertEqual(deletes.count('DELETE FROM "accounts_revokedaccesstoken"'), 2)
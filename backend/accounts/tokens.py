@@ -0,0 +1,49 @@
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.models import User
+
+
+# Claims ClaimsJWTAuthentication builds the request principal from
+CLAIMS = ("role", "is_active", "client_id", "staff_id")
+
+
+def user_claims(user):
+    from tickets.models import Client, Staff
+
+    return {
+        "role": user.role,
+        "is_active": user.is_active,
+        "client_id": Client.objects.filter(user=user).values_list("id", flat=True).first(),
+        "staff_id": Staff.objects.filter(user=user).values_list("id", flat=True).first(),
+    }
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """
+    Refresh token whose access tokens carry the user's ``role``,
+    ``is_active``, ``client_id`` and ``staff_id`` as signed claims.
+
+    Claims are re-read from the database whenever an access token is
+    minted (login and every refresh), so role or profile changes reach
+    clients within one access token lifetime.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token.payload.update(user_claims(user))
+        return token
+
+    @property
+    def access_token(self):
+        access = super().access_token
+
+        user = User.objects.filter(
+            **{api_settings.USER_ID_FIELD: self[api_settings.USER_ID_CLAIM]}
+        ).first()
+
+        if user is not None:
+            access.payload.update(user_claims(user))
+
+        return access
@@ -13,4 +13,15 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported once the apps are loaded
+from tickets.websocket import ticket_events_socket  # noqa: E402
+
+
+async def application(scope, receive, send):
+    # Django serves HTTP; the live ticket event socket is the only WebSocket
+    if scope["type"] == "websocket":
+        return await ticket_events_socket(scope, receive, send)
+
+    return await django_application(scope, receive, send)
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/6.0/ref/settings/
 
 from pathlib import Path
 import os
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -45,6 +46,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'django_filters',
 
 
@@ -104,6 +106,33 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+# Must be shared by every worker process: dashboard invalidations are
+# version bumps stored in the cache itself. Redis when REDIS_URL is set,
+# otherwise the database cache table (python manage.py createcachetable).
+#
+# Dashboard responses are only cached in Redis. In the database cache a
+# hit costs more queries than the rollup sums it replaces.
+
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv("REDIS_URL"),
+        }
+    }
+    DASHBOARD_CACHE_ENABLED = True
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'django_cache',
+        }
+    }
+    DASHBOARD_CACHE_ENABLED = False
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -142,11 +171,74 @@ STATIC_URL = 'static/'
 
 AUTH_USER_MODEL = 'accounts.User'
 
+# Tickets CLOSED longer than this are moved to the archive tables
+# (python manage.py archive_tickets)
+TICKET_ARCHIVE_AFTER_DAYS = int(os.getenv("TICKET_ARCHIVE_AFTER_DAYS", "180"))
+
+# Assign new tickets to the least-loaded active staff for their issue
+TICKET_AUTO_ASSIGN = os.getenv("TICKET_AUTO_ASSIGN", "True") == "True"
+
+# Broker fanning live ticket events out to every worker's event streams.
+# Empty: PostgreSQL LISTEN/NOTIFY on PostgreSQL, otherwise in-process
+# (single process, tests). Or a dotted path, e.g.
+# tickets.event_brokers.InProcessBroker
+TICKET_EVENTS_BROKER = os.getenv("TICKET_EVENTS_BROKER", "")
+
+WHATSAPP_API_URL = os.getenv("WHATSAPP_API_URL", "")
+WHATSAPP_API_TOKEN = os.getenv("WHATSAPP_API_TOKEN", "")
+
+# Client notifications on ticket assignment / start / resolution
+# (delivered by python manage.py send_notifications). WhatsApp is only on
+# by default once the Cloud API is configured
+CLIENT_NOTIFICATION_CHANNELS = [
+    channel for channel in
+    os.getenv(
+        "CLIENT_NOTIFICATION_CHANNELS",
+        "email,whatsapp" if WHATSAPP_API_TOKEN else "email",
+    ).split(",")
+    if channel
+]
+
+if "whatsapp" in CLIENT_NOTIFICATION_CHANNELS and not (WHATSAPP_API_URL and WHATSAPP_API_TOKEN):
+    raise ImproperlyConfigured(
+        "The whatsapp notification channel needs WHATSAPP_API_URL and WHATSAPP_API_TOKEN"
+    )
+
+NOTIFICATION_BACKENDS = {
+    'email': 'tickets.notification_backends.EmailBackend',
+    'whatsapp': 'tickets.notification_backends.WhatsAppCloudBackend',
+}
+
+# Sends per second, per channel
+NOTIFICATION_RATE_LIMITS = {
+    'email': float(os.getenv("EMAIL_RATE_LIMIT", "10")),
+    'whatsapp': float(os.getenv("WHATSAPP_RATE_LIMIT", "20")),
+}
+
+EMAIL_BACKEND = os.getenv("EMAIL_BACKEND", "django.core.mail.backends.smtp.EmailBackend")
+EMAIL_HOST = os.getenv("EMAIL_HOST", "localhost")
+EMAIL_PORT = int(os.getenv("EMAIL_PORT", "25"))
+EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER", "")
+EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", "")
+EMAIL_USE_TLS = os.getenv("EMAIL_USE_TLS") == "True"
+DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", "webmaster@localhost")
+
+# Background jobs (python manage.py run_jobs): {job name: seconds between runs}
+JOB_SCHEDULE = {
+    'tickets.send_notifications': 30,
+    'accounts.compact_tokens': 3600,
+    'core.prune_jobs': 86400,
+}
+
+# Finished jobs are deleted after this many days (core.prune_jobs)
+JOB_RETENTION_DAYS = int(os.getenv("JOB_RETENTION_DAYS", "7"))
+
 from datetime import timedelta
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # JWT whose role / client / staff claims stand in for the User row
+        'accounts.authentication.ClaimsJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -161,11 +253,18 @@ REST_FRAMEWORK = {
     ),
 }
 
+# Access tokens carry the user's role / is_active / profile ids as claims
+# (accounts.tokens) and are served without loading the User row.
+# Deactivating or deleting a user revokes their tokens at once (other
+# processes see it within a couple of seconds); a role or profile change
+# reaches the claims on the next refresh, i.e. within ACCESS_TOKEN_LIFETIME.
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
+    "TOKEN_OBTAIN_SERIALIZER": "accounts.serializers.ClaimsTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "accounts.serializers.ClaimsTokenRefreshSerializer",
 }
 
 CORS_ALLOW_ALL_ORIGINS = True
\ No newline at end of file
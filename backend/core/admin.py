@@ -1,7 +1,18 @@
 from django.contrib import admin
-from .models import CompanyType, Issue, SubIssue
+from .models import CompanyType, Issue, Job, SubIssue
 
 
 admin.site.register(CompanyType)
 admin.site.register(Issue)
-admin.site.register(SubIssue)
+
+
+@admin.register(SubIssue)
+class SubIssueAdmin(admin.ModelAdmin):
+    list_select_related = ("issue",)
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("id", "name", "queue", "state", "priority", "attempts", "run_at", "finished_at")
+    list_filter = ("state", "queue", "name")
+    search_fields = ("name", "key")
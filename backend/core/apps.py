@@ -3,3 +3,11 @@ from django.apps import AppConfig
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        from django.utils.module_loading import autodiscover_modules
+
+        from core import signals  # noqa: F401
+
+        # Register every app's background jobs (core.services.job_service)
+        autodiscover_modules("jobs")
@@ -0,0 +1,81 @@
+"""
+Async read views for ASGI deployments.
+
+DRF views are synchronous, so under an ASGI server each one runs in a
+thread from start to finish. AsyncAPIView is a plain Django async view
+that serves the same responses (authentication, permissions, JSON
+bodies and errors) from the event loop, so a request only holds a
+thread while a query or token check runs, not while it waits, renders
+or sits in the cache. tickets.async_api adds conditional GET and list
+views on top.
+"""
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+
+
+class AsyncAPIView(View):
+    """
+    Async counterpart of APIView for read-only endpoints.
+    """
+
+    http_method_names = ["get", "head", "options"]
+
+    authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    permission_classes = [IsAuthenticated]
+    renderer = JSONRenderer()
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            await self.initial(request)
+            response = await super().dispatch(request, *args, **kwargs)
+        except exceptions.APIException as exc:
+            response = self.handle_exception(request, exc)
+
+        return response
+
+    async def initial(self, request):
+        # Claims tokens need no query; the revocation index and tokens
+        # without claims may, so validation runs off the event loop
+        request.user, request.auth = await sync_to_async(self.authenticate)(request)
+
+        for permission in (permission_class() for permission_class in self.permission_classes):
+            if not permission.has_permission(request, self):
+                if request.auth is None:
+                    raise exceptions.NotAuthenticated()
+                raise exceptions.PermissionDenied(getattr(permission, "message", None))
+
+    def authenticate(self, request):
+        for authenticator in self.get_authenticators():
+            user_auth = authenticator.authenticate(request)
+            if user_auth is not None:
+                return user_auth
+
+        return AnonymousUser(), None
+
+    def get_authenticators(self):
+        return [auth() for auth in self.authentication_classes]
+
+    def handle_exception(self, request, exc):
+        # Same body and headers as DRF's exception handler
+        data = exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+        response = self.render(data, status=exc.status_code)
+
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            authenticators = self.get_authenticators()
+            if authenticators:
+                response.headers["WWW-Authenticate"] = authenticators[0].authenticate_header(request)
+
+        return response
+
+    def render(self, data, status=200):
+        return HttpResponse(
+            self.renderer.render(data),
+            status=status,
+            content_type=self.renderer.media_type,
+        )
@@ -0,0 +1,8 @@
+from django.conf import settings
+
+from core.services.job_service import job, prune_finished
+
+
+@job("core.prune_jobs")
+def prune_jobs(days=None):
+    prune_finished(settings.JOB_RETENTION_DAYS if days is None else days)
@@ -0,0 +1,86 @@
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+
+from core.services.job_service import BATCH_SIZE, schedule_periodic, work
+
+
+class Command(BaseCommand):
+    help = (
+        "Run background jobs from the jobs table until stopped (SIGINT / "
+        "SIGTERM finish the jobs in hand first). Any number of workers can "
+        "run side by side."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--queue",
+            action="append",
+            dest="queues",
+            help="Queue to work on (repeatable; default: default).",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=4,
+            help="Worker threads, each running one job at a time.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help=(
+                "Jobs a thread claims per query. Claimed jobs wait for the "
+                "ones before them, so keep it small for long jobs."
+            ),
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds a thread waits when nothing is due.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Run every job currently due, then exit.",
+        )
+
+    def handle(self, *args, **options):
+        stop = threading.Event()
+
+        if not options["once"]:
+            schedule_periodic()
+
+            def request_stop(signum, frame):
+                self.stdout.write("Stopping after the jobs in hand...")
+                stop.set()
+
+            signal.signal(signal.SIGINT, request_stop)
+            signal.signal(signal.SIGTERM, request_stop)
+
+        threads = [
+            threading.Thread(
+                target=work,
+                name=f"jobs-{n}",
+                args=(stop,),
+                kwargs={
+                    "queues": tuple(options["queues"] or ["default"]),
+                    "batch_size": options["batch_size"],
+                    "interval": options["interval"],
+                    "once": options["once"],
+                },
+            )
+            for n in range(options["concurrency"])
+        ]
+
+        for thread in threads:
+            thread.start()
+
+        # join() with a timeout keeps the main thread responsive to signals
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(timeout=1.0)
+
+        self.stdout.write(self.style.SUCCESS("Workers stopped."))
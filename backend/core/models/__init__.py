@@ -1,4 +1,5 @@
 from .base import TimeStampedModel
 from .company_type import CompanyType
 from .issue import Issue
-from .sub_issue import SubIssue
\ No newline at end of file
+from .sub_issue import SubIssue
+from .job import Job
@@ -2,8 +2,84 @@ from django.db import models
 
 
 class TimeStampedModel(models.Model):
+    """
+    Adds created/updated timestamps and change tracking.
+
+    Instances loaded from the database remember each loaded field's
+    original value, so ``save()`` writes only the changed columns and
+    callers can inspect the previous value without another query.
+    """
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        abstract = True
\ No newline at end of file
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot(field_names)
+        return instance
+
+    def _snapshot(self, attnames=None):
+        if attnames is None:
+            deferred = self.get_deferred_fields()
+            attnames = [
+                field.attname
+                for field in self._meta.concrete_fields
+                if field.attname not in deferred
+            ]
+
+        loaded = getattr(self, "_loaded_values", None) or {}
+        loaded.update({attname: getattr(self, attname) for attname in attnames})
+        self._loaded_values = loaded
+
+    @property
+    def is_tracked(self):
+        """
+        True when the original field values are known (loaded or saved).
+        """
+        return getattr(self, "_loaded_values", None) is not None
+
+    def get_original_value(self, attname):
+        return self._loaded_values[attname]
+
+    def get_changed_fields(self):
+        """
+        Attnames (``status``, ``assigned_to_id``, ...) whose value differs
+        from the one loaded from the database.
+        """
+        return [
+            attname
+            for attname, original in self._loaded_values.items()
+            if getattr(self, attname) != original
+        ]
+
+    def save(self, *args, **kwargs):
+        if (
+            self.is_tracked
+            and not self._state.adding
+            and not kwargs.get("force_insert")
+            and kwargs.get("update_fields") is None
+        ):
+            changed = self.get_changed_fields()
+            # An empty list makes Django skip the UPDATE entirely.
+            kwargs["update_fields"] = changed + ["updated_at"] if changed else []
+
+        super().save(*args, **kwargs)
+
+        update_fields = kwargs.get("update_fields")
+        self._snapshot(
+            [self._meta.get_field(name).attname for name in update_fields]
+            if update_fields is not None and self.is_tracked
+            else None
+        )
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        self._snapshot(
+            [self._meta.get_field(name).attname for name in fields]
+            if fields is not None and self.is_tracked
+            else None
+        )
@@ -0,0 +1,73 @@
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+from .base import TimeStampedModel
+
+
+class Job(TimeStampedModel):
+    """
+    One run of a registered job function, executed by
+    ``python manage.py run_jobs`` (see core.services.job_service).
+    """
+
+    class State(models.TextChoices):
+        QUEUED = 'QUEUED', 'Queued'
+        RUNNING = 'RUNNING', 'Running'
+        DONE = 'DONE', 'Done'
+        FAILED = 'FAILED', 'Failed'
+
+    # Registered job name, e.g. "tickets.send_notifications"
+    name = models.CharField(max_length=100)
+
+    kwargs = models.JSONField(default=dict, blank=True)
+
+    queue = models.CharField(max_length=50, default='default')
+
+    # Higher runs first among due jobs
+    priority = models.SmallIntegerField(default=0)
+
+    state = models.CharField(
+        max_length=20,
+        choices=State.choices,
+        default=State.QUEUED
+    )
+
+    # Optional dedup key: at most one queued / running job per key
+    key = models.CharField(max_length=200, null=True, blank=True)
+
+    # QUEUED: when the job (or its retry) is due. RUNNING: when the
+    # worker's claim expires and another worker may pick the job up.
+    run_at = models.DateTimeField(default=timezone.now)
+
+    attempts = models.PositiveIntegerField(default=0)
+
+    max_attempts = models.PositiveIntegerField(default=5)
+
+    # Visibility timeout, in seconds
+    timeout = models.PositiveIntegerField(default=300)
+
+    locked_by = models.CharField(max_length=100, blank=True, default="")
+
+    last_error = models.TextField(blank=True, default="")
+
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # The workers' claim scan: due jobs of a queue, by priority
+            models.Index(
+                fields=["queue", "-priority", "run_at"],
+                condition=Q(state__in=['QUEUED', 'RUNNING']),
+                name="job_due_idx",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["key"],
+                condition=Q(state__in=['QUEUED', 'RUNNING']),
+                name="job_active_key_uniq",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} - {self.state}"
@@ -4,6 +4,13 @@ from .issue import Issue
 from smart_selects.db_fields import ChainedForeignKey
 
 
+class SubIssueQuerySet(models.QuerySet):
+
+    def with_issue(self):
+        # For listing rows by __str__, which reads issue.name
+        return self.select_related("issue")
+
+
 class SubIssue(TimeStampedModel):
 
     issue = models.ForeignKey(
@@ -13,5 +20,7 @@ class SubIssue(TimeStampedModel):
 
     name = models.CharField(max_length=150)
 
+    objects = SubIssueQuerySet.as_manager()
+
     def __str__(self):
-        return f"{self.issue.name} - {self.name}"
\ No newline at end of file
+        return f"{self.issue.name} - {self.name}"
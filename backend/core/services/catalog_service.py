@@ -0,0 +1,96 @@
+"""
+Issue catalog: every issue with its sub-issues and the number of active
+staff eligible for it, for ticket form dropdowns.
+
+The tree is built once per process and reused until the shared version
+key (in the default cache, so every worker sees it) is bumped by a
+change to Issue, SubIssue (core.signals) or Staff (tickets.signals).
+A request then costs one cache read.
+"""
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db.models import Count, Prefetch, Q
+
+from core.models import Issue, SubIssue
+
+
+VERSION_KEY = "catalog:version"
+
+_lock = threading.Lock()
+_catalog = None  # (version, tree)
+
+
+def get_version():
+    version = cache.get(VERSION_KEY)
+
+    if version is None:
+        # add() keeps a version another worker set in the meantime
+        cache.add(VERSION_KEY, time.time_ns(), None)
+        version = cache.get(VERSION_KEY)
+
+    return version
+
+
+def bump_version():
+    cache.set(VERSION_KEY, time.time_ns(), None)
+
+
+def get_catalog():
+    """
+    ``(version, [{"id", "name", "eligible_staff", "sub_issues": [{"id",
+    "name"}]}])``; the version doubles as the ETag.
+    """
+    global _catalog
+
+    version = get_version()
+    catalog = _catalog
+
+    if catalog is not None and catalog[0] == version:
+        return catalog
+
+    with _lock:
+        if _catalog is None or _catalog[0] != version:
+            _catalog = (version, build_catalog())
+
+        return _catalog
+
+
+async def aget_catalog():
+    """
+    Async get_catalog: only a missing or outdated tree leaves the event
+    loop.
+    """
+    version = await cache.aget(VERSION_KEY)
+    catalog = _catalog
+
+    if version is not None and catalog is not None and catalog[0] == version:
+        return catalog
+
+    return await sync_to_async(get_catalog)()
+
+
+def build_catalog():
+    issues = (
+        Issue.objects
+        .annotate(eligible_staff=Count("staff", filter=Q(staff__is_active=True)))
+        .prefetch_related(
+            Prefetch("subissue_set", queryset=SubIssue.objects.order_by("name", "id"))
+        )
+        .order_by("name")
+    )
+
+    return [
+        {
+            "id": issue.id,
+            "name": issue.name,
+            "eligible_staff": issue.eligible_staff,
+            "sub_issues": [
+                {"id": sub_issue.id, "name": sub_issue.name}
+                for sub_issue in issue.subissue_set.all()
+            ],
+        }
+        for issue in issues
+    ]
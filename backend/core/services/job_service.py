@@ -0,0 +1,310 @@
+"""
+Database-backed background jobs.
+
+Apps register job functions in a ``jobs`` module (autodiscovered like
+``admin``):
+
+    @job("tickets.archive_closed_tickets", timeout=3600)
+    def archive_closed_tickets(days=None): ...
+
+and queue runs with ``enqueue("tickets.archive_closed_tickets", days=90)``.
+The Job row is written in the caller's transaction, so a job queued by
+a rolled-back request never runs. ``python manage.py run_jobs`` executes
+them:
+
+- workers claim due jobs with SELECT ... FOR UPDATE SKIP LOCKED, so any
+  number of them can poll the table without blocking each other or
+  running a job twice;
+- a claim is a visibility timeout: a job whose worker died (or overran
+  ``timeout``) becomes due again once it expires. A batch is claimed in
+  one query, and each job's claim is renewed just before it runs, so
+  jobs queued behind a slow one in the same batch keep their full
+  timeout (or are skipped if another worker took them in the
+  meantime);
+- failures are retried with exponential backoff until ``max_attempts``;
+- ``run_at`` schedules a job for later, and settings.JOB_SCHEDULE
+  re-queues jobs periodically.
+
+Jobs may run more than once (a claim expiring under a slow job), so
+they should be idempotent. Concurrent workers need PostgreSQL; SQLite
+has no row locks.
+"""
+import logging
+import os
+import random
+import socket
+import threading
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, close_old_connections, connection, transaction
+from django.utils import timezone
+
+from core.models import Job
+
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 10
+
+ACTIVE_STATES = (Job.State.QUEUED, Job.State.RUNNING)
+
+BACKOFF_BASE_SECONDS = 10
+BACKOFF_MAX_SECONDS = 3600
+
+# name -> (function, options)
+registry = {}
+
+
+# ---------------------------------------------------
+# Registration / enqueueing
+# ---------------------------------------------------
+def job(name=None, *, max_attempts=5, timeout=300, queue="default"):
+    """
+    Register a job function under ``name`` (default "<app>.<function>").
+    ``timeout`` is the visibility timeout in seconds: how long a run may
+    take before another worker assumes it died.
+    """
+    def register(func):
+        job_name = name or f"{func.__module__.split('.')[0]}.{func.__name__}"
+        registry[job_name] = (func, {
+            "max_attempts": max_attempts,
+            "timeout": timeout,
+            "queue": queue,
+        })
+        func.job_name = job_name
+        return func
+
+    return register
+
+
+def enqueue(name, *, run_at=None, delay=None, priority=0, key=None, **kwargs):
+    """
+    Queue a run of job ``name`` with JSON-serialisable ``kwargs``, due at
+    ``run_at`` (or ``delay`` from now, or now). With ``key``, nothing is
+    queued while a queued / running job has the same key; returns the
+    Job, or None in that case.
+    """
+    name = getattr(name, "job_name", name)
+
+    if name not in registry:
+        raise ValueError(f"Unknown job {name!r}")
+
+    options = registry[name][1]
+
+    if run_at is None:
+        run_at = timezone.now() + (delay or timedelta())
+
+    new = Job(
+        name=name,
+        kwargs=kwargs,
+        queue=options["queue"],
+        priority=priority,
+        key=key,
+        run_at=run_at,
+        max_attempts=options["max_attempts"],
+        timeout=options["timeout"],
+    )
+
+    try:
+        with transaction.atomic():
+            new.save()
+    except IntegrityError:
+        # Another queued / running job holds the key
+        return None
+
+    return new
+
+
+def schedule_periodic():
+    """
+    Queue one run of every job in settings.JOB_SCHEDULE ({name: seconds})
+    that has none queued or running. Each run queues the next when it
+    finishes.
+    """
+    for name in settings.JOB_SCHEDULE:
+        if name in registry:
+            enqueue(name, key=_periodic_key(name))
+
+
+def _periodic_key(name):
+    return f"periodic:{name}"
+
+
+# ---------------------------------------------------
+# Worker side
+# ---------------------------------------------------
+def worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.current_thread().name}"[:100]
+
+
+def claim_batch(worker, queues=("default",), batch_size=BATCH_SIZE):
+    """
+    Claim up to ``batch_size`` due jobs (queued, or running with an
+    expired claim) for ``worker``.
+    """
+    now = timezone.now()
+
+    with transaction.atomic():
+        jobs = list(
+            Job.objects
+            .select_for_update(skip_locked=True)
+            .filter(queue__in=queues, state__in=ACTIVE_STATES, run_at__lte=now)
+            .order_by("-priority", "run_at")[:batch_size]
+        )
+
+        for claimed in jobs:
+            claimed.state = Job.State.RUNNING
+            claimed.attempts += 1
+            claimed.locked_by = worker
+            claimed.run_at = now + timedelta(seconds=claimed.timeout)
+            claimed.updated_at = now
+
+        if jobs:
+            Job.objects.bulk_update(jobs, ["state", "attempts", "locked_by", "run_at", "updated_at"])
+
+    return jobs
+
+
+def work(stop, queues=("default",), batch_size=BATCH_SIZE, interval=1.0, once=False):
+    """
+    Worker loop (one per thread): claim a batch, run it, repeat; wait
+    ``interval`` seconds when nothing is due. Returns when ``stop`` (a
+    threading.Event) is set or, with ``once``, when nothing is due.
+    """
+    worker = worker_id()
+
+    try:
+        while not stop.is_set():
+            # Drop connections that broke or outlived CONN_MAX_AGE
+            close_old_connections()
+
+            try:
+                jobs = claim_batch(worker, queues, batch_size)
+
+                for claimed in jobs:
+                    if renew(claimed):
+                        run(claimed)
+            except DatabaseError:
+                # Lost connection, lock timeout...: unrecorded jobs come
+                # back when their claim expires
+                logger.exception("Job worker database error")
+                stop.wait(interval)
+                continue
+
+            if not jobs:
+                if once:
+                    return
+                stop.wait(interval)
+    finally:
+        connection.close()
+
+
+def renew(claimed):
+    """
+    Restart ``claimed``'s visibility timeout before it runs. False when
+    the claim already expired and another worker reclaimed the job.
+    """
+    now = timezone.now()
+    renewed = _owned(claimed).update(
+        run_at=now + timedelta(seconds=claimed.timeout),
+        updated_at=now,
+    )
+
+    if not renewed:
+        logger.warning("Job %s was reclaimed before it ran", claimed)
+
+    return bool(renewed)
+
+
+def run(claimed):
+    """
+    Run a claimed job and record the outcome. Returns True on success.
+    """
+    entry = registry.get(claimed.name)
+
+    try:
+        if entry is None:
+            raise LookupError(f"Job {claimed.name!r} is not registered in this worker")
+
+        entry[0](**claimed.kwargs)
+    except Exception:
+        logger.exception("Job %s failed (attempt %s)", claimed, claimed.attempts)
+        _failed(claimed, traceback.format_exc())
+        return False
+
+    _finish(claimed, Job.State.DONE)
+    return True
+
+
+def backoff(attempts):
+    delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** (attempts - 1))
+    return timedelta(seconds=random.uniform(delay / 2, delay))
+
+
+def _owned(claimed):
+    # Still ours: no other worker reclaimed it after our claim expired
+    return Job.objects.filter(
+        pk=claimed.pk,
+        state=Job.State.RUNNING,
+        locked_by=claimed.locked_by,
+        attempts=claimed.attempts,
+    )
+
+
+def _finish(claimed, state, error=""):
+    now = timezone.now()
+
+    with transaction.atomic():
+        updated = _owned(claimed).update(
+            state=state,
+            last_error=error,
+            finished_at=now,
+            updated_at=now,
+        )
+
+        if updated and claimed.key == _periodic_key(claimed.name):
+            every = settings.JOB_SCHEDULE.get(claimed.name)
+            if every:
+                enqueue(claimed.name, key=claimed.key, delay=timedelta(seconds=every))
+
+    if not updated:
+        logger.warning("Job %s finished after its claim expired", claimed)
+
+
+def _failed(claimed, error):
+    if claimed.attempts >= claimed.max_attempts:
+        _finish(claimed, Job.State.FAILED, error)
+        return
+
+    now = timezone.now()
+    _owned(claimed).update(
+        state=Job.State.QUEUED,
+        last_error=error,
+        run_at=now + backoff(claimed.attempts),
+        updated_at=now,
+    )
+
+
+# ---------------------------------------------------
+# Housekeeping
+# ---------------------------------------------------
+def prune_finished(days, batch_size=1000):
+    """
+    Delete DONE / FAILED jobs finished more than ``days`` ago, in batches.
+    Returns the number of jobs deleted.
+    """
+    before = timezone.now() - timedelta(days=days)
+    finished = Job.objects.filter(
+        state__in=(Job.State.DONE, Job.State.FAILED),
+        finished_at__lt=before,
+    )
+    deleted = 0
+
+    while True:
+        ids = list(finished.order_by("id").values_list("id", flat=True)[:batch_size])
+        if not ids:
+            return deleted
+
+        deleted += Job.objects.filter(id__in=ids).delete()[0]
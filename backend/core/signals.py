@@ -0,0 +1,15 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.services.catalog_service import bump_version
+
+
+# Any change to the catalog's rows (admin, shell or queryset delete)
+# invalidates every process's cached copy once it commits.
+@receiver(post_save, sender="core.Issue")
+@receiver(post_delete, sender="core.Issue")
+@receiver(post_save, sender="core.SubIssue")
+@receiver(post_delete, sender="core.SubIssue")
+def invalidate_catalog(sender, **kwargs):
+    transaction.on_commit(bump_version)
@@ -1,3 +1,152 @@
-from django.test import TestCase
+import threading
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.models import Job
+from core.services import job_service
+
+
+class JobTests(TestCase):
+
+    def setUp(self):
+        self.calls = []
+
+        registry = mock.patch.dict(job_service.registry)
+        registry.start()
+        self.addCleanup(registry.stop)
+
+        def record(value=None):
+            self.calls.append(value)
+
+        def fail():
+            raise RuntimeError("boom")
+
+        job_service.job("core.record")(record)
+        job_service.job("core.fail", max_attempts=2)(fail)
+
+    def work(self):
+        job_service.work(threading.Event(), once=True)
+
+    def expire(self, job):
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now() - timedelta(seconds=1))
+
+    def test_claim(self):
+        low = job_service.enqueue("core.record", value="low")
+        high = job_service.enqueue("core.record", value="high", priority=5)
+        job_service.enqueue("core.record", delay=timedelta(hours=1))
+
+        claimed = job_service.claim_batch("worker-1")
+
+        # Due jobs only, highest priority first
+        self.assertEqual([job.pk for job in claimed], [high.pk, low.pk])
+        for job in claimed:
+            job.refresh_from_db()
+            self.assertEqual((job.state, job.attempts, job.locked_by), (Job.State.RUNNING, 1, "worker-1"))
+
+        # Claimed jobs are invisible to other workers until the claim expires
+        self.assertEqual(job_service.claim_batch("worker-2"), [])
+
+        self.expire(low)
+        [reclaimed] = job_service.claim_batch("worker-2")
+        self.assertEqual((reclaimed.pk, reclaimed.attempts), (low.pk, 2))
+
+        # The first worker lost it: its late result is dropped
+        job_service.run(claimed[1])
+        low.refresh_from_db()
+        self.assertEqual((low.state, low.locked_by), (Job.State.RUNNING, "worker-2"))
+
+    def test_claim_renewed_before_each_run(self):
+        first = job_service.enqueue("core.record", value="first")
+        second = job_service.enqueue("core.record", value="second")
+        [claimed_first, claimed_second] = job_service.claim_batch("worker-1")
+
+        # Running the first job takes longer than the second's claim
+        self.expire(second)
+        job_service.claim_batch("worker-2")
+
+        self.assertTrue(job_service.renew(claimed_first))
+        self.assertFalse(job_service.renew(claimed_second))
+
+        claimed_first.refresh_from_db()
+        self.assertGreater(claimed_first.run_at, timezone.now() + timedelta(seconds=claimed_first.timeout - 5))
+
+        self.assertTrue(job_service.run(claimed_first))
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.state, Job.State.DONE)
+        self.assertEqual((second.state, second.locked_by), (Job.State.RUNNING, "worker-2"))
+
+    def test_worker_skips_reclaimed_jobs(self):
+        second = None
+
+        def slow(value=None):
+            self.calls.append(value)
+            if value == "first":
+                # Another worker reclaims the rest of the batch meanwhile
+                self.expire(second)
+                job_service.claim_batch("worker-2")
+
+        job_service.job("core.slow")(slow)
+        job_service.enqueue("core.slow", value="first", priority=1)
+        second = job_service.enqueue("core.slow", value="second")
+
+        self.work()
+
+        self.assertEqual(self.calls, ["first"])
+        second.refresh_from_db()
+        self.assertEqual((second.state, second.locked_by), (Job.State.RUNNING, "worker-2"))
+
+    def test_retry_with_backoff(self):
+        job = job_service.enqueue("core.fail")
+        before = timezone.now()
+
+        self.work()
+
+        job.refresh_from_db()
+        self.assertEqual((job.state, job.attempts), (Job.State.QUEUED, 1))
+        self.assertIn("RuntimeError: boom", job.last_error)
+        # First retry: 5-10s out (half to full BACKOFF_BASE_SECONDS)
+        self.assertGreaterEqual(job.run_at, before + timedelta(seconds=5))
+        self.assertLessEqual(job.run_at, timezone.now() + timedelta(seconds=10))
+
+        # Not due yet
+        self.work()
+        job.refresh_from_db()
+        self.assertEqual(job.attempts, 1)
+
+        self.expire(job)
+        self.work()
+
+        job.refresh_from_db()
+        self.assertEqual((job.state, job.attempts), (Job.State.FAILED, 2))
+        self.assertIsNotNone(job.finished_at)
+
+    def test_backoff_is_capped(self):
+        for attempts in (1, 5, 20):
+            delay = job_service.backoff(attempts).total_seconds()
+            expected = min(job_service.BACKOFF_MAX_SECONDS, job_service.BACKOFF_BASE_SECONDS * 2 ** (attempts - 1))
+            self.assertGreaterEqual(delay, expected / 2)
+            self.assertLessEqual(delay, expected)
+
+    @override_settings(JOB_SCHEDULE={"core.record": 60})
+    def test_periodic_jobs_requeue(self):
+        job_service.schedule_periodic()
+        job_service.schedule_periodic()
+
+        # One queued run per periodic job
+        [job] = Job.objects.all()
+        self.assertEqual(job.key, "periodic:core.record")
+        self.assertIsNone(job_service.enqueue("core.record", key=job.key))
+
+        self.work()
+
+        self.assertEqual(self.calls, [None])
+        job.refresh_from_db()
+        self.assertEqual(job.state, Job.State.DONE)
+
+        following = Job.objects.get(state=Job.State.QUEUED)
+        self.assertEqual(following.key, job.key)
+        self.assertGreater(following.run_at, timezone.now() + timedelta(seconds=55))
@@ -1,7 +1,9 @@
 from django.urls import path
-from core.views import IssueListView, SubIssueListView
+from core.views import AsyncIssueCatalogView, IssueCatalogView, IssueListView, SubIssueListView
 
 urlpatterns = [
     path("issues/", IssueListView.as_view()),
     path("subissues/", SubIssueListView.as_view()),
+    path("issues/catalog/", IssueCatalogView.as_view()),
+    path("async/issues/catalog/", AsyncIssueCatalogView.as_view()),
 ]
\ No newline at end of file
@@ -1 +1,2 @@
-from .core_views import *
\ No newline at end of file
+from .core_views import *
+from .catalog_view import *
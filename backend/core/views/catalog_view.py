@@ -0,0 +1,56 @@
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.async_api import AsyncAPIView
+from core.services.catalog_service import aget_catalog, get_catalog
+
+
+class IssueCatalogView(APIView):
+    """
+    Issue -> sub-issue tree (with eligible staff counts) for dropdowns,
+    served from the in-process catalog cache.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    # Browsers reuse the tree this long, then revalidate with the ETag
+    max_age = 60 * 60
+
+    def get(self, request):
+        version, catalog = get_catalog()
+        etag = quote_etag(f"catalog-{version}")
+
+        response = (
+            get_conditional_response(request, etag=etag)
+            or Response(catalog)
+        )
+
+        response.headers["ETag"] = etag
+        patch_cache_control(response, private=True, max_age=self.max_age)
+
+        return response
+
+
+class AsyncIssueCatalogView(AsyncAPIView):
+    """
+    IssueCatalogView for the async (ASGI) read path.
+    """
+
+    max_age = IssueCatalogView.max_age
+
+    async def get(self, request):
+        version, catalog = await aget_catalog()
+        etag = quote_etag(f"catalog-{version}")
+
+        response = (
+            get_conditional_response(request, etag=etag)
+            or self.render(catalog)
+        )
+
+        response.headers["ETag"] = etag
+        patch_cache_control(response, private=True, max_age=self.max_age)
+
+        return response
@@ -1,10 +1,13 @@
 from django.contrib import admin
 from django import forms
+from django.db import transaction
 from django.core.exceptions import ValidationError
 
-from .models import Client, Staff, Ticket, TicketActivity
+from .models import Client, ClientNotification, Staff, Ticket, TicketActivity
+from .services.activity_service import activity_batch, log_activity
+from .services.ticket_change_service import record_deleted, stored_ticket_state
+from .state_machine import allowed_transitions, transition_values
 from core.models import SubIssue
-from accounts.models import User
 
 
 # ---------------------------------------------------
@@ -22,7 +25,7 @@ class TicketAdminForm(forms.ModelForm):
         if 'issue' in self.data:
             try:
                 issue_id = int(self.data.get('issue'))
-                self.fields['sub_issue'].queryset = SubIssue.objects.filter(issue_id=issue_id)
+                self.fields['sub_issue'].queryset = SubIssue.objects.with_issue().filter(issue_id=issue_id)
                 self.fields['assigned_to'].queryset = Staff.objects.filter(
                     specialty_id=issue_id,
                     is_active=True
@@ -31,7 +34,7 @@ class TicketAdminForm(forms.ModelForm):
                 pass
 
         elif self.instance.pk:
-            self.fields['sub_issue'].queryset = SubIssue.objects.filter(
+            self.fields['sub_issue'].queryset = SubIssue.objects.with_issue().filter(
                 issue=self.instance.issue
             )
             self.fields['assigned_to'].queryset = Staff.objects.filter(
@@ -54,26 +57,7 @@ class TicketAdmin(admin.ModelAdmin):
     # Status Transition Rules
     # ------------------------------
     def get_allowed_transitions(self, current_status, user):
-
-        transitions = {
-            Ticket.Status.CREATED: [Ticket.Status.ASSIGNED],
-            Ticket.Status.ASSIGNED: [Ticket.Status.STARTED],
-            Ticket.Status.STARTED: [Ticket.Status.RESOLVED],
-            Ticket.Status.RESOLVED: [Ticket.Status.CLOSED],
-            Ticket.Status.CLOSED: [],
-        }
-
-        allowed = transitions.get(current_status, [])
-
-        # Staff cannot close
-        if user.role == User.Role.STAFF:
-            allowed = [s for s in allowed if s != Ticket.Status.CLOSED]
-
-        # Client cannot change status
-        if user.role == User.Role.CLIENT:
-            allowed = []
-
-        return allowed
+        return allowed_transitions(current_status, user.role)
 
     # ------------------------------
     # Save Model Override
@@ -83,7 +67,8 @@ class TicketAdmin(admin.ModelAdmin):
         old_status = None
 
         if change:
-            old_status = Ticket.objects.get(pk=obj.pk).status
+            # Original value tracked on load; no extra SELECT needed
+            old_status = obj.get_original_value("status")
 
             if old_status != obj.status:
                 allowed = self.get_allowed_transitions(old_status, request.user)
@@ -93,16 +78,27 @@ class TicketAdmin(admin.ModelAdmin):
                         f"Transition from {old_status} to {obj.status} is not allowed for your role."
                     )
 
-        super().save_model(request, obj, form, change)
+                # Stamp the lifecycle timestamp in the same write
+                for field, value in transition_values(obj.status).items():
+                    setattr(obj, field, value)
 
-        # Log activity
-        if change and old_status != obj.status:
-            TicketActivity.objects.create(
-                ticket=obj,
-                changed_by=request.user,
-                old_status=old_status,
-                new_status=obj.status
-            )
+        with activity_batch():
+            super().save_model(request, obj, form, change)
+
+            # Log activity
+            if change and old_status != obj.status:
+                log_activity(obj, request.user, old_status, obj.status)
+
+
+    # ------------------------------
+    # Bulk delete ("delete selected")
+    # ------------------------------
+    def delete_queryset(self, request, queryset):
+        # QuerySet.delete() skips Ticket.delete(); keep the rollups in step
+        with transaction.atomic():
+            states = [stored_ticket_state(ticket) for ticket in queryset]
+            super().delete_queryset(request, queryset)
+            record_deleted(states)
 
 
 # ---------------------------------------------------
@@ -110,4 +106,12 @@ class TicketAdmin(admin.ModelAdmin):
 # ---------------------------------------------------
 admin.site.register(Client)
 admin.site.register(Staff)
-admin.site.register(TicketActivity)
\ No newline at end of file
+admin.site.register(TicketActivity)
+
+
+@admin.register(ClientNotification)
+class ClientNotificationAdmin(admin.ModelAdmin):
+    list_display = ("ticket_id", "client", "channel", "ticket_status", "state", "attempts", "next_attempt_at", "sent_at")
+    list_filter = ("state", "channel", "ticket_status")
+    raw_id_fields = ("client",)
+    readonly_fields = ("ticket",)
\ No newline at end of file
@@ -0,0 +1,93 @@
+"""
+Async ticket read views for ASGI deployments (see core.async_api).
+
+These add the conditional GET headers shared with tickets.conditional
+and async twins of the DRF list views. Validators and page queries go
+through the async ORM: Django still runs each query in a thread, but
+a request only holds a thread while a query runs.
+"""
+from asgiref.sync import sync_to_async
+from rest_framework.request import Request
+
+from core.async_api import AsyncAPIView as BaseAsyncAPIView
+from tickets.conditional import (
+    check_conditional,
+    is_keyset,
+    list_validators,
+    make_etag,
+    page_versions,
+    set_conditional_headers,
+)
+
+
+class AsyncAPIView(BaseAsyncAPIView):
+    """
+    core.async_api.AsyncAPIView with conditional GET (ConditionalGetMixin).
+    """
+
+    conditional_validators = None
+
+    async def dispatch(self, request, *args, **kwargs):
+        response = await super().dispatch(request, *args, **kwargs)
+
+        if self.conditional_validators and response.status_code in (200, 304):
+            set_conditional_headers(response, *self.conditional_validators)
+
+        return response
+
+    def not_modified(self, request, last_modified, *versions):
+        """
+        Return a 304 response when the client's copy is current, else None
+        (see ConditionalGetMixin).
+        """
+        etag = make_etag(request, request.user, self.renderer.format, last_modified, *versions)
+        self.conditional_validators, response = check_conditional(request, etag, last_modified)
+        return response
+
+
+class AsyncListView(AsyncAPIView):
+    """
+    Async twin of the sync ListAPIView ``list_view``: same scoping,
+    filter backends, pagination (links, errors) and serializer.
+    """
+
+    list_view = None
+
+    async def get(self, request, **kwargs):
+        view = self.get_list_view(request, **kwargs)
+        paginator = view.paginator
+
+        # Scoping lookups and filter choice validation may query
+        queryset = await sync_to_async(
+            lambda: view.filter_queryset(view.get_queryset())
+        )()
+
+        if is_keyset(paginator, view.request):
+            page = await paginator.apaginate_queryset(queryset, view.request, view)
+            not_modified = self.not_modified(request, None, *page_versions(paginator, page))
+        else:
+            validators = await queryset.order_by().aaggregate(**list_validators())
+            not_modified = self.not_modified(
+                request, validators["last_modified"], validators["count"]
+            )
+            if not not_modified:
+                page = await paginator.apaginate_queryset(queryset, view.request, view)
+
+        if not_modified:
+            return not_modified
+
+        # Rows come with their related objects (for_serializer /
+        # select_related): serializing them runs no queries
+        data = view.get_serializer(page, many=True).data
+        return self.render(paginator.get_paginated_response(data).data)
+
+    def get_list_view(self, request, **kwargs):
+        drf_request = Request(request)
+        drf_request.user = request.user
+        drf_request.auth = request.auth
+
+        view = self.list_view()
+        view.setup(drf_request, **kwargs)
+        view.format_kwarg = None
+
+        return view
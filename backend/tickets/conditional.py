@@ -0,0 +1,131 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+from tickets.pagination import TicketPagination
+
+
+def make_etag(request, user, renderer_format, *versions):
+    # Same URL, user and renderer with the same data -> same body
+    key = repr((request.get_full_path(), user.pk, renderer_format, versions))
+    return quote_etag(hashlib.md5(key.encode(), usedforsecurity=False).hexdigest())
+
+
+def check_conditional(request, etag, last_modified):
+    """
+    ``(validators, response)``: the ``(etag, timestamp)`` to send with the
+    response, and a 304 when the client's copy is current (else None).
+    """
+    # HTTP dates have whole seconds; compare like Django's @condition
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+
+    return (etag, timestamp), get_conditional_response(
+        request, etag=etag, last_modified=timestamp
+    )
+
+
+def list_validators():
+    """
+    Aggregates of a list's scoped, filtered queryset that any create /
+    update / delete in scope moves.
+    """
+    return {"last_modified": Max("updated_at"), "count": Count("pk")}
+
+
+def is_keyset(paginator, request):
+    return isinstance(paginator, TicketPagination) and paginator.is_keyset(request)
+
+
+def page_versions(paginator, page):
+    """
+    Validators of a keyset page: its rows and whether it has neighbours.
+    A keyset page is one LIMIT query, so checking the page itself is far
+    cheaper than aggregating (COUNT) the whole scope.
+    """
+    keyset = paginator.keyset
+    rows = tuple((row.pk, row.updated_at) for row in page)
+    return rows, keyset.has_next, keyset.has_previous
+
+
+def set_conditional_headers(response, etag, timestamp):
+    response.headers["ETag"] = etag
+    if timestamp is not None:
+        response.headers["Last-Modified"] = http_date(timestamp)
+
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ("Authorization",))
+
+
+class ConditionalGetMixin:
+    """
+    Conditional GET for read views.
+
+    ``retrieve()`` / ``list()`` compute cheap validators (the object's
+    ``updated_at``, or the max ``updated_at`` and row count of the scoped,
+    filtered queryset) before serializing: a matching ``If-None-Match`` /
+    ``If-Modified-Since`` is answered with 304 and nothing else is loaded.
+    Keyset pages are validated by their own rows instead (ETag only).
+    Every GET response carries the ETag / Last-Modified it was checked
+    against, and ``Cache-Control: private, no-cache`` so browsers keep the
+    body and revalidate it on the next fetch.
+    """
+
+    conditional_validators = None
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+
+        not_modified = self.not_modified(request, instance.updated_at, instance._meta.label)
+        if not_modified:
+            return not_modified
+
+        return Response(self.get_serializer(instance).data)
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        if is_keyset(self.paginator, request):
+            page = self.paginate_queryset(queryset)
+
+            not_modified = self.not_modified(request, None, *page_versions(self.paginator, page))
+            if not_modified:
+                return not_modified
+
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+        validators = queryset.order_by().aggregate(**list_validators())
+
+        not_modified = self.not_modified(request, validators["last_modified"], validators["count"])
+        if not_modified:
+            return not_modified
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+        return Response(self.get_serializer(queryset, many=True).data)
+
+    def not_modified(self, request, last_modified, *versions):
+        """
+        Return a 304 response when the client's copy is current, else None.
+
+        ``versions`` are extra values that change whenever the response
+        would (e.g. a row count, so deletions invalidate lists too).
+        """
+        etag = self.make_etag(request, last_modified, *versions)
+        self.conditional_validators, response = check_conditional(request, etag, last_modified)
+        return response
+
+    def make_etag(self, request, *versions):
+        return make_etag(request, request.user, request.accepted_renderer.format, *versions)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+
+        if self.conditional_validators and response.status_code in (200, 304):
+            set_conditional_headers(response, *self.conditional_validators)
+
+        return response
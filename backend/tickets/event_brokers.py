@@ -0,0 +1,200 @@
+"""
+Fan-out of live ticket events (see tickets.services.event_service).
+
+A broker takes committed events from ``publish()`` and hands them to
+every open event stream, each of which owns a Subscription (a bounded
+asyncio queue on its event loop, registered with the broker for the
+duration of an ``async with broker.subscribe()`` block). InProcessBroker
+only reaches the streams of the publishing process; PostgresBroker sends
+events through LISTEN/NOTIFY so every worker's streams see them.
+"""
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+
+from django.db import connection, connections
+
+
+logger = logging.getLogger(__name__)
+
+# Tells a stream it may have missed events (slow consumer, lost
+# listener connection): the client should refetch what it shows
+RESYNC = {"event": "resync"}
+
+
+class Subscription:
+    """
+    A plain async context manager rather than an @asynccontextmanager
+    generator: when the stream holding it is closed (client gone, event
+    loop shutting down) there is no second generator that may already
+    have been finalized, so leaving always unsubscribes.
+    """
+
+    def __init__(self, broker, queue_size):
+        self.broker = broker
+        self.queue_size = queue_size
+        self.overflowed = False
+
+    async def __aenter__(self):
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(self.queue_size)
+        self.broker.add(self)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.broker.remove(self)
+
+    def push(self, events):
+        # Called from any thread
+        try:
+            self.loop.call_soon_threadsafe(self._put, events)
+        except RuntimeError:
+            # Event loop already closed; the stream is gone
+            pass
+
+    def _put(self, events):
+        for event in events:
+            try:
+                self.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self.overflowed = True
+                return
+
+    async def get(self):
+        if self.overflowed:
+            # Whatever is queued is incomplete; start over from a resync
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.overflowed = False
+            return RESYNC
+
+        return await self.queue.get()
+
+
+class InProcessBroker:
+    """
+    Fan-out to the streams of this process only: single-process
+    deployments and tests.
+    """
+
+    queue_size = 1000
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscriptions = set()
+
+    def publish(self, events):
+        self.dispatch(events)
+
+    def dispatch(self, events):
+        with self.lock:
+            subscriptions = list(self.subscriptions)
+
+        for subscription in subscriptions:
+            subscription.push(events)
+
+    def subscribe(self):
+        return Subscription(self, self.queue_size)
+
+    def add(self, subscription):
+        with self.lock:
+            self.subscriptions.add(subscription)
+
+    def remove(self, subscription):
+        with self.lock:
+            self.subscriptions.discard(subscription)
+
+
+class PostgresBroker(InProcessBroker):
+    """
+    Events travel as NOTIFY payloads on ``channel``. Each process runs
+    one listener thread (started with its first subscription) on its own
+    connection and fans what it receives out to its local streams.
+    """
+
+    channel = "ticket_events"
+
+    # NOTIFY payloads must stay under 8000 bytes
+    payload_limit = 7800
+
+    poll_seconds = 5.0
+    reconnect_seconds = 2.0
+
+    def __init__(self):
+        super().__init__()
+        self.listener = None
+
+    def publish(self, events):
+        with connection.cursor() as cursor:
+            for payload in self.payloads(events):
+                cursor.execute("SELECT pg_notify(%s, %s)", [self.channel, payload])
+
+    def payloads(self, events):
+        """
+        JSON arrays of events, each small enough for one NOTIFY.
+        """
+        chunk, size = [], 2
+
+        for event in events:
+            encoded = json.dumps(event, separators=(",", ":"))
+
+            if chunk and size + len(encoded) + 1 > self.payload_limit:
+                yield f"[{','.join(chunk)}]"
+                chunk, size = [], 2
+
+            chunk.append(encoded)
+            size += len(encoded) + 1
+
+        if chunk:
+            yield f"[{','.join(chunk)}]"
+
+    def add(self, subscription):
+        self.start_listener()
+        super().add(subscription)
+
+    def start_listener(self):
+        with self.lock:
+            if self.listener is None or not self.listener.is_alive():
+                self.listener = threading.Thread(
+                    target=self.listen, name="ticket-events-listener", daemon=True,
+                )
+                self.listener.start()
+
+    def listen(self):
+        reconnecting = False
+
+        while True:
+            # A connection of its own: it sits in LISTEN for good
+            db = connections.create_connection("default")
+
+            try:
+                with db.cursor() as cursor:
+                    cursor.execute(f"LISTEN {self.channel}")
+
+                if reconnecting:
+                    # Events may have been sent while we were away
+                    self.dispatch([RESYNC])
+
+                self.receive(db.connection)
+            except Exception:
+                logger.exception("Ticket event listener failed; reconnecting")
+            finally:
+                db.close()
+
+            reconnecting = True
+            time.sleep(self.reconnect_seconds)
+
+    def receive(self, raw):
+        # psycopg2 connection
+        while True:
+            if select.select([raw], [], [], self.poll_seconds) == ([], [], []):
+                continue
+
+            raw.poll()
+
+            while raw.notifies:
+                notify = raw.notifies.pop(0)
+                self.dispatch(json.loads(notify.payload))
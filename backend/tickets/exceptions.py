@@ -0,0 +1,14 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class TicketConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Ticket was modified by another request. Reload and try again."
+    default_code = "conflict"
+
+
+class AsgiRequired(APIException):
+    status_code = status.HTTP_501_NOT_IMPLEMENTED
+    default_detail = "Live events need the ASGI server (see /api/async/)."
+    default_code = "asgi_required"
@@ -0,0 +1,38 @@
+from rest_framework import filters
+
+from tickets.services.search_service import search_tickets, supports_full_text
+
+
+class TicketSearchFilter(filters.SearchFilter):
+    """
+    Serves ``?search=`` from the full-text index (PostgreSQL tsvector/GIN,
+    SQLite FTS5) instead of ``icontains`` scans. Other databases fall back
+    to DRF's SearchFilter over ``search_fields``.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if not supports_full_text(queryset):
+            return super().filter_queryset(request, queryset, view)
+
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+
+        return search_tickets(queryset, " ".join(terms))
+
+
+class TicketOrderingFilter(filters.OrderingFilter):
+    """
+    Orders search results by relevance unless ``?ordering=`` is given.
+    """
+
+    relevance_ordering = ["-search_rank", "-created_at"]
+
+    def get_ordering(self, request, queryset, view):
+        if (
+            not request.query_params.get(self.ordering_param)
+            and "search_rank" in queryset.query.annotations
+        ):
+            return self.relevance_ordering
+
+        return super().get_ordering(request, queryset, view)
@@ -0,0 +1,22 @@
+from core.services.job_service import job
+from tickets.services import notification_service, sla_service
+from tickets.services.archive_service import archive_closed_tickets as archive
+from tickets.services.rollup_service import rebuild_rollups as rebuild
+
+
+@job("tickets.send_notifications", timeout=600)
+def send_notifications(batch_size=notification_service.BATCH_SIZE):
+    # Everything due now; retries scheduled later wait for the next run
+    while notification_service.send_batch(batch_size):
+        pass
+
+
+@job("tickets.archive_closed_tickets", timeout=3600)
+def archive_closed_tickets(days=None):
+    archive(days)
+
+
+@job("tickets.rebuild_rollups", timeout=3600, max_attempts=1)
+def rebuild_rollups():
+    rebuild()
+    sla_service.rebuild_sketches()
@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tickets.services.archive_service import (
+    ARCHIVE_BATCH_SIZE,
+    archivable_tickets,
+    archive_closed_tickets,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Move tickets CLOSED longer than TICKET_ARCHIVE_AFTER_DAYS (and their "
+        "activity) from the hot tables to the archive tables."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.TICKET_ARCHIVE_AFTER_DAYS,
+            help="Archive tickets closed more than this many days ago.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=ARCHIVE_BATCH_SIZE,
+            help="Tickets moved per transaction.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many tickets would be archived.",
+        )
+
+    def handle(self, *args, **options):
+        if options["dry_run"]:
+            count = archivable_tickets(options["days"]).count()
+            self.stdout.write(f"{count} tickets would be archived.")
+            return
+
+        count = archive_closed_tickets(options["days"], batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Archived {count} tickets."))
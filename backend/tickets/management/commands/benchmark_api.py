@@ -0,0 +1,201 @@
+import json
+import threading
+import time
+from http.client import HTTPConnection, HTTPException, HTTPSConnection
+from urllib.parse import urljoin, urlsplit
+from urllib.request import Request, urlopen
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+DEFAULT_PATHS = ["tickets/", "dashboard/all/", "issues/catalog/"]
+
+PERCENTILES = (0.5, 0.9, 0.99)
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test running API servers and compare throughput and latency, "
+        "e.g. the WSGI app (/api/) against the ASGI async paths (/api/async/)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "targets",
+            nargs="+",
+            metavar="NAME=BASE_URL",
+            help=(
+                "Servers to compare, e.g. wsgi=http://127.0.0.1:8000/api/ "
+                "asgi=http://127.0.0.1:8001/api/async/"
+            ),
+        )
+        parser.add_argument(
+            "--path",
+            dest="paths",
+            action="append",
+            help=f"Path relative to each base URL; repeatable (default: {' '.join(DEFAULT_PATHS)}).",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            nargs="+",
+            default=[64],
+            help="Concurrent keep-alive connections; several values run a sweep.",
+        )
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=10.0,
+            help="Seconds measured per target, path and concurrency.",
+        )
+        parser.add_argument(
+            "--warmup",
+            type=float,
+            default=2.0,
+            help="Seconds of load before measuring starts.",
+        )
+        parser.add_argument("--token", help="Access token sent as the Bearer credential.")
+        parser.add_argument("--username", help="Obtain an access token for this user.")
+        parser.add_argument("--password", help="Password for --username.")
+        parser.add_argument(
+            "--token-url",
+            help="Token endpoint (default: /api/token/ on the first target's host).",
+        )
+
+    def handle(self, *args, **options):
+        targets = [self.parse_target(target) for target in options["targets"]]
+        paths = options["paths"] or DEFAULT_PATHS
+
+        headers = {"Accept": "application/json"}
+        token = options["token"] or self.obtain_token(targets[0][1], options)
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+
+        self.stdout.write(
+            f"{'target':<10} {'path':<28} {'conc':>5} {'req/s':>9} {'errors':>7} "
+            f"{'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}"
+        )
+
+        for concurrency in options["concurrency"]:
+            for path in paths:
+                for name, base_url in targets:
+                    result = run_load(
+                        urljoin(base_url, path),
+                        headers,
+                        concurrency,
+                        options["duration"],
+                        options["warmup"],
+                    )
+                    self.stdout.write(self.format_row(name, path, concurrency, result))
+
+    @staticmethod
+    def parse_target(target):
+        name, sep, base_url = target.partition("=")
+        if not sep or not base_url.startswith(("http://", "https://")):
+            raise CommandError(f"Expected NAME=http(s)://host/base/, got {target!r}.")
+
+        # urljoin() drops the last segment of a base without a trailing slash
+        return name, base_url if base_url.endswith("/") else f"{base_url}/"
+
+    @staticmethod
+    def obtain_token(base_url, options):
+        if not options["username"]:
+            return None
+
+        url = options["token_url"] or urljoin(base_url, "/api/token/")
+        body = json.dumps({"username": options["username"], "password": options["password"]})
+        request = Request(url, body.encode(), {"Content-Type": "application/json"})
+
+        try:
+            with urlopen(request, timeout=30) as response:
+                return json.load(response)["access"]
+        except (OSError, KeyError, ValueError) as exc:
+            raise CommandError(f"Could not obtain a token from {url}: {exc}")
+
+    @staticmethod
+    def format_row(name, path, concurrency, result):
+        latencies = result["latencies"]
+        rate = len(latencies) / result["elapsed"] if result["elapsed"] else 0.0
+
+        if latencies:
+            columns = [percentile(latencies, q) for q in PERCENTILES] + [latencies[-1]]
+            timings = " ".join(f"{seconds * 1000:>8.1f}" for seconds in columns)
+        else:
+            timings = " ".join(f"{'-':>8}" for _ in range(len(PERCENTILES) + 1))
+
+        return (
+            f"{name:<10} {path:<28} {concurrency:>5} {rate:>9.1f} "
+            f"{result['errors']:>7} {timings}"
+        )
+
+
+def run_load(url, headers, concurrency, duration, warmup):
+    """
+    Closed-loop load: ``concurrency`` keep-alive connections, each sending
+    the next GET as soon as the previous response is read. Returns the
+    sorted latencies (seconds) and error count of the measured window.
+    """
+    start = time.perf_counter()
+    measure_from = start + warmup
+    deadline = measure_from + duration
+
+    results = [([], [0]) for _ in range(concurrency)]
+    workers = [
+        threading.Thread(
+            target=_worker,
+            args=(url, headers, measure_from, deadline, latencies, errors),
+            daemon=True,
+        )
+        for latencies, errors in results
+    ]
+
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    latencies = sorted(
+        latency for worker_latencies, _ in results for latency in worker_latencies
+    )
+
+    return {
+        "latencies": latencies,
+        "errors": sum(errors[0] for _, errors in results),
+        "elapsed": duration,
+    }
+
+
+def _worker(url, headers, measure_from, deadline, latencies, errors):
+    parts = urlsplit(url)
+    connection_class = HTTPSConnection if parts.scheme == "https" else HTTPConnection
+    target = parts.path + (f"?{parts.query}" if parts.query else "")
+
+    connection = connection_class(parts.netloc, timeout=30)
+
+    try:
+        while (sent := time.perf_counter()) < deadline:
+            try:
+                connection.request("GET", target, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                ok = response.status < 400
+            except (OSError, HTTPException):
+                # Reconnect on the next request
+                connection.close()
+                ok = False
+
+            if sent < measure_from:
+                continue
+
+            if ok:
+                latencies.append(time.perf_counter() - sent)
+            else:
+                errors[0] += 1
+    finally:
+        connection.close()
+
+
+def percentile(sorted_values, fraction):
+    # Nearest rank
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
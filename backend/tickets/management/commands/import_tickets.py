@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tickets.services.import_service import (
+    FORMATS,
+    IMPORT_BATCH_SIZE,
+    ImportFormatError,
+    detect_format,
+    import_tickets,
+)
+
+
+class Command(BaseCommand):
+    help = "Stream tickets from a CSV or NDJSON file into the database."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or NDJSON file to import.")
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="Input format (default: inferred from the file extension).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=IMPORT_BATCH_SIZE,
+            help="Rows per bulk insert / transaction.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Validate every row without writing anything.",
+        )
+
+    def handle(self, *args, **options):
+        fmt = options["format"] or detect_format(options["path"])
+
+        try:
+            with open(options["path"], encoding="utf-8-sig", newline="") as stream:
+                report = import_tickets(
+                    stream,
+                    fmt,
+                    batch_size=options["batch_size"],
+                    dry_run=options["dry_run"],
+                )
+        except (OSError, ImportFormatError) as exc:
+            raise CommandError(str(exc))
+
+        for error in report["errors"]:
+            self.stderr.write(f"row {error['row']}: {'; '.join(error['errors'])}")
+
+        if report["errors_truncated"]:
+            self.stderr.write("... further errors omitted")
+
+        verb = "Validated" if options["dry_run"] else "Imported"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {report['created']} tickets, {report['failed']} rows rejected."
+        ))
@@ -0,0 +1,226 @@
+import re
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from accounts.models import User
+from tickets.models import Ticket
+from tickets.services.assignment_service import index as assignment_index
+from tickets.services.dashboard_service import (
+    get_client_wise_summary,
+    get_dashboard,
+    get_monthly_summary,
+    get_staff_wise_summary,
+    get_status_summary,
+)
+from tickets.views import (
+    FilterStaffByIssueView,
+    TicketActivityListView,
+    TicketDetailView,
+    TicketExportView,
+    TicketListView,
+)
+
+
+SEQ_SCAN_PATTERNS = {
+    "postgresql": re.compile(r"Seq Scan on (\w+)"),
+    "sqlite": re.compile(r"\bSCAN (\w+)\b(?! USING| VIRTUAL TABLE)"),
+}
+
+EXPLAIN_SQL = {
+    "postgresql": "EXPLAIN ",
+    "sqlite": "EXPLAIN QUERY PLAN ",
+}
+
+
+def representative_requests(user, ticket):
+    """
+    ``(endpoint, run)`` pairs: ``run()`` serves the endpoint for ``user``
+    through its real view, so the queries it runs are the ones in
+    production. Dashboards call the summary the view computes on a cache
+    miss.
+    """
+    ticket_list = TicketListView.as_view()
+
+    for query in (
+        "",
+        "?status=CREATED",
+        "?created_after=2000-01-01",
+        "?search=printer",
+        "?ordering=status",
+        "?pagination=keyset",
+        "?pagination=keyset&search=printer",
+    ):
+        yield f"GET /api/tickets/{query}", _view_request(ticket_list, user, query)
+
+    yield "GET /api/tickets/<pk>/", _view_request(
+        TicketDetailView.as_view(), user, pk=ticket.id,
+    )
+    yield "GET /api/tickets/<id>/activity/", _view_request(
+        TicketActivityListView.as_view(), user, ticket_id=ticket.id,
+    )
+    yield "GET /api/tickets/export/", _view_request(TicketExportView.as_view(), user)
+
+    if user.role != User.Role.CLIENT:
+        yield "GET /api/tickets/<id>/eligible-staff/", _view_request(
+            FilterStaffByIssueView.as_view(), user, ticket_id=ticket.id,
+        )
+
+    yield "GET /api/dashboard/summary/", lambda: get_status_summary(user)
+    yield "GET /api/dashboard/monthly/", lambda: list(get_monthly_summary(user))
+    yield "GET /api/dashboard/all/", lambda: get_dashboard(user)
+
+    if user.role in (User.Role.ADMIN, User.Role.STAFF):
+        yield "GET /api/dashboard/client-wise/", lambda: list(get_client_wise_summary(user))
+
+    if user.role == User.Role.ADMIN:
+        yield "GET /api/dashboard/staff-wise/", lambda: list(get_staff_wise_summary(user))
+
+
+def _view_request(view, user, query="", **kwargs):
+    def run():
+        request = APIRequestFactory().get(f"/{query}", SERVER_NAME=_host())
+        force_authenticate(request, user)
+
+        response = view(request, **kwargs)
+        if response.status_code >= 400:
+            raise CommandError(f"HTTP {response.status_code}: {response.data}")
+
+        # Streaming bodies run their queries while being consumed
+        if response.streaming:
+            for _ in response.streaming_content:
+                pass
+        else:
+            response.render()
+
+    return run
+
+
+def _host():
+    # Pagination links are absolute, so the request needs an allowed host
+    host = next((host for host in settings.ALLOWED_HOSTS if "*" not in host), "localhost")
+    return host.lstrip(".")
+
+
+def capture_selects(run):
+    """
+    ``[(sql, params)]`` of the SELECTs ``run()`` executes, in order and
+    without repeats.
+    """
+    queries = []
+
+    def wrapper(execute, sql, params, many, context):
+        if sql.lstrip().upper().startswith(("SELECT", "WITH")) and (sql, params) not in queries:
+            queries.append((sql, params))
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(wrapper):
+        run()
+
+    return queries
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve each read API endpoint once per role and run EXPLAIN on "
+        "every query it issues, reporting sequential scans."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--natural",
+            action="store_true",
+            help=(
+                "PostgreSQL only: keep the planner's natural choices. By default "
+                "sequential scans are disabled so that a remaining Seq Scan means "
+                "no index can serve the query, even on a small dataset."
+            ),
+        )
+        parser.add_argument(
+            "--ignore",
+            nargs="*",
+            default=[],
+            metavar="TABLE",
+            help="Tables whose sequential scans are acceptable.",
+        )
+        parser.add_argument(
+            "--verbose-plans",
+            action="store_true",
+            help="Print every plan, not just the offending ones.",
+        )
+        parser.add_argument(
+            "--fail-on-seq-scan",
+            action="store_true",
+            help="Exit with an error if any sequential scan is found.",
+        )
+
+    def handle(self, *args, **options):
+        pattern = SEQ_SCAN_PATTERNS.get(connection.vendor)
+
+        if pattern is None:
+            raise CommandError(f"EXPLAIN parsing is not supported on {connection.vendor}.")
+
+        ticket = Ticket.objects.order_by("-id").first()
+        if ticket is None:
+            raise CommandError("No tickets found; representative queries need sample data.")
+
+        # Loaded once per process, not per request
+        assignment_index.load()
+
+        problems = 0
+
+        for role in User.Role.values:
+            user = self.sample_user(role, ticket)
+            if user is None:
+                self.stdout.write(self.style.WARNING(f"[{role}] no sample user, skipped"))
+                continue
+
+            for endpoint, run in representative_requests(user, ticket):
+                try:
+                    queries = capture_selects(run)
+                except CommandError as exc:
+                    self.stdout.write(self.style.WARNING(f"[{role}] {endpoint}: skipped ({exc})"))
+                    continue
+
+                plans = [self.explain(sql, params, options) for sql, params in queries]
+                scans = sorted(
+                    {table for plan in plans for table in pattern.findall(plan)}
+                    - set(options["ignore"])
+                )
+
+                if scans:
+                    problems += 1
+                    self.stdout.write(self.style.ERROR(
+                        f"[{role}] {endpoint}: sequential scan on {', '.join(scans)}"
+                    ))
+                else:
+                    self.stdout.write(self.style.SUCCESS(
+                        f"[{role}] {endpoint}: ok (queries: {len(queries)})"
+                    ))
+
+                for (sql, params), plan in zip(queries, plans):
+                    if options["verbose_plans"] or set(pattern.findall(plan)) - set(options["ignore"]):
+                        self.stdout.write(f"{sql} {params!r}\n{plan}")
+
+        if problems and options["fail_on_seq_scan"]:
+            raise CommandError(f"{problems} endpoints use sequential scans.")
+
+    def sample_user(self, role, ticket):
+        if role == User.Role.STAFF and ticket.assigned_to_id:
+            return User.objects.filter(staff__id=ticket.assigned_to_id).first()
+
+        if role == User.Role.CLIENT:
+            return User.objects.filter(client__id=ticket.client_id).first()
+
+        return User.objects.filter(role=role).first()
+
+    def explain(self, sql, params, options):
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                if connection.vendor == "postgresql" and not options["natural"]:
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+
+                cursor.execute(EXPLAIN_SQL[connection.vendor] + sql, params)
+                return "\n".join(str(row[-1]) for row in cursor.fetchall())
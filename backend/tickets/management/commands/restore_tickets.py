@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from tickets.services.archive_service import restore_tickets
+
+
+class Command(BaseCommand):
+    help = "Move archived tickets (and their activity) back to the hot tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument("ids", nargs="+", type=int, help="Ticket ids.")
+
+    def handle(self, *args, **options):
+        count = restore_tickets(options["ids"])
+        self.stdout.write(self.style.SUCCESS(f"Restored {count} tickets."))
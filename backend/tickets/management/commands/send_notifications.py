@@ -0,0 +1,51 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tickets.services.notification_service import BATCH_SIZE, send_batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Deliver pending client notifications (email / WhatsApp), retrying "
+        "failures with backoff. Runs until interrupted unless --once is given; "
+        "several senders can run side by side."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help="Notifications claimed per batch.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5.0,
+            help="Seconds to wait when nothing is due.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Send everything currently due, then exit.",
+        )
+
+    def handle(self, *args, **options):
+        total = 0
+
+        try:
+            while True:
+                count = send_batch(options["batch_size"])
+                total += count
+
+                if count:
+                    continue
+                if options["once"]:
+                    break
+
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(f"Processed {total} notifications."))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tickets.services import sla_service
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the SLA quantile sketches with exact percentile_cont values "
+        "over every ticket (PostgreSQL). Run rebuild_rollups to repair drift."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dimension",
+            choices=list(sla_service.DIMENSIONS),
+            default="month",
+            help="Breakdown to compare.",
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.05,
+            help="Allowed relative difference of a percentile.",
+        )
+
+    def handle(self, *args, **options):
+        if not sla_service.supports_exact():
+            raise CommandError("Exact SLA percentiles need PostgreSQL.")
+
+        mismatches = sla_service.verify_sketches(options["dimension"], options["tolerance"])
+
+        for label, metric, field, sketched, exact in mismatches:
+            self.stdout.write(f"{label} {metric} {field}: sketched {sketched}, exact {exact}")
+
+        if mismatches:
+            raise CommandError(f"{len(mismatches)} SLA values drifted.")
+
+        self.stdout.write(self.style.SUCCESS("SLA sketches match."))
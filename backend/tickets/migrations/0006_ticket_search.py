@@ -0,0 +1,94 @@
+# Generated by Django 6.0.2 on 2026-10-18 18:04
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+POSTGRES_FORWARD = [
+    """
+    CREATE FUNCTION tickets_ticket_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT'
+           OR NEW.description IS DISTINCT FROM OLD.description
+           OR NEW.search_vector IS NULL THEN
+            NEW.search_vector := to_tsvector('pg_catalog.english', coalesce(NEW.description, ''));
+        END IF;
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    CREATE TRIGGER tickets_ticket_search_vector_trigger
+    BEFORE INSERT OR UPDATE ON tickets_ticket
+    FOR EACH ROW EXECUTE FUNCTION tickets_ticket_search_vector_update();
+    """,
+    "UPDATE tickets_ticket SET search_vector = to_tsvector('pg_catalog.english', coalesce(description, ''));",
+    "CREATE INDEX tickets_ticket_search_gin ON tickets_ticket USING GIN (search_vector);",
+]
+
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS tickets_ticket_search_gin;",
+    "DROP TRIGGER IF EXISTS tickets_ticket_search_vector_trigger ON tickets_ticket;",
+    "DROP FUNCTION IF EXISTS tickets_ticket_search_vector_update();",
+]
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE tickets_ticket_fts USING fts5(
+        description, content='tickets_ticket', content_rowid='id'
+    );
+    """,
+    """
+    CREATE TRIGGER tickets_ticket_fts_insert AFTER INSERT ON tickets_ticket BEGIN
+        INSERT INTO tickets_ticket_fts(rowid, description) VALUES (new.id, new.description);
+    END;
+    """,
+    """
+    CREATE TRIGGER tickets_ticket_fts_delete AFTER DELETE ON tickets_ticket BEGIN
+        INSERT INTO tickets_ticket_fts(tickets_ticket_fts, rowid, description)
+        VALUES ('delete', old.id, old.description);
+    END;
+    """,
+    """
+    CREATE TRIGGER tickets_ticket_fts_update AFTER UPDATE OF description ON tickets_ticket BEGIN
+        INSERT INTO tickets_ticket_fts(tickets_ticket_fts, rowid, description)
+        VALUES ('delete', old.id, old.description);
+        INSERT INTO tickets_ticket_fts(rowid, description) VALUES (new.id, new.description);
+    END;
+    """,
+    "INSERT INTO tickets_ticket_fts(tickets_ticket_fts) VALUES ('rebuild');",
+]
+
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS tickets_ticket_fts_update;",
+    "DROP TRIGGER IF EXISTS tickets_ticket_fts_delete;",
+    "DROP TRIGGER IF EXISTS tickets_ticket_fts_insert;",
+    "DROP TABLE IF EXISTS tickets_ticket_fts;",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0005_ticketactivity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ticket',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(
+            _run({"postgresql": POSTGRES_FORWARD, "sqlite": SQLITE_FORWARD}),
+            _run({"postgresql": POSTGRES_BACKWARD, "sqlite": SQLITE_BACKWARD}),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 6.0.2 on 2026-10-18 19:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def backfill_rollups(apps, schema_editor):
+    Ticket = apps.get_model("tickets", "Ticket")
+    TicketDailyRollup = apps.get_model("tickets", "TicketDailyRollup")
+
+    rows = (
+        Ticket.objects
+        .annotate(day=TruncDate("created_at"))
+        .values("day", "status", "issue_id", "client_id", "assigned_to_id")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+
+    TicketDailyRollup.objects.bulk_create(
+        (TicketDailyRollup(**row) for row in rows.iterator()),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_alter_subissue_unique_together_alter_subissue_issue'),
+        ('tickets', '0007_access_pattern_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('status', models.CharField(max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('assigned_to', models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='tickets.staff')),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='tickets.client')),
+                ('issue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.issue')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['client', 'day'], name='rollup_client_day_idx'), models.Index(fields=['assigned_to', 'day'], name='rollup_staff_day_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('assigned_to__isnull', False)), fields=('day', 'status', 'issue', 'client', 'assigned_to'), name='rollup_assigned_key'), models.UniqueConstraint(condition=models.Q(('assigned_to__isnull', True)), fields=('day', 'status', 'issue', 'client'), name='rollup_unassigned_key')],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
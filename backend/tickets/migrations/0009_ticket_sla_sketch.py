@@ -0,0 +1,71 @@
+# Generated by Django 6.0.2 on 2026-10-18 19:40
+
+import django.db.models.deletion
+from collections import defaultdict
+
+from django.db import migrations, models
+from django.utils import timezone
+
+from tickets.quantile_sketch import QuantileSketch
+
+
+def backfill_sketches(apps, schema_editor):
+    # PostgreSQL serves SLA percentiles with percentile_cont instead
+    if schema_editor.connection.vendor == "postgresql":
+        return
+
+    Ticket = apps.get_model("tickets", "Ticket")
+    TicketSlaSketch = apps.get_model("tickets", "TicketSlaSketch")
+
+    sketches = defaultdict(QuantileSketch)
+    rows = Ticket.objects.values_list(
+        "created_at", "assigned_at", "resolved_at", "issue_id", "assigned_to_id"
+    )
+
+    for created_at, assigned_at, resolved_at, issue_id, assigned_to_id in rows.iterator():
+        ends = {"time_to_assign": assigned_at, "time_to_resolve": resolved_at}
+
+        for metric, end in ends.items():
+            if end is not None:
+                month = timezone.localdate(end).replace(day=1)
+                sketches[(month, metric, issue_id, assigned_to_id)].add(
+                    (end - created_at).total_seconds()
+                )
+
+    TicketSlaSketch.objects.bulk_create(
+        TicketSlaSketch(
+            month=month,
+            metric=metric,
+            issue_id=issue_id,
+            assigned_to_id=assigned_to_id,
+            bins=sketch.to_json(),
+        )
+        for (month, metric, issue_id, assigned_to_id), sketch in sketches.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_alter_subissue_unique_together_alter_subissue_issue'),
+        ('tickets', '0008_ticket_daily_rollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketSlaSketch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('metric', models.CharField(choices=[('time_to_assign', 'Time to assign'), ('time_to_resolve', 'Time to resolve')], max_length=20)),
+                ('bins', models.JSONField(default=dict)),
+                ('assigned_to', models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='tickets.staff')),
+                ('issue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.issue')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['assigned_to', 'metric'], name='sla_sketch_staff_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('assigned_to__isnull', False)), fields=('month', 'metric', 'issue', 'assigned_to'), name='sla_sketch_assigned_key'), models.UniqueConstraint(condition=models.Q(('assigned_to__isnull', True)), fields=('month', 'metric', 'issue'), name='sla_sketch_unassigned_key')],
+            },
+        ),
+        migrations.RunPython(backfill_sketches, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,121 @@
+# Generated by Django 6.0.2 on 2026-10-18 20:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+# PostgreSQL: range-partitioned by created_at month. A partitioned
+# table's primary key must include the partition key, so it is
+# (id, created_at). Monthly partitions are created ahead of each
+# archiving run (archive_service.ensure_partitions); anything else
+# lands in the DEFAULT partition.
+ARCHIVED_TICKET_PARTITIONED_SQL = [
+    """
+    CREATE TABLE "tickets_archivedticket" (
+        "id" bigint NOT NULL,
+        "ticket_number" uuid NOT NULL,
+        "description" text NOT NULL,
+        "status" varchar(20) NOT NULL,
+        "created_at" timestamp with time zone NOT NULL,
+        "updated_at" timestamp with time zone NOT NULL,
+        "assigned_at" timestamp with time zone NULL,
+        "started_at" timestamp with time zone NULL,
+        "resolved_at" timestamp with time zone NULL,
+        "closed_at" timestamp with time zone NULL,
+        "archived_at" timestamp with time zone NOT NULL,
+        "assigned_to_id" bigint NULL
+            REFERENCES "tickets_staff" ("id") DEFERRABLE INITIALLY DEFERRED,
+        "client_id" bigint NOT NULL
+            REFERENCES "tickets_client" ("id") DEFERRABLE INITIALLY DEFERRED,
+        "issue_id" bigint NOT NULL
+            REFERENCES "core_issue" ("id") DEFERRABLE INITIALLY DEFERRED,
+        "sub_issue_id" bigint NOT NULL
+            REFERENCES "core_subissue" ("id") DEFERRABLE INITIALLY DEFERRED,
+        PRIMARY KEY ("id", "created_at")
+    ) PARTITION BY RANGE ("created_at")
+    """,
+    'CREATE TABLE "tickets_archivedticket_default" PARTITION OF "tickets_archivedticket" DEFAULT',
+    'CREATE INDEX "archived_ticket_number_idx" ON "tickets_archivedticket" ("ticket_number")',
+    'CREATE INDEX "archived_issue_idx" ON "tickets_archivedticket" ("issue_id")',
+    'CREATE INDEX "archived_sub_issue_idx" ON "tickets_archivedticket" ("sub_issue_id")',
+    'CREATE INDEX "archived_staff_created_idx" ON "tickets_archivedticket" ("assigned_to_id", "created_at" DESC)',
+    'CREATE INDEX "archived_client_created_idx" ON "tickets_archivedticket" ("client_id", "created_at" DESC)',
+]
+
+
+def create_archived_ticket_table(apps, schema_editor):
+    model = apps.get_model("tickets", "ArchivedTicket")
+
+    if schema_editor.connection.vendor != "postgresql":
+        schema_editor.create_model(model)
+        return
+
+    for sql in ARCHIVED_TICKET_PARTITIONED_SQL:
+        schema_editor.execute(sql)
+
+
+def drop_archived_ticket_table(apps, schema_editor):
+    schema_editor.delete_model(apps.get_model("tickets", "ArchivedTicket"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_alter_subissue_unique_together_alter_subissue_issue'),
+        ('tickets', '0009_ticket_sla_sketch'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # The table itself is created by create_archived_ticket_table
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='ArchivedTicket',
+                    fields=[
+                        ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                        ('ticket_number', models.UUIDField(db_index=True, editable=False)),
+                        ('description', models.TextField()),
+                        ('status', models.CharField(choices=[('CREATED', 'Created'), ('ASSIGNED', 'Assigned'), ('STARTED', 'Started'), ('RESOLVED', 'Resolved'), ('CLOSED', 'Closed')], default='CLOSED', max_length=20)),
+                        ('created_at', models.DateTimeField()),
+                        ('updated_at', models.DateTimeField()),
+                        ('assigned_at', models.DateTimeField(null=True)),
+                        ('started_at', models.DateTimeField(null=True)),
+                        ('resolved_at', models.DateTimeField(null=True)),
+                        ('closed_at', models.DateTimeField(null=True)),
+                        ('archived_at', models.DateTimeField(auto_now_add=True)),
+                        ('assigned_to', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_tickets', to='tickets.staff')),
+                        ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_tickets', to='tickets.client')),
+                        ('issue', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='core.issue')),
+                        ('sub_issue', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='core.subissue')),
+                    ],
+                ),
+                migrations.AddIndex(
+                    model_name='archivedticket',
+                    index=models.Index(fields=['assigned_to', '-created_at'], name='archived_staff_created_idx'),
+                ),
+                migrations.AddIndex(
+                    model_name='archivedticket',
+                    index=models.Index(fields=['client', '-created_at'], name='archived_client_created_idx'),
+                ),
+            ],
+        ),
+        migrations.RunPython(create_archived_ticket_table, drop_archived_ticket_table),
+        migrations.CreateModel(
+            name='ArchivedTicketActivity',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('old_status', models.CharField(max_length=20)),
+                ('new_status', models.CharField(max_length=20)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('changed_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('ticket', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='activities', to='tickets.archivedticket')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='archivedticketactivity',
+            index=models.Index(fields=['ticket', '-created_at', '-id'], name='archived_activity_ticket_idx'),
+        ),
+    ]
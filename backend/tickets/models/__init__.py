@@ -1,4 +1,8 @@
 from .client import Client
 from .staff import Staff
 from .ticket import Ticket
-from .ticket_activity import TicketActivity
\ No newline at end of file
+from .ticket_activity import TicketActivity
+from .ticket_rollup import TicketDailyRollup
+from .sla_sketch import TicketSlaSketch
+from .archive import ArchivedTicket, ArchivedTicketActivity
+from .notification import ClientNotification
@@ -0,0 +1,122 @@
+from django.db import models
+from django.conf import settings
+from core.models import Issue, SubIssue
+from .client import Client
+from .staff import Staff
+from .ticket import Ticket, TicketQuerySet
+
+
+class ArchivedTicket(models.Model):
+    """
+    Cold storage for tickets CLOSED longer than TICKET_ARCHIVE_AFTER_DAYS
+    (see tickets.services.archive_service). Rows keep their original id,
+    ticket number and timestamps, and are read-only.
+
+    On PostgreSQL the table is range-partitioned by ``created_at`` month
+    (migration 0010); the database primary key is ``(id, created_at)``.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+
+    ticket_number = models.UUIDField(db_index=True, editable=False)
+
+    client = models.ForeignKey(
+        Client,
+        on_delete=models.CASCADE,
+        related_name='archived_tickets'
+    )
+
+    issue = models.ForeignKey(
+        Issue,
+        on_delete=models.PROTECT,
+        related_name='+'
+    )
+
+    sub_issue = models.ForeignKey(
+        SubIssue,
+        on_delete=models.PROTECT,
+        related_name='+'
+    )
+
+    description = models.TextField()
+
+    assigned_to = models.ForeignKey(
+        Staff,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name='archived_tickets'
+    )
+
+    status = models.CharField(
+        max_length=20,
+        choices=Ticket.Status.choices,
+        default=Ticket.Status.CLOSED
+    )
+
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    assigned_at = models.DateTimeField(null=True)
+    started_at = models.DateTimeField(null=True)
+    resolved_at = models.DateTimeField(null=True)
+    closed_at = models.DateTimeField(null=True)
+
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    # Same role scoping / eager loading as the hot table
+    objects = TicketQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["assigned_to", "-created_at"],
+                name="archived_staff_created_idx",
+            ),
+            models.Index(
+                fields=["client", "-created_at"],
+                name="archived_client_created_idx",
+            ),
+        ]
+
+    def get_allowed_transitions(self, user):
+        # Archived tickets are CLOSED: nothing can follow
+        return []
+
+    def __str__(self):
+        return f"{self.ticket_number} - {self.status} (archived)"
+
+
+class ArchivedTicketActivity(models.Model):
+
+    id = models.BigIntegerField(primary_key=True)
+
+    # No FK constraint: the partitioned parent has no unique key on id alone
+    ticket = models.ForeignKey(
+        ArchivedTicket,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='activities'
+    )
+
+    changed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='+'
+    )
+
+    old_status = models.CharField(max_length=20)
+    new_status = models.CharField(max_length=20)
+
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["ticket", "-created_at", "-id"],
+                name="archived_activity_ticket_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.ticket_id} - {self.old_status} → {self.new_status}"
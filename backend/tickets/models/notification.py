@@ -0,0 +1,72 @@
+from django.db import models
+from django.db.models import Q
+from core.models.base import TimeStampedModel
+from .client import Client
+from .ticket import Ticket
+
+
+class ClientNotification(TimeStampedModel):
+    """
+    Outbox row: one message to a ticket's client on one channel, written
+    in the same transaction as the transition it reports and delivered
+    later by ``python manage.py send_notifications`` (see
+    tickets.services.notification_service).
+    """
+
+    class Channel(models.TextChoices):
+        EMAIL = 'email', 'Email'
+        WHATSAPP = 'whatsapp', 'WhatsApp'
+
+    class State(models.TextChoices):
+        PENDING = 'PENDING', 'Pending'
+        SENT = 'SENT', 'Sent'
+        FAILED = 'FAILED', 'Failed'
+        SKIPPED = 'SKIPPED', 'Skipped'
+
+    # No database constraint: archiving moves tickets out of the table,
+    # and their pending notifications must survive it
+    ticket = models.ForeignKey(
+        Ticket,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='+'
+    )
+
+    client = models.ForeignKey(
+        Client,
+        on_delete=models.CASCADE,
+        related_name='notifications'
+    )
+
+    channel = models.CharField(max_length=20, choices=Channel.choices)
+
+    # Status the ticket moved to
+    ticket_status = models.CharField(max_length=20, choices=Ticket.Status.choices)
+
+    state = models.CharField(
+        max_length=20,
+        choices=State.choices,
+        default=State.PENDING
+    )
+
+    attempts = models.PositiveIntegerField(default=0)
+
+    # Due time of the next attempt (or end of a sender's claim)
+    next_attempt_at = models.DateTimeField()
+
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    last_error = models.TextField(blank=True, default="")
+
+    class Meta:
+        indexes = [
+            # The sender's queue scan: due pending rows, oldest first
+            models.Index(
+                fields=["next_attempt_at"],
+                condition=Q(state='PENDING'),
+                name="notification_due_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.channel} {self.ticket_status} ticket {self.ticket_id} - {self.state}"
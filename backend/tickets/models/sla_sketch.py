@@ -0,0 +1,61 @@
+from django.db import models
+from django.db.models import Q
+from core.models import Issue
+from .staff import Staff
+
+
+class TicketSlaSketch(models.Model):
+    """
+    Quantile sketch (tickets.quantile_sketch) of one SLA duration for the
+    tickets of an issue / assigned staff whose interval ended in ``month``.
+
+    Maintained and read on every database; on PostgreSQL the exact
+    ``percentile_cont`` values only serve to verify them. See
+    tickets.services.sla_service.
+    """
+
+    class Metric(models.TextChoices):
+        TIME_TO_ASSIGN = 'time_to_assign', 'Time to assign'
+        TIME_TO_RESOLVE = 'time_to_resolve', 'Time to resolve'
+
+    month = models.DateField()
+
+    metric = models.CharField(max_length=20, choices=Metric.choices)
+
+    issue = models.ForeignKey(
+        Issue,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+
+    # Same reasoning as TicketDailyRollup.assigned_to
+    assigned_to = models.ForeignKey(
+        Staff,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        related_name='+'
+    )
+
+    # {bin index: sample count}
+    bins = models.JSONField(default=dict)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["month", "metric", "issue", "assigned_to"],
+                condition=Q(assigned_to__isnull=False),
+                name="sla_sketch_assigned_key",
+            ),
+            models.UniqueConstraint(
+                fields=["month", "metric", "issue"],
+                condition=Q(assigned_to__isnull=True),
+                name="sla_sketch_unassigned_key",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["assigned_to", "metric"], name="sla_sketch_staff_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.month:%Y-%m} {self.metric}"
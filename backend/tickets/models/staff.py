@@ -18,5 +18,14 @@ class Staff(TimeStampedModel):
 
     is_active = models.BooleanField(default=True)
 
+    class Meta:
+        indexes = [
+            # Eligible staff lookups: specialty + is_active
+            models.Index(
+                fields=["specialty", "is_active"],
+                name="staff_specialty_active_idx",
+            ),
+        ]
+
     def __str__(self):
         return self.user.username
\ No newline at end of file
@@ -1,5 +1,7 @@
 import uuid
-from django.db import models
+from functools import lru_cache
+from django.db import models, transaction
+from django.contrib.postgres.search import SearchVectorField
 from core.models import Issue, SubIssue
 from .client import Client
 from .staff import Staff
@@ -8,24 +10,56 @@ from smart_selects.db_fields import ChainedForeignKey
 from accounts.models import User
 
 
-class TicketQuerySet(models.QuerySet):
+class RoleScopedQuerySet(models.QuerySet):
     """
-    Role-based filtering at model layer.
+    Role-based filtering at model layer, for models with ``client`` and
+    ``assigned_to`` foreign keys.
     """
 
     def for_user(self, user):
         if user.role == User.Role.ADMIN:
             return self
 
+        # Token principals carry their staff / client id as claims, which
+        # filters on the FK column directly instead of joining the profile.
         if user.role == User.Role.STAFF:
-            return self.filter(assigned_to__user=user)
+            staff_id = getattr(user, "staff_id", None)
+            if staff_id is not None:
+                return self.filter(assigned_to_id=staff_id)
+            return self.filter(assigned_to__user_id=user.pk)
 
         if user.role == User.Role.CLIENT:
-            return self.filter(client__user=user)
+            client_id = getattr(user, "client_id", None)
+            if client_id is not None:
+                return self.filter(client_id=client_id)
+            return self.filter(client__user_id=user.pk)
 
         return self.none()
 
 
+class TicketQuerySet(RoleScopedQuerySet):
+
+    def for_serializer(self, serializer_class):
+        """
+        Eager-load exactly the relations a serializer reads through
+        dotted ``source`` attributes (e.g. ``client.user.username``).
+        """
+        return self.select_related(*_related_paths(serializer_class))
+
+
+@lru_cache(maxsize=None)
+def _related_paths(serializer_class):
+    paths = set()
+
+    for field in serializer_class().fields.values():
+        parts = field.source.split(".")[:-1]
+
+        if parts:
+            paths.add("__".join(parts))
+
+    return tuple(sorted(paths))
+
+
 class Ticket(TimeStampedModel):
 
     class Status(models.TextChoices):
@@ -87,39 +121,88 @@ class Ticket(TimeStampedModel):
     resolved_at = models.DateTimeField(null=True, blank=True)
     closed_at = models.DateTimeField(null=True, blank=True)
 
+    # Maintained by a database trigger (see migration 0006); the SQLite
+    # fallback keeps an FTS5 index in tickets_ticket_fts instead.
+    search_vector = SearchVectorField(null=True, editable=False)
+
     # 👇 Attach custom manager
     objects = TicketQuerySet.as_manager()
 
+    class Meta:
+        indexes = [
+            # for_user() scopes + default "-created_at" ordering / keyset
+            models.Index(
+                fields=["assigned_to", "-created_at", "-id"],
+                name="ticket_staff_created_idx",
+            ),
+            models.Index(
+                fields=["client", "-created_at", "-id"],
+                name="ticket_client_created_idx",
+            ),
+            # ADMIN list, TicketFilter status / created_at ranges
+            models.Index(
+                fields=["-created_at", "-id"],
+                name="ticket_created_idx",
+            ),
+            models.Index(
+                fields=["status", "-created_at", "-id"],
+                name="ticket_status_created_idx",
+            ),
+        ]
+
     def get_allowed_transitions(self, user):
-        transitions = {
-            "CREATED": ["ASSIGNED"],
-            "ASSIGNED": ["STARTED"],
-            "STARTED": ["RESOLVED"],
-            "RESOLVED": ["CLOSED"],
-            "CLOSED": [],
-        }
-        allowed = transitions.get(self.status, [])
-        
-        # STAFF cannot close tickets
-        if user.role == User.Role.STAFF:
-            allowed = [s for s in allowed if s != self.Status.CLOSED]
-        
-        # CLIENT cannot update tickets
-        if user.role == User.Role.CLIENT:
-            allowed = []
-        
-        return allowed
+        from tickets.state_machine import allowed_transitions
+
+        return list(allowed_transitions(self.status, user.role))
 
     def save(self, *args, **kwargs):
+        from tickets.services.ticket_change_service import (
+            record_created,
+            record_moves,
+            stored_ticket_state,
+            ticket_state,
+        )
+
         is_new = self.pk is None
 
         if not is_new:
-            old_status = Ticket.objects.get(pk=self.pk).status
+            # Tracked instances already know the status they were loaded with.
+            if self.is_tracked:
+                old_status = self.get_original_value("status")
+            else:
+                old_status = (
+                    Ticket.objects
+                    .values_list("status", flat=True)
+                    .get(pk=self.pk)
+                )
 
             if old_status == self.Status.CLOSED:
                 raise ValueError("Closed tickets cannot be modified.")
 
-        super().save(*args, **kwargs)
+        if not is_new and self.is_tracked and not self.get_changed_fields():
+            # Nothing to write (TimeStampedModel skips the UPDATE)
+            return super().save(*args, **kwargs)
+
+        # Ticket row and its daily rollup counts change together
+        with transaction.atomic():
+            old_state = None if is_new else stored_ticket_state(self)
+
+            super().save(*args, **kwargs)
+
+            if is_new:
+                record_created([self])
+            else:
+                record_moves([(old_state, ticket_state(self))])
+
+    def delete(self, *args, **kwargs):
+        from tickets.services.ticket_change_service import record_deleted, stored_ticket_state
+
+        with transaction.atomic():
+            state = stored_ticket_state(self)
+            result = super().delete(*args, **kwargs)
+            record_deleted([state])
+
+        return result
 
     def __str__(self):
         return f"{self.ticket_number} - {self.status}"
\ No newline at end of file
@@ -20,5 +20,14 @@ class TicketActivity(TimeStampedModel):
     old_status = models.CharField(max_length=20)
     new_status = models.CharField(max_length=20)
 
+    class Meta:
+        indexes = [
+            # Activity feed: newest first per ticket, keyset on (created_at, id)
+            models.Index(
+                fields=["ticket", "-created_at", "-id"],
+                name="activity_ticket_created_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"{self.ticket.ticket_number} - {self.old_status} → {self.new_status}"
\ No newline at end of file
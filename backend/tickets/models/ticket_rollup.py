@@ -0,0 +1,75 @@
+from django.db import models
+from django.db.models import Q
+from core.models import Issue
+from .client import Client
+from .staff import Staff
+from .ticket import RoleScopedQuerySet
+
+
+class TicketRollupQuerySet(RoleScopedQuerySet):
+    """
+    Same role scoping as Ticket.objects.for_user().
+    """
+
+
+class TicketDailyRollup(models.Model):
+    """
+    Number of tickets created on ``day`` that are currently in ``status``,
+    per issue / client / assigned staff.
+
+    Kept in step with the tickets table by tickets.services.rollup_service
+    in the same transaction as every ticket write; rebuild with
+    ``python manage.py rebuild_rollups``.
+    """
+
+    day = models.DateField()
+
+    status = models.CharField(max_length=20)
+
+    issue = models.ForeignKey(
+        Issue,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+
+    client = models.ForeignKey(
+        Client,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+
+    # No FK constraint: deleting a Staff row SET_NULLs its tickets, and the
+    # orphaned rollup rows still count towards every other dimension.
+    assigned_to = models.ForeignKey(
+        Staff,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        related_name='+'
+    )
+
+    count = models.IntegerField(default=0)
+
+    objects = TicketRollupQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            # NULLs are distinct in UNIQUE, so unassigned rows need their own
+            models.UniqueConstraint(
+                fields=["day", "status", "issue", "client", "assigned_to"],
+                condition=Q(assigned_to__isnull=False),
+                name="rollup_assigned_key",
+            ),
+            models.UniqueConstraint(
+                fields=["day", "status", "issue", "client"],
+                condition=Q(assigned_to__isnull=True),
+                name="rollup_unassigned_key",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["client", "day"], name="rollup_client_day_idx"),
+            models.Index(fields=["assigned_to", "day"], name="rollup_staff_day_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.status} x{self.count}"
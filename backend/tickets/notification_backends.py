@@ -0,0 +1,125 @@
+"""
+Delivery backends for client notifications, one per channel, chosen by
+settings.NOTIFICATION_BACKENDS (see tickets.services.notification_service).
+
+The sender opens a backend once per batch, sends every message of that
+channel through it, then closes it, so connections (SMTP, HTTP) are
+reused across a batch. ``send()`` raises to report a failed attempt;
+PermanentError means retrying cannot help.
+"""
+import json
+from http.client import HTTPException, HTTPSConnection
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.mail import EmailMessage, get_connection
+
+
+class PermanentError(Exception):
+    pass
+
+
+class NotificationBackend:
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def send(self, message):
+        raise NotImplementedError
+
+
+class EmailBackend(NotificationBackend):
+    """
+    Django's email machinery (EMAIL_BACKEND): SMTP in production, locmem
+    (``django.core.mail.outbox``) under the test runner.
+    """
+
+    def open(self):
+        self.connection = get_connection(fail_silently=False)
+        self.connection.open()
+
+    def close(self):
+        self.connection.close()
+
+    def send(self, message):
+        EmailMessage(
+            subject=message.subject,
+            body=message.body,
+            to=[message.recipient],
+            connection=self.connection,
+        ).send()
+
+
+class WhatsAppCloudBackend(NotificationBackend):
+    """
+    WhatsApp Business Cloud API text messages over one keep-alive HTTPS
+    connection per batch. WHATSAPP_API_URL is e.g.
+    https://graph.facebook.com/v20.0/<phone number id>/messages.
+    """
+
+    timeout = 10
+
+    def __init__(self):
+        if not (settings.WHATSAPP_API_URL and settings.WHATSAPP_API_TOKEN):
+            raise ImproperlyConfigured("WHATSAPP_API_URL and WHATSAPP_API_TOKEN are not set")
+
+    def open(self):
+        url = urlsplit(settings.WHATSAPP_API_URL)
+        self.path = url.path
+        self.connection = HTTPSConnection(url.netloc, timeout=self.timeout)
+
+    def close(self):
+        self.connection.close()
+
+    def send(self, message):
+        payload = {
+            "messaging_product": "whatsapp",
+            "to": message.recipient,
+            "type": "text",
+            "text": {"body": message.body},
+        }
+
+        try:
+            self.connection.request(
+                "POST",
+                self.path,
+                json.dumps(payload),
+                {
+                    "Authorization": f"Bearer {settings.WHATSAPP_API_TOKEN}",
+                    "Content-Type": "application/json",
+                },
+            )
+            response = self.connection.getresponse()
+            body = response.read()
+        except (OSError, HTTPException):
+            # Reconnects on the next message
+            self.connection.close()
+            raise
+
+        if response.status >= 400:
+            error = f"HTTP {response.status}: {body[:500]!r}"
+
+            # Rate limiting and server errors are worth retrying; other
+            # client errors (bad number, token, payload) are not
+            if response.status == 429 or response.status >= 500:
+                raise RuntimeError(error)
+            raise PermanentError(error)
+
+
+# Messages "sent" through FakeWhatsAppBackend, like django.core.mail.outbox.
+# Never cleared outside the tests
+whatsapp_outbox = []
+
+
+class FakeWhatsAppBackend(NotificationBackend):
+    """
+    Records messages in ``whatsapp_outbox`` instead of sending them. For
+    tests only: the settings never select it.
+    """
+
+    def send(self, message):
+        whatsapp_outbox.append(message)
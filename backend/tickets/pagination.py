@@ -0,0 +1,308 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    BasePagination,
+    PageNumberPagination,
+    _positive_int,
+)
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset ("seek") pagination.
+
+    Pages are addressed by the ordering values of the last row seen, so a
+    page is a single indexed range scan: no COUNT(*) and no OFFSET. The
+    ordering chosen by OrderingFilter (including the ``search_rank``
+    relevance annotation) is kept and (created_at, id) are appended as
+    tie-breakers so every row has a unique position.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    tiebreakers = ("created_at", "id")
+    invalid_cursor_message = "Invalid cursor."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.set_page(list(self.page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        return self.set_page([row async for row in self.page_queryset(queryset, request)])
+
+    def page_queryset(self, queryset, request):
+        """
+        The page's rows plus one (to tell whether there are more), unevaluated.
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+
+        self.keys = self.get_keys(queryset)
+        self.fields = [
+            self.resolve_field(queryset, key.lstrip("-")) for key in self.keys
+        ]
+
+        self.position, self.reverse = self.decode_cursor(request)
+
+        keys = self.keys
+        if self.reverse:
+            keys = [self._invert(key) for key in keys]
+
+        queryset = queryset.order_by(*keys)
+        if self.position is not None:
+            queryset = queryset.filter(self.seek(keys, self.position))
+
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, rows):
+        position = self.position
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+
+        if self.reverse:
+            rows.reverse()
+
+        self.has_next = has_more if not self.reverse else position is not None
+        self.has_previous = position is not None if not self.reverse else has_more
+        self.page = rows
+
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size,
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    # ------------------------------
+    # Ordering & seek predicate
+    # ------------------------------
+    def get_keys(self, queryset):
+        keys = [key for key in queryset.query.order_by if isinstance(key, str)]
+        names = {key.lstrip("-") for key in keys}
+        descending = bool(keys) and keys[0].startswith("-")
+
+        for name in self.tiebreakers:
+            if name not in names:
+                keys.append(f"-{name}" if descending or not keys else name)
+                names.add(name)
+
+        return keys
+
+    @staticmethod
+    def resolve_field(queryset, name):
+        """
+        Return ``(attname, field)`` for an ordering key: a model field or an
+        annotation such as ``search_rank``.
+        """
+        if name in queryset.query.annotations:
+            return name, queryset.query.annotations[name].output_field
+
+        field = queryset.model._meta.get_field(name)
+        return field.attname, field
+
+    def seek(self, keys, position):
+        """
+        Rows strictly after ``position`` in ``keys`` order, written as the
+        expanded row comparison (a > x) OR (a = x AND b > y) OR ...
+        """
+        predicate = Q()
+
+        for i, key in enumerate(keys):
+            name = key.lstrip("-")
+            lookup = "lt" if key.startswith("-") else "gt"
+
+            branch = Q(**{f"{name}__{lookup}": position[i]})
+            for prev_key, prev_value in zip(keys[:i], position[:i]):
+                branch &= Q(**{prev_key.lstrip("-"): prev_value})
+
+            predicate |= branch
+
+        return predicate
+
+    @staticmethod
+    def _invert(key):
+        return key[1:] if key.startswith("-") else f"-{key}"
+
+    # ------------------------------
+    # Cursor encoding
+    # ------------------------------
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            payload = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+            values = payload["v"]
+            reverse = bool(payload.get("r"))
+
+            if len(values) != len(self.fields):
+                raise ValueError
+
+            position = [
+                field.to_python(value)
+                for (_, field), value in zip(self.fields, values)
+            ]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+        return position, reverse
+
+    def encode_cursor(self, row, reverse):
+        values = []
+        for attname, field in self.fields:
+            value = getattr(row, attname)
+
+            # value_to_string keeps full microsecond precision on datetimes
+            if not isinstance(value, (int, float, str)):
+                value = field.value_to_string(row)
+
+            values.append(value)
+
+        payload = json.dumps({"v": values, "r": int(reverse)})
+
+        return replace_query_param(
+            self.base_url,
+            self.cursor_query_param,
+            urlsafe_b64encode(payload.encode()).decode("ascii"),
+        )
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+
+class AsyncPageNumberPagination(PageNumberPagination):
+    """
+    PageNumberPagination that can also count and fetch a page through the
+    async ORM (``apaginate_queryset``), for the async views.
+    """
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        # Set ahead so the paginator never runs its own (sync) COUNT
+        paginator.count = await queryset.acount()
+
+        page_number = self.get_page_number(request, paginator)
+
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            ))
+
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+
+        self.page.object_list = [row async for row in self.page.object_list]
+        return list(self.page)
+
+
+class TicketPagination(BasePagination):
+    """
+    Page-number pagination by default (keeps ``count`` for existing
+    clients); switches to keyset pagination when the client asks for
+    ``?pagination=keyset`` or follows a keyset ``cursor`` link.
+    """
+
+    mode_query_param = "pagination"
+
+    def __init__(self):
+        self.page_number = AsyncPageNumberPagination()
+        self.keyset = KeysetPagination()
+        self.paginator = self.page_number
+
+    def is_keyset(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == "keyset"
+            or self.keyset.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.is_keyset(request):
+            self.paginator = self.keyset
+
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        if self.is_keyset(request):
+            self.paginator = self.keyset
+
+        return await self.paginator.apaginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.page_number.get_paginated_response_schema(schema)
+
+    @property
+    def display_page_controls(self):
+        return getattr(self.paginator, "display_page_controls", False)
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+    def get_schema_operation_parameters(self, view):
+        return self.page_number.get_schema_operation_parameters(view) + [
+            {
+                "name": self.mode_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Set to 'keyset' for cursor-based pagination.",
+                "schema": {"type": "string", "enum": ["keyset"]},
+            },
+            {
+                "name": self.keyset.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Keyset pagination cursor.",
+                "schema": {"type": "string"},
+            },
+        ]
@@ -0,0 +1,88 @@
+"""
+Mergeable quantile sketch for durations.
+
+Values are counted in logarithmic bins (the DDSketch layout): bin ``i``
+covers ``(GAMMA ** (i - 1), GAMMA ** i]``, so any quantile read back is
+within RELATIVE_ACCURACY of the true sample value. Two sketches merge by
+adding bin counts, and a sample is removed by decrementing its bin, which
+lets per-bucket sketches be maintained incrementally and combined at
+read time.
+"""
+import math
+
+
+RELATIVE_ACCURACY = 0.01
+
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(GAMMA)
+
+# Durations are recorded in seconds; anything under a second shares bin 0
+MIN_VALUE = 1.0
+
+
+def bin_index(value):
+    return math.ceil(math.log(max(value, MIN_VALUE)) / _LOG_GAMMA)
+
+
+def bin_value(index):
+    # Midpoint (in relative terms) of the bin's range
+    return 2 * GAMMA ** index / (GAMMA + 1)
+
+
+class QuantileSketch:
+
+    def __init__(self, bins=None):
+        self.bins = {}
+        self.count = 0
+
+        for index, count in (bins or {}).items():
+            self.add_bin(int(index), count)
+
+    def add(self, value, count=1):
+        self.add_bin(bin_index(value), count)
+
+    def add_bin(self, index, count):
+        total = self.bins.get(index, 0) + count
+
+        if total:
+            self.bins[index] = total
+        else:
+            self.bins.pop(index, None)
+
+        self.count += count
+
+    def merge(self, other):
+        for index, count in other.bins.items():
+            self.add_bin(index, count)
+        return self
+
+    def quantile(self, q):
+        """
+        Value at quantile ``q`` (0..1), interpolated between ranks like
+        percentile_cont; None when the sketch is empty.
+        """
+        if self.count <= 0:
+            return None
+
+        rank = q * (self.count - 1)
+        lower = math.floor(rank)
+        value = self._value_at(lower)
+
+        if rank == lower:
+            return value
+
+        return value + (self._value_at(lower + 1) - value) * (rank - lower)
+
+    def _value_at(self, rank):
+        seen = 0
+
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if seen > rank:
+                return bin_value(index)
+
+        return bin_value(max(self.bins))
+
+    def to_json(self):
+        # JSON object keys must be strings
+        return {str(index): count for index, count in self.bins.items()}
@@ -1,5 +1,6 @@
 from .ticket_serializers import *
 from .activity_serializer import *
+from .bulk_serializer import *
 from .ticket_serializers import (
     TicketSerializer,
     TicketCreateSerializer,
@@ -8,4 +9,8 @@ from .ticket_serializers import (
 
 from .activity_serializer import (
     TicketActivitySerializer,
+)
+
+from .bulk_serializer import (
+    TicketBulkUpdateSerializer,
 )
\ No newline at end of file
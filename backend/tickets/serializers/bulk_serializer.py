@@ -0,0 +1,26 @@
+from rest_framework import serializers
+from tickets.models import Ticket, Staff
+
+
+class TicketBulkUpdateSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=5000,
+    )
+    status = serializers.ChoiceField(choices=Ticket.Status.choices, required=False)
+    assigned_to = serializers.PrimaryKeyRelatedField(
+        queryset=Staff.objects.all(),
+        required=False,
+        allow_null=True,
+    )
+
+    def validate(self, data):
+        if "status" not in data and "assigned_to" not in data:
+            raise serializers.ValidationError(
+                "Provide a target status and/or assigned_to."
+            )
+
+        # Duplicates would be applied (and logged) twice
+        data["ids"] = list(dict.fromkeys(data["ids"]))
+        return data
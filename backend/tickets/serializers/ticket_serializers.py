@@ -1,6 +1,6 @@
 from rest_framework import serializers
 from tickets.models import Ticket
-from accounts.models import User
+from tickets.state_machine import update_error
 
 
 class TicketSerializer(serializers.ModelSerializer):
@@ -47,15 +47,15 @@ class TicketSerializer(serializers.ModelSerializer):
 
 
 class TicketCreateSerializer(serializers.ModelSerializer):
+    sub_issue_mismatch_message = "Selected sub-issue does not belong to selected issue."
+
     class Meta:
         model = Ticket
         fields = ["issue", "sub_issue", "description"]
 
     def validate(self, data):
-        if data["sub_issue"].issue != data["issue"]:
-            raise serializers.ValidationError(
-                "Selected sub-issue does not belong to selected issue."
-            )
+        if data["sub_issue"].issue_id != data["issue"].id:
+            raise serializers.ValidationError(self.sub_issue_mismatch_message)
         return data
 
 
@@ -65,37 +65,9 @@ class TicketStatusUpdateSerializer(serializers.ModelSerializer):
         fields = ["status", "assigned_to"]
 
     def validate(self, data):
-        ticket = self.instance
-        user = self.context["request"].user
-
-        # Only validate active status updates
-        if "status" in data:
-            transitions = {
-                Ticket.Status.CREATED: [Ticket.Status.ASSIGNED],
-                Ticket.Status.ASSIGNED: [Ticket.Status.STARTED],
-                Ticket.Status.STARTED: [Ticket.Status.RESOLVED],
-                Ticket.Status.RESOLVED: [Ticket.Status.CLOSED],
-                Ticket.Status.CLOSED: [],
-            }
-
-            allowed = transitions.get(ticket.status, [])
-
-            if user.role == User.Role.STAFF:
-                allowed = [s for s in allowed if s != Ticket.Status.CLOSED]
-
-            if user.role == User.Role.CLIENT:
-                raise serializers.ValidationError("Clients cannot update ticket status.")
-
-            if data["status"] not in allowed:
-                raise serializers.ValidationError(
-                    f"Transition from {ticket.status} to {data['status']} not allowed."
-                )
+        error = update_error(self.instance, self.context["request"].user.role, data)
 
-        # Validate assigned_to field
-        if "assigned_to" in data and data["assigned_to"]:
-            if data["assigned_to"].specialty != ticket.issue:
-                raise serializers.ValidationError(
-                    "Assigned staff does not match ticket issue."
-                )
+        if error:
+            raise serializers.ValidationError(error)
 
         return data
\ No newline at end of file
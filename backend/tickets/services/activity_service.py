@@ -0,0 +1,128 @@
+"""
+Buffered TicketActivity writer.
+
+Status changes log their activity through ``log_activity``. Inside an
+``activity_batch()`` block entries are buffered and written with one
+``bulk_create`` when the block exits, or earlier once the buffer holds
+ACTIVITY_BATCH_SIZE entries or its oldest entry is ACTIVITY_FLUSH_SECONDS
+old.
+
+Durability: a batch is its own ``transaction.atomic()`` block and always
+flushes *before* that block ends, so activity rows commit together with
+the ticket changes they describe, or roll back with them. Nothing is
+held in memory past the transaction. Nested batches are savepoints and
+never flush while open, so rolling one back discards exactly the
+entries it buffered. Outside a batch, ``log_activity`` writes
+immediately.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+from django.db import transaction
+
+from tickets.models import TicketActivity
+
+
+ACTIVITY_BATCH_SIZE = 500
+ACTIVITY_FLUSH_SECONDS = 5.0
+
+_local = threading.local()
+
+
+class ActivityBuffer:
+
+    def __init__(self, batch_size=ACTIVITY_BATCH_SIZE, flush_seconds=ACTIVITY_FLUSH_SECONDS):
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.entries = []
+        self.started = None
+        self.flushes = 0
+        # Open nested batches (savepoints)
+        self.depth = 0
+
+    def add(self, activity):
+        if not self.entries:
+            self.started = time.monotonic()
+
+        self.entries.append(activity)
+        self.flush_if_due()
+
+    def flush_if_due(self):
+        # A flush inside a savepoint would be undone by its rollback
+        # together with entries buffered before it
+        if self.depth or not self.entries:
+            return
+
+        if (
+            len(self.entries) >= self.batch_size
+            or time.monotonic() - self.started >= self.flush_seconds
+        ):
+            self.flush()
+
+    def flush(self):
+        if self.entries:
+            TicketActivity.objects.bulk_create(self.entries, batch_size=self.batch_size)
+            self.entries = []
+            self.flushes += 1
+
+    def discard_since(self, mark):
+        """
+        Drop entries buffered after ``mark`` (the buffer length when a
+        nested batch began) whose savepoint rolled back.
+        """
+        del self.entries[mark:]
+
+
+@contextmanager
+def activity_batch(batch_size=ACTIVITY_BATCH_SIZE, flush_seconds=ACTIVITY_FLUSH_SECONDS):
+    """
+    Buffer ``log_activity`` calls for the duration of the block. Nested
+    batches join the outermost one.
+    """
+    current = getattr(_local, "buffer", None)
+
+    if current is not None:
+        mark = len(current.entries)
+        current.depth += 1
+        try:
+            with transaction.atomic():
+                yield current
+        except BaseException:
+            current.discard_since(mark)
+            raise
+        finally:
+            current.depth -= 1
+
+        current.flush_if_due()
+        return
+
+    buffer = ActivityBuffer(batch_size, flush_seconds)
+    _local.buffer = buffer
+
+    try:
+        with transaction.atomic():
+            yield buffer
+            # Still inside the transaction: rows commit with the changes
+            buffer.flush()
+    finally:
+        _local.buffer = None
+
+
+def log_activity(ticket, changed_by, old_status, new_status):
+    activity = TicketActivity(
+        ticket_id=getattr(ticket, "pk", ticket),
+        # A User or a claims TokenPrincipal
+        changed_by_id=getattr(changed_by, "pk", None),
+        old_status=old_status,
+        new_status=new_status,
+    )
+
+    buffer = getattr(_local, "buffer", None)
+
+    if buffer is None:
+        activity.save()
+    else:
+        buffer.add(activity)
+
+    return activity
@@ -0,0 +1,226 @@
+"""
+Archival of long-closed tickets.
+
+Tickets CLOSED for more than ``TICKET_ARCHIVE_AFTER_DAYS`` are moved, with
+their activity log, from the hot tables into ArchivedTicket /
+ArchivedTicketActivity in small transactions. The hot tables that list
+views, search and for_user() scans read then only hold the working set.
+
+Dashboard rollups are deliberately left untouched: archived tickets still
+count in every summary.
+
+On PostgreSQL the archive is partitioned by ``created_at`` month. The
+partitions a run needs are created before it moves anything, each in
+its own short transaction: DDL inside the move transactions would hold
+locks on the whole archive and fail when archivers race.
+"""
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from tickets.models import (
+    ArchivedTicket,
+    ArchivedTicketActivity,
+    Ticket,
+    TicketActivity,
+)
+
+
+ARCHIVE_BATCH_SIZE = 500
+
+# pg_advisory_xact_lock key serializing partition creation
+PARTITION_LOCK_ID = 7_208_115_001
+
+TICKET_COLUMNS = [
+    field.attname
+    for field in ArchivedTicket._meta.concrete_fields
+    if field.name != "archived_at"
+]
+
+ACTIVITY_COLUMNS = [field.attname for field in ArchivedTicketActivity._meta.concrete_fields]
+
+
+def archivable_tickets(older_than_days=None):
+    if older_than_days is None:
+        older_than_days = settings.TICKET_ARCHIVE_AFTER_DAYS
+
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+
+    return Ticket.objects.filter(
+        Q(closed_at__lt=cutoff)
+        # Tickets closed before lifecycle timestamps were recorded
+        | Q(closed_at__isnull=True, updated_at__lt=cutoff),
+        status=Ticket.Status.CLOSED,
+    )
+
+
+def archive_closed_tickets(older_than_days=None, batch_size=ARCHIVE_BATCH_SIZE):
+    """
+    Move every archivable ticket to the archive, ``batch_size`` per
+    transaction. Returns the number of tickets archived.
+    """
+    candidates = archivable_tickets(older_than_days).order_by("id")
+    archived = 0
+
+    ensure_partitions(
+        candidates.order_by().annotate(month=TruncMonth("created_at"))
+        .values_list("month", flat=True).distinct()
+    )
+
+    while True:
+        with transaction.atomic():
+            # SKIP LOCKED lets several archivers (or a retry) run side by side
+            ids = list(
+                candidates
+                .select_for_update(skip_locked=True)
+                .values_list("id", flat=True)[:batch_size]
+            )
+
+            if not ids:
+                return archived
+
+            _archive_batch(ids)
+
+        archived += len(ids)
+
+
+def _archive_batch(ids):
+    tickets = list(Ticket.objects.filter(id__in=ids).values(*TICKET_COLUMNS))
+    activities = list(
+        TicketActivity.objects.filter(ticket_id__in=ids).values(*ACTIVITY_COLUMNS)
+    )
+
+    ArchivedTicket.objects.bulk_create(ArchivedTicket(**row) for row in tickets)
+    ArchivedTicketActivity.objects.bulk_create(
+        ArchivedTicketActivity(**row) for row in activities
+    )
+
+    # QuerySet.delete() bypasses Ticket.delete(), so the rollups keep
+    # counting these tickets; activities go with them (CASCADE).
+    Ticket.objects.filter(id__in=ids).delete()
+
+
+def restore_tickets(ids):
+    """
+    Move archived tickets, with their activity, back to the hot tables
+    (e.g. archived by mistake). Returns the number of tickets restored.
+    Like archiving, this leaves the rollups alone.
+    """
+    with transaction.atomic():
+        tickets = list(
+            ArchivedTicket.objects
+            .select_for_update()
+            .filter(id__in=ids)
+            .values(*TICKET_COLUMNS)
+        )
+        ids = [ticket["id"] for ticket in tickets]
+        activities = list(
+            ArchivedTicketActivity.objects.filter(ticket_id__in=ids).values(*ACTIVITY_COLUMNS)
+        )
+
+        # bulk_create restamps auto_now(_add) fields; bulk_update puts the
+        # original timestamps back
+        for model, rows in ((Ticket, tickets), (TicketActivity, activities)):
+            model.objects.bulk_create(model(**row) for row in rows)
+            model.objects.bulk_update(
+                [model(**row) for row in rows],
+                ["created_at", "updated_at"],
+                batch_size=ARCHIVE_BATCH_SIZE,
+            )
+
+        ArchivedTicketActivity.objects.filter(ticket_id__in=ids).delete()
+        ArchivedTicket.objects.filter(id__in=ids).delete()
+
+    return len(ids)
+
+
+# ---------------------------------------------------
+# PostgreSQL partitions
+# ---------------------------------------------------
+def ensure_partitions(months):
+    """
+    Create the monthly partitions of the archive table for ``months``
+    (dates or datetimes within them) that don't exist yet (PostgreSQL
+    only). Each partition is created in its own transaction, under an
+    advisory lock, so it must not be called inside one.
+    """
+    if connection.vendor != "postgresql":
+        return
+
+    with connection.cursor() as cursor:
+        missing = [
+            month for month in sorted({_month_start(value) for value in months})
+            if not _partition_exists(cursor, month)
+        ]
+
+    if not missing:
+        return
+
+    if connection.in_atomic_block:
+        raise transaction.TransactionManagementError(
+            "Archive partitions must be created outside a transaction."
+        )
+
+    for month in missing:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", [PARTITION_LOCK_ID])
+
+            # Another archiver may have created it while we waited
+            if not _partition_exists(cursor, month):
+                _create_partition(cursor, month)
+
+
+def _month_start(value):
+    if isinstance(value, datetime):
+        value = timezone.localtime(value).date()
+    return value.replace(day=1)
+
+
+def _partition_name(month):
+    return f"{ArchivedTicket._meta.db_table}_p{month:%Y_%m}"
+
+
+def _partition_exists(cursor, month):
+    cursor.execute("SELECT to_regclass(%s)", [f'"{_partition_name(month)}"'])
+    return cursor.fetchone()[0] is not None
+
+
+def _create_partition(cursor, month):
+    table = ArchivedTicket._meta.db_table
+    partition = _partition_name(month)
+
+    next_month = (month + timedelta(days=32)).replace(day=1)
+    start, end = (
+        timezone.make_aware(datetime(day.year, day.month, 1)).isoformat()
+        for day in (month, next_month)
+    )
+    # DDL takes no bind parameters; the bounds are ISO timestamps
+    bounds = f"FOR VALUES FROM ('{start}') TO ('{end}')"
+
+    cursor.execute(
+        f'SELECT EXISTS (SELECT 1 FROM "{table}_default" '
+        f'WHERE "created_at" >= %s AND "created_at" < %s)',
+        [start, end],
+    )
+
+    if not cursor.fetchone()[0]:
+        cursor.execute(f'CREATE TABLE "{partition}" PARTITION OF "{table}" {bounds}')
+        return
+
+    # PARTITION OF fails while the DEFAULT partition holds rows of the
+    # month: move them into a standalone table, then attach it
+    cursor.execute(
+        f'CREATE TABLE "{partition}" (LIKE "{table}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+    )
+    cursor.execute(
+        f'WITH moved AS ('
+        f'DELETE FROM "{table}_default" '
+        f'WHERE "created_at" >= %s AND "created_at" < %s RETURNING *'
+        f') INSERT INTO "{partition}" SELECT * FROM moved',
+        [start, end],
+    )
+    cursor.execute(f'ALTER TABLE "{table}" ATTACH PARTITION "{partition}" {bounds}')
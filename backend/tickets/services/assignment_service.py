@@ -0,0 +1,192 @@
+"""
+Load-aware automatic assignment.
+
+Each process keeps an index of active staff and their load (open, i.e.
+ASSIGNED or STARTED, tickets), with one min-heap of ``(load, staff id)``
+per issue. Heap entries are invalidated lazily: when a load changes, a
+new entry is pushed and the old one is discarded the next time it
+surfaces. Picking the least-loaded eligible staff member is therefore
+O(log n).
+
+Loads follow ticket changes incrementally: ticket_change_service
+reports every committed status / assignment move through
+``apply_load_moves``. The index is reloaded from the database every
+REFRESH_SECONDS (to pick up other processes' writes), and after any
+Staff change (tickets.signals).
+"""
+import heapq
+import threading
+import time
+from collections import Counter, defaultdict, namedtuple
+
+from django.conf import settings
+from django.db.models import Count
+
+from tickets.models import Staff, Ticket
+from tickets.state_machine import transition_values
+
+
+OPEN_STATUSES = (Ticket.Status.ASSIGNED, Ticket.Status.STARTED)
+
+REFRESH_SECONDS = 30.0
+
+StaffEntry = namedtuple("StaffEntry", "user_id username issue_id")
+
+
+class AssignmentIndex:
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.loaded_at = None
+        self.staff = {}  # staff id -> StaffEntry (active staff only)
+        self.loads = {}  # staff id -> open tickets
+        self.heaps = {}  # issue id -> [(load, staff id)]
+        self.members = {}  # issue id -> number of its staff
+
+    def load(self):
+        staff = {
+            staff_id: StaffEntry(user_id, username, issue_id)
+            for staff_id, user_id, username, issue_id in (
+                Staff.objects
+                .filter(is_active=True)
+                .values_list("id", "user_id", "user__username", "specialty_id")
+            )
+        }
+
+        loads = dict.fromkeys(staff, 0)
+        for staff_id, count in (
+            Ticket.objects
+            .filter(status__in=OPEN_STATUSES, assigned_to__isnull=False)
+            .values_list("assigned_to")
+            .annotate(count=Count("id"))
+            .order_by()
+        ):
+            if staff_id in loads:
+                loads[staff_id] = count
+
+        heaps = defaultdict(list)
+        for staff_id, entry in staff.items():
+            heaps[entry.issue_id].append((loads[staff_id], staff_id))
+
+        for heap in heaps.values():
+            heapq.heapify(heap)
+
+        members = {issue_id: len(heap) for issue_id, heap in heaps.items()}
+
+        with self.lock:
+            self.staff, self.loads, self.heaps = staff, loads, dict(heaps)
+            self.members = members
+            self.loaded_at = time.monotonic()
+
+    def invalidate(self):
+        self.loaded_at = None
+
+    def sync(self):
+        if self.loaded_at is None or time.monotonic() - self.loaded_at >= REFRESH_SECONDS:
+            self.load()
+
+    def apply(self, deltas):
+        with self.lock:
+            if self.loaded_at is None:
+                return
+
+            for staff_id, delta in deltas.items():
+                if staff_id not in self.loads or not delta:
+                    continue
+
+                self.loads[staff_id] += delta
+                issue_id = self.staff[staff_id].issue_id
+                heap = self.heaps[issue_id]
+                heapq.heappush(heap, (self.loads[staff_id], staff_id))
+
+                # Stale entries pile up under churn; rebuild past 2x the
+                # issue's own staff
+                if len(heap) > 2 * self.members[issue_id] + 16:
+                    self._compact(heap)
+
+    def _compact(self, heap):
+        current = {(self.loads[staff_id], staff_id) for _, staff_id in heap}
+        heap[:] = sorted(current)
+
+    def least_loaded(self, issue_id):
+        self.sync()
+
+        with self.lock:
+            heap = self.heaps.get(issue_id, [])
+
+            while heap:
+                load, staff_id = heap[0]
+                if self.loads.get(staff_id) == load:
+                    return staff_id
+                heapq.heappop(heap)
+
+            return None
+
+    def ranked(self, issue_id):
+        self.sync()
+
+        with self.lock:
+            return sorted(
+                (
+                    (self.loads[staff_id], staff_id, entry)
+                    for staff_id, entry in self.staff.items()
+                    if entry.issue_id == issue_id
+                ),
+                key=lambda item: item[:2],
+            )
+
+
+index = AssignmentIndex()
+
+
+def pick_staff(issue_id):
+    """
+    Id of the least-loaded active staff member for ``issue_id``, or None.
+    """
+    return index.least_loaded(issue_id)
+
+
+def ranked_staff(issue_id):
+    """
+    ``[{"id": user id, "staff_id", "username", "load"}]`` for the active
+    staff eligible for ``issue_id``, least loaded first.
+    """
+    return [
+        {
+            "id": entry.user_id,
+            "staff_id": staff_id,
+            "username": entry.username,
+            "load": load,
+        }
+        for load, staff_id, entry in index.ranked(issue_id)
+    ]
+
+
+def auto_assignment(issue_id):
+    """
+    Field values that assign a new ticket to the least-loaded eligible
+    staff member; empty when auto-assignment is off or nobody is eligible.
+    """
+    if not settings.TICKET_AUTO_ASSIGN:
+        return {}
+
+    staff_id = pick_staff(issue_id)
+    if staff_id is None:
+        return {}
+
+    return {"assigned_to_id": staff_id, **transition_values(Ticket.Status.ASSIGNED)}
+
+
+def apply_load_moves(moves):
+    """
+    Fold committed ``(old_state, new_state)`` ticket moves into the staff
+    loads.
+    """
+    deltas = Counter()
+
+    for old_state, new_state in moves:
+        for state, delta in ((old_state, -1), (new_state, 1)):
+            if state is not None and state["status"] in OPEN_STATUSES and state["assigned_to_id"] is not None:
+                deltas[state["assigned_to_id"]] += delta
+
+    index.apply(deltas)
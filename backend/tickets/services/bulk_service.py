@@ -0,0 +1,119 @@
+from django.utils import timezone
+
+from tickets.models import Ticket
+from tickets.services.activity_service import activity_batch, log_activity
+from tickets.services.ticket_change_service import STATE_FIELDS, record_moves, ticket_state
+from tickets.state_machine import transition_values, update_error
+
+
+BULK_CHUNK_SIZE = 500
+
+UPDATED = "updated"
+FAILED = "failed"
+CONFLICT = "conflict"
+
+UNSET = object()
+
+
+def bulk_update_tickets(user, ids, status=None, assigned_to=UNSET, chunk_size=BULK_CHUNK_SIZE):
+    """
+    Move many tickets to ``status`` and/or reassign them to ``assigned_to``.
+
+    All tickets are loaded and checked in one pass, against the same rules
+    as single-ticket updates (state_machine.update_error). Valid tickets are then written in
+    chunked transactions: one UPDATE and one TicketActivity INSERT per
+    chunk. Returns one ``{"id", "result", "detail"}`` entry per requested id.
+    """
+    results = {}
+    planned = []
+
+    tickets = {
+        ticket.id: ticket
+        for ticket in (
+            Ticket.objects
+            .for_user(user)
+            .filter(id__in=ids)
+            .only("id", *STATE_FIELDS)
+        )
+    }
+
+    for ticket_id in ids:
+        ticket = tickets.get(ticket_id)
+        error = _validate(ticket, user, status, assigned_to)
+
+        if error:
+            results[ticket_id] = _result(ticket_id, FAILED, error)
+        else:
+            planned.append(ticket)
+
+    for start in range(0, len(planned), chunk_size):
+        chunk = planned[start:start + chunk_size]
+        results.update(_apply_chunk(chunk, user, status, assigned_to))
+
+    return [results[ticket_id] for ticket_id in ids]
+
+
+def _validate(ticket, user, status, assigned_to):
+    if ticket is None:
+        return "Ticket not found."
+
+    changes = {}
+    if status:
+        changes["status"] = status
+    if assigned_to is not UNSET:
+        changes["assigned_to"] = assigned_to
+
+    return update_error(ticket, user.role, changes)
+
+
+def _apply_chunk(chunk, user, status, assigned_to):
+    results = {}
+    now = timezone.now()
+
+    with activity_batch(batch_size=len(chunk)):
+        # Re-check statuses under a short, chunk-scoped lock so a concurrent
+        # single-ticket update cannot be overwritten.
+        current = dict(
+            Ticket.objects
+            .select_for_update()
+            .filter(id__in=[ticket.id for ticket in chunk])
+            .values_list("id", "status")
+        )
+
+        # Group by the status the update moves away from; within a group
+        # every row receives identical values.
+        groups = {}
+        for ticket in chunk:
+            if current.get(ticket.id) != ticket.status:
+                results[ticket.id] = _result(ticket.id, CONFLICT, "Ticket was modified concurrently.")
+                continue
+
+            groups.setdefault(ticket.status, []).append(ticket)
+
+        moves = []
+
+        for old_status, tickets in groups.items():
+            values = {"updated_at": now}
+
+            if assigned_to is not UNSET:
+                values["assigned_to"] = assigned_to
+
+            if status and status != old_status:
+                values.update(transition_values(status, now))
+
+            Ticket.objects.filter(id__in=[ticket.id for ticket in tickets]).update(**values)
+
+            for ticket in tickets:
+                results[ticket.id] = _result(ticket.id, UPDATED)
+                moves.append((ticket_state(ticket), ticket_state(ticket, **values)))
+
+                if status and status != old_status:
+                    log_activity(ticket, user, old_status, status)
+
+        record_moves(moves)
+
+    return results
+
+
+def _result(ticket_id, result, detail=None):
+    return {"id": ticket_id, "result": result, "detail": detail}
@@ -1,37 +1,40 @@
-from django.db.models import Count
-from django.db.models.functions import TruncMonth
-from tickets.models import Ticket
+import threading
+import time
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q, QuerySet, Sum
+from django.db.models.functions import Coalesce, TruncMonth
+from accounts.models import User
+from tickets.models import Client, Staff, Ticket, TicketDailyRollup
 
-def get_status_summary(user):
-    queryset = Ticket.objects.for_user(user)
+# All summaries read the daily rollups (see rollup_service), so their cost
+# grows with the number of days, not the number of tickets.
 
-    summary = queryset.values("status").annotate(count=Count("id"))
 
-    data = {
-        "total_tickets": queryset.count(),
-        "created": 0,
-        "assigned": 0,
-        "started": 0,
-        "resolved": 0,
-        "closed": 0,
-    }
+def get_status_summary(user):
+    queryset = TicketDailyRollup.objects.for_user(user)
 
-    for item in summary:
-        status = item["status"].lower()
-        data[status] = item["count"]
+    # One scan: the total plus a filtered SUM per status
+    aggregates = {"total_tickets": Coalesce(Sum("count"), 0)}
+    aggregates.update({
+        status.lower(): Coalesce(Sum("count", filter=Q(status=status)), 0)
+        for status in Ticket.Status.values
+    })
 
-    return data
+    return queryset.aggregate(**aggregates)
 
 
 def get_monthly_summary(user):
-    queryset = Ticket.objects.for_user(user)
+    queryset = TicketDailyRollup.objects.for_user(user)
 
     monthly_data = (
         queryset
-        .annotate(month=TruncMonth("created_at"))
+        .annotate(month=TruncMonth("day"))
         .values("month")
-        .annotate(count=Count("id"))
+        .annotate(count=Sum("count"))
+        .filter(count__gt=0)
         .order_by("month")
     )
 
@@ -39,24 +42,246 @@ def get_monthly_summary(user):
 
 
 def get_client_wise_summary(user):
-    queryset = Ticket.objects.for_user(user)
+    queryset = TicketDailyRollup.objects.for_user(user)
 
     data = (
         queryset
         .values("client__user__username")
-        .annotate(count=Count("id"))
+        .annotate(count=Sum("count"))
+        .filter(count__gt=0)
     )
 
     return data
 
 
 def get_staff_wise_summary(user):
-    queryset = Ticket.objects.for_user(user)
+    queryset = TicketDailyRollup.objects.for_user(user)
 
     data = (
         queryset
         .values("assigned_to__user__username")
-        .annotate(count=Count("id"))
+        .annotate(count=Sum("count"))
+        .filter(count__gt=0)
     )
 
-    return data
\ No newline at end of file
+    return data
+
+
+def get_dashboard(user):
+    """
+    Everything the dashboard shows, limited to the breakdowns the
+    user's role may see (same rules as the per-chart endpoints).
+    """
+    data = {
+        "summary": get_status_summary(user),
+        "monthly": list(get_monthly_summary(user)),
+    }
+
+    if user.role in (User.Role.ADMIN, User.Role.STAFF):
+        data["client_wise"] = list(get_client_wise_summary(user))
+
+    if user.role == User.Role.ADMIN:
+        data["staff_wise"] = list(get_staff_wise_summary(user))
+
+    return data
+
+
+# ---------------------------------------------------
+# Response cache
+# ---------------------------------------------------
+# Entries are keyed by summary, scope and the scope's version stamp. ADMIN
+# shares one scope; STAFF and CLIENT get one per staff / client profile,
+# which is what the rollup keys carry, so a write bumps its scopes without
+# looking anything up. Ticket writes bump the versions of the scopes they
+# touch once the transaction commits, so stale entries are simply never
+# read again. Versions live in the shared cache, which is how
+# invalidations reach every worker process.
+#
+# Only enabled with a cache server (settings.DASHBOARD_CACHE_ENABLED):
+# on the database cache every hit, miss and bump would be extra queries.
+DASHBOARD_CACHE_TIMEOUT = 300
+
+# How long one computation may hold the cross-process lease, and how
+# often waiters poll for its result
+COMPUTE_LEASE_TIMEOUT = 10
+COMPUTE_POLL_INTERVAL = 0.05
+
+ADMIN_SCOPE = "admin"
+
+_MISSING = object()
+_LEASED = object()
+
+# Fixed pool of in-process locks, picked by key hash
+_LOCKS = [threading.Lock() for _ in range(64)]
+
+
+def cache_enabled():
+    return getattr(settings, "DASHBOARD_CACHE_ENABLED", False)
+
+
+def get_scope(user):
+    if user.role == User.Role.ADMIN:
+        return ADMIN_SCOPE
+
+    # Token principals carry the profile id as a claim
+    if user.role == User.Role.STAFF:
+        profile_id = getattr(user, "staff_id", None)
+        model = Staff
+    else:
+        profile_id = getattr(user, "client_id", None)
+        model = Client
+
+    if profile_id is None:
+        profile_id = model.objects.filter(user_id=user.pk).values_list("id", flat=True).first()
+
+    return f"{user.role.lower()}:{profile_id}"
+
+
+def _version_key(scope):
+    return f"dashboard:version:{scope}"
+
+
+def _summary_key(compute, scope, version):
+    return f"dashboard:{compute.__name__}:{scope}:{version}"
+
+
+def _get_version(scope):
+    key = _version_key(scope)
+    version = cache.get(key)
+
+    if version is None:
+        # Start from the clock so a lost stamp never revives old entries
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+
+    return version
+
+
+def bump_versions(scopes):
+    # A fresh clock stamp rather than incr: one round trip for all the
+    # scopes, and concurrent bumps can't lose each other's update
+    version = time.time_ns()
+    cache.set_many({_version_key(scope): version for scope in scopes}, timeout=None)
+
+
+def invalidate_dashboards(client_ids=(), staff_ids=()):
+    """
+    Bump the admin scope and the scopes of the given clients and staff.
+    """
+    if not cache_enabled():
+        return
+
+    scopes = {ADMIN_SCOPE}
+    scopes.update(f"client:{pk}" for pk in client_ids if pk is not None)
+    scopes.update(f"staff:{pk}" for pk in staff_ids if pk is not None)
+
+    bump_versions(scopes)
+
+
+def _compute(compute, user):
+    data = compute(user)
+    if isinstance(data, QuerySet):
+        data = list(data)
+    return data
+
+
+def get_cached_summary(compute, user):
+    """
+    Return ``compute(user)`` from the cache. Concurrent misses for the
+    same entry are coalesced into one computation: threads of this
+    process queue on a local lock, other processes wait on a cache lease.
+    """
+    if not cache_enabled():
+        return _compute(compute, user)
+
+    scope = get_scope(user)
+    key = _summary_key(compute, scope, _get_version(scope))
+
+    data = _get_or_compute(compute, user, key)
+
+    if data is _LEASED:
+        data = _wait_for(key)
+
+        if data is _MISSING:
+            data = _get_or_compute(compute, user, key, force=True)
+
+    return data
+
+
+async def aget_cached_summary(compute, user):
+    """
+    Async get_cached_summary: a cache hit is two async cache reads; a miss
+    computes in the sync thread and waits on another process's lease in a
+    thread of its own, so it never stalls other requests' sync calls.
+    """
+    if not cache_enabled():
+        return await sync_to_async(_compute)(compute, user)
+
+    scope = await sync_to_async(get_scope)(user)
+    version = await cache.aget(_version_key(scope))
+
+    if version is None:
+        version = await sync_to_async(_get_version)(scope)
+
+    key = _summary_key(compute, scope, version)
+
+    data = await cache.aget(key, _MISSING)
+    if data is not _MISSING:
+        return data
+
+    data = await sync_to_async(_get_or_compute)(compute, user, key)
+
+    if data is _LEASED:
+        data = await sync_to_async(_wait_for, thread_sensitive=False)(key)
+
+        if data is _MISSING:
+            data = await sync_to_async(_get_or_compute)(compute, user, key, force=True)
+
+    return data
+
+
+def _get_or_compute(compute, user, key, force=False):
+    """
+    The cached entry, computed and stored under this process's stripe
+    lock and the cross-process lease on a miss. Returns _LEASED instead
+    when another process holds the lease, unless ``force`` (its holder
+    died or is too slow), which computes without it.
+    """
+    data = cache.get(key, _MISSING)
+    if data is not _MISSING:
+        return data
+
+    with _LOCKS[hash(key) % len(_LOCKS)]:
+        data = cache.get(key, _MISSING)
+        if data is not _MISSING:
+            return data
+
+        lease = f"{key}:lease"
+        acquired = cache.add(lease, 1, timeout=COMPUTE_LEASE_TIMEOUT)
+
+        # Wait outside the stripe lock, which other keys share
+        if not acquired and not force:
+            return _LEASED
+
+        try:
+            data = _compute(compute, user)
+            cache.set(key, data, timeout=DASHBOARD_CACHE_TIMEOUT)
+        finally:
+            # Never release a lease another process still holds
+            if acquired:
+                cache.delete(lease)
+
+    return data
+
+
+def _wait_for(key):
+    deadline = time.monotonic() + COMPUTE_LEASE_TIMEOUT
+
+    while time.monotonic() < deadline:
+        time.sleep(COMPUTE_POLL_INTERVAL)
+
+        data = cache.get(key, _MISSING)
+        if data is not _MISSING:
+            return data
+
+    return _MISSING
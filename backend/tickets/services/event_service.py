@@ -0,0 +1,220 @@
+"""
+Live ticket events.
+
+ticket_change_service reports every ticket change here. Creates,
+status / assignment changes and deletes become events that the
+configured broker (settings.TICKET_EVENTS_BROKER, see
+tickets.event_brokers) publishes once the transaction commits.
+
+Each event carries its audience: the client and the staff (before and
+after a reassignment) whose scope the ticket is in. A stream only
+forwards the events its user could read through ``for_user``, so
+clients stop polling list / detail / dashboard endpoints and refetch
+them only when something in their scope changed.
+"""
+import asyncio
+import json
+import secrets
+import time
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils.module_loading import import_string
+
+from accounts.models import User
+from tickets.event_brokers import InProcessBroker, PostgresBroker
+from tickets.models import Client, Staff
+
+
+KEEPALIVE_SECONDS = 15.0
+
+# Browsers reconnect this long after a dropped stream
+RETRY_MILLISECONDS = 3000
+
+_broker = None
+
+
+def get_broker():
+    global _broker
+
+    if _broker is None:
+        if settings.TICKET_EVENTS_BROKER:
+            _broker = import_string(settings.TICKET_EVENTS_BROKER)()
+        elif connection.vendor == "postgresql":
+            _broker = PostgresBroker()
+        else:
+            _broker = InProcessBroker()
+
+    return _broker
+
+
+# ---------------------------------------------------
+# Publishing (called from ticket_change_service)
+# ---------------------------------------------------
+def ticket_event(old_state, new_state):
+    """
+    Event for one ``(old_state, new_state)`` move (None = no row), or
+    None when neither the status nor the assignee changed.
+    """
+    if old_state is None:
+        name = "ticket.created"
+    elif new_state is None:
+        name = "ticket.deleted"
+    elif (
+        old_state["status"] != new_state["status"]
+        or old_state["assigned_to_id"] != new_state["assigned_to_id"]
+    ):
+        name = "ticket.updated"
+    else:
+        return None
+
+    state = new_state or old_state
+
+    if state["id"] is None:
+        return None
+
+    return {
+        "event": name,
+        "ticket": state["id"],
+        "status": new_state and new_state["status"],
+        "old_status": old_state and old_state["status"],
+        "assigned_to": new_state and new_state["assigned_to_id"],
+        "audience": {
+            "client": state["client_id"],
+            "staff": sorted({
+                s["assigned_to_id"]
+                for s in (old_state, new_state)
+                if s is not None and s["assigned_to_id"] is not None
+            }),
+        },
+    }
+
+
+def publish_moves(moves):
+    events = [
+        event for event in (ticket_event(old, new) for old, new in moves)
+        if event is not None
+    ]
+
+    if events:
+        transaction.on_commit(lambda: get_broker().publish(events))
+
+
+# ---------------------------------------------------
+# Streams
+# ---------------------------------------------------
+def subscriber_scope(user):
+    """
+    ``(role, staff / client id)`` the user's events are filtered on, the
+    same rules as RoleScopedQuerySet.for_user.
+    """
+    if user.role == User.Role.ADMIN:
+        return (user.role, None)
+
+    if user.role == User.Role.STAFF:
+        staff_id = getattr(user, "staff_id", None)
+        if staff_id is None:
+            staff_id = Staff.objects.filter(user_id=user.pk).values_list("id", flat=True).first()
+        return (user.role, staff_id)
+
+    if user.role == User.Role.CLIENT:
+        client_id = getattr(user, "client_id", None)
+        if client_id is None:
+            client_id = Client.objects.filter(user_id=user.pk).values_list("id", flat=True).first()
+        return (user.role, client_id)
+
+    return (user.role, None)
+
+
+# ---------------------------------------------------
+# Connect tokens
+# ---------------------------------------------------
+# EventSource and browser WebSockets cannot send an Authorization header,
+# and an access token in the query string ends up in access logs. Clients
+# trade their access token for a connect token instead: signed, carrying
+# the subscriber scope and the access token's expiry, valid for
+# CONNECT_TOKEN_SECONDS and accepted once (through the shared cache).
+CONNECT_TOKEN_SECONDS = 30
+CONNECT_TOKEN_SALT = "tickets.events.connect"
+
+
+def issue_connect_token(user, expires_at=None):
+    return signing.dumps(
+        {"scope": subscriber_scope(user), "exp": expires_at, "nonce": secrets.token_hex(16)},
+        salt=CONNECT_TOKEN_SALT,
+    )
+
+
+def redeem_connect_token(value):
+    """
+    ``(scope, expires_at)`` for a connect token, or None when it is
+    invalid, expired or already used.
+    """
+    try:
+        data = signing.loads(value, salt=CONNECT_TOKEN_SALT, max_age=CONNECT_TOKEN_SECONDS)
+    except signing.BadSignature:
+        return None
+
+    if not cache.add(f"events:connect:{data['nonce']}", 1, timeout=CONNECT_TOKEN_SECONDS):
+        return None
+
+    return tuple(data["scope"]), data["exp"]
+
+
+def is_visible(event, scope):
+    role, pk = scope
+    audience = event.get("audience")
+
+    if audience is None or role == User.Role.ADMIN:
+        # Broadcasts (resync) and admins see everything
+        return True
+
+    if role == User.Role.STAFF:
+        return pk is not None and pk in audience["staff"]
+
+    if role == User.Role.CLIENT:
+        return pk is not None and pk == audience["client"]
+
+    return False
+
+
+async def scoped_events(subscription, scope, expires_at=None):
+    """
+    Async iterator of the events from ``subscription`` visible to
+    ``scope``, without their audience, and None every KEEPALIVE_SECONDS
+    of silence. Ends at ``expires_at`` (epoch seconds, the access token's
+    expiry).
+    """
+    while True:
+        timeout = KEEPALIVE_SECONDS
+        if expires_at is not None:
+            timeout = min(timeout, expires_at - time.time())
+            if timeout <= 0:
+                return
+
+        try:
+            event = await asyncio.wait_for(subscription.get(), timeout)
+        except TimeoutError:
+            yield None
+            continue
+
+        if is_visible(event, scope):
+            yield {key: value for key, value in event.items() if key != "audience"}
+
+
+async def sse_stream(scope, expires_at=None):
+    """
+    ``text/event-stream`` body: a ``ready`` event once subscribed (clients
+    refetch on every (re)connect, covering anything missed while
+    disconnected), then the scope's events and keep-alive comments.
+    """
+    async with get_broker().subscribe() as subscription:
+        yield f"retry: {RETRY_MILLISECONDS}\nevent: ready\ndata: {{}}\n\n"
+
+        async for event in scoped_events(subscription, scope, expires_at):
+            if event is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
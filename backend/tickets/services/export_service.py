@@ -0,0 +1,89 @@
+"""
+Streaming ticket export (CSV / NDJSON).
+
+Rows are read with ``.values()`` through ``iterator()`` (a server-side
+cursor on PostgreSQL) and encoded one at a time, so memory stays flat
+however many tickets match.
+"""
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+
+
+EXPORT_CHUNK_SIZE = 2000
+
+# Column name -> lookup; names match TicketSerializer
+EXPORT_COLUMNS = {
+    "id": F("id"),
+    "ticket_number": F("ticket_number"),
+    "status": F("status"),
+    "description": F("description"),
+    "created_at": F("created_at"),
+    "updated_at": F("updated_at"),
+    "client_name": F("client__user__username"),
+    "client_email": F("client__user__email"),
+    "company_name": F("client__company_name"),
+    "client_phone": F("client__whatsapp_number"),
+    "issue_name": F("issue__name"),
+    "sub_issue_name": F("sub_issue__name"),
+    "assigned_staff": F("assigned_to__user__username"),
+}
+
+# Spreadsheets evaluate cells starting with these as formulas
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def export_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    # Aliased so the projected names cannot clash with model fields
+    aliases = {f"export_{name}": lookup for name, lookup in EXPORT_COLUMNS.items()}
+
+    rows = queryset.values(**aliases).iterator(chunk_size=chunk_size)
+
+    for row in rows:
+        yield [row[alias] for alias in aliases]
+
+
+class Echo:
+    """
+    File-like object whose write() returns the value, letting csv.writer
+    produce one encoded line at a time.
+    """
+
+    def write(self, value):
+        return value
+
+
+def csv_cell(value):
+    # Quoted so client-written text (descriptions, names) stays text
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def stream_csv(rows):
+    writer = csv.writer(Echo())
+
+    yield writer.writerow(list(EXPORT_COLUMNS))
+
+    for row in rows:
+        yield writer.writerow([csv_cell(value) for value in row])
+
+
+def stream_ndjson(rows):
+    encoder = DjangoJSONEncoder()
+    columns = list(EXPORT_COLUMNS)
+
+    for row in rows:
+        yield encoder.encode(dict(zip(columns, row))) + "\n"
+
+
+STREAMERS = {
+    "csv": stream_csv,
+    "ndjson": stream_ndjson,
+}
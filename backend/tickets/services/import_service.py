@@ -0,0 +1,314 @@
+"""
+Streaming ticket import (CSV / NDJSON).
+
+Rows flow through a generator pipeline (read -> resolve/validate ->
+batch -> bulk_create), so memory is bounded by one batch plus the
+in-memory name lookup maps, whatever the size of the input.
+
+Columns: ``client`` (username), ``issue`` and ``sub_issue`` (names),
+``description``, optional ``status`` and ``assigned_to`` (staff username,
+required from ASSIGNED on), and optional ISO 8601 dates / datetimes
+``created_at``, ``assigned_at``, ``started_at``, ``resolved_at`` and
+``closed_at`` carrying legacy history. Lifecycle timestamps missing for a
+status the ticket has reached default to the previous one; ``created_at``
+defaults to the earliest given timestamp, else the import time.
+"""
+import csv
+import json
+from datetime import datetime, time as dt_time
+from itertools import islice
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import serializers
+
+from core.models import Issue, SubIssue
+from tickets.models import Client, Staff, Ticket
+from tickets.serializers import TicketCreateSerializer
+from tickets.services.activity_service import activity_batch, log_activity
+from tickets.services.ticket_change_service import record_created
+from tickets.state_machine import LIFECYCLE, TIMESTAMP_FIELDS
+
+
+IMPORT_BATCH_SIZE = 2000
+MAX_REPORTED_ERRORS = 1000
+
+FORMATS = ("csv", "ndjson")
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+def detect_format(filename, default="csv"):
+    name = (filename or "").lower()
+
+    if name.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    if name.endswith(".csv"):
+        return "csv"
+    return default
+
+
+# ---------------------------------------------------
+# Pipeline stages
+# ---------------------------------------------------
+def read_rows(stream, fmt):
+    """
+    Yield ``(row_number, row_dict_or_None, error_or_None)`` from a text stream.
+    """
+    if fmt == "csv":
+        # Header is line 1, so data rows start at 2
+        for number, row in enumerate(csv.DictReader(stream), start=2):
+            yield number, row, None
+
+    elif fmt == "ndjson":
+        for number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as exc:
+                yield number, None, f"Invalid JSON: {exc}"
+                continue
+
+            if not isinstance(row, dict):
+                yield number, None, "Each line must be a JSON object."
+                continue
+
+            yield number, row, None
+
+    else:
+        raise ImportFormatError(f"Unsupported format {fmt!r}; use one of {', '.join(FORMATS)}.")
+
+
+class RowResolver:
+    """
+    Resolves names to ids through lookup maps loaded once per import and
+    applies the same validation rules as TicketCreateSerializer.
+    """
+
+    def __init__(self):
+        self.issues = dict(Issue.objects.values_list("name", "id"))
+        self.sub_issues = {
+            (issue_id, name): sub_issue_id
+            for sub_issue_id, issue_id, name in SubIssue.objects.values_list("id", "issue_id", "name")
+        }
+        self.sub_issue_names = {name for (_, name) in self.sub_issues}
+        self.clients = dict(Client.objects.values_list("user__username", "id"))
+        self.staff = {
+            username: (staff_id, specialty_id)
+            for staff_id, username, specialty_id in Staff.objects.values_list(
+                "id", "user__username", "specialty_id"
+            )
+        }
+
+        self.description_field = TicketCreateSerializer().fields["description"]
+        self.statuses = set(Ticket.Status.values)
+
+    def resolve(self, row):
+        """
+        Return ``(Ticket, None)`` or ``(None, [errors])``.
+        """
+        errors = []
+        client, issue, sub_issue, assigned_to = (
+            _text(row, key) for key in ("client", "issue", "sub_issue", "assigned_to")
+        )
+
+        client_id = self.clients.get(client)
+        if client_id is None:
+            errors.append(f"Unknown client {client!r}.")
+
+        issue_id = self.issues.get(issue)
+        if issue_id is None:
+            errors.append(f"Unknown issue {issue!r}.")
+
+        sub_issue_id = self.sub_issues.get((issue_id, sub_issue))
+        if sub_issue_id is None and issue_id is not None:
+            if sub_issue in self.sub_issue_names:
+                errors.append(TicketCreateSerializer.sub_issue_mismatch_message)
+            else:
+                errors.append(f"Unknown sub-issue {sub_issue!r}.")
+
+        try:
+            description = self.description_field.run_validation(row.get("description"))
+        except serializers.ValidationError as exc:
+            description = None
+            errors.extend(f"description: {message}" for message in exc.detail)
+
+        status = _text(row, "status") or Ticket.Status.CREATED
+        if status not in self.statuses:
+            errors.append(f"Invalid status {status!r}.")
+
+        assigned_to_id = None
+        if assigned_to:
+            staff = self.staff.get(assigned_to)
+            if staff is None:
+                errors.append(f"Unknown staff {assigned_to!r}.")
+            elif issue_id is not None and staff[1] != issue_id:
+                errors.append("Assigned staff does not match ticket issue.")
+            else:
+                assigned_to_id = staff[0]
+        elif status in self.statuses and status != Ticket.Status.CREATED:
+            errors.append(f"A {status} ticket needs assigned_to.")
+
+        timestamps = self.resolve_timestamps(row, status, errors)
+
+        if errors:
+            return None, errors
+
+        return Ticket(
+            client_id=client_id,
+            issue_id=issue_id,
+            sub_issue_id=sub_issue_id,
+            description=description,
+            status=status,
+            assigned_to_id=assigned_to_id,
+            **timestamps,
+        ), None
+
+    def resolve_timestamps(self, row, status, errors):
+        """
+        ``created_at`` (only when given) and the lifecycle timestamps of
+        every status up to ``status``, in order and not in the future.
+        """
+        now = timezone.now()
+        values = {}
+
+        given = {
+            field: _timestamp(row, field, errors)
+            for field in ("created_at", *TIMESTAMP_FIELDS.values())
+        }
+
+        # Without created_at, a ticket with history dates from its first event
+        created_at = given.pop("created_at") or min(filter(None, given.values()), default=None)
+        if created_at is not None:
+            values["created_at"] = created_at
+
+        reached = list(_statuses_up_to(status)) if status in self.statuses else []
+        previous = created_at or now
+
+        for lifecycle_status, field in TIMESTAMP_FIELDS.items():
+            value = given[field]
+
+            if lifecycle_status not in reached:
+                if value is not None:
+                    errors.append(f"{field} given for a {status} ticket.")
+                continue
+
+            if value is None:
+                value = previous
+            elif value < previous:
+                errors.append(f"{field} is earlier than the previous lifecycle timestamp.")
+
+            values[field] = previous = value
+
+        if previous > now:
+            errors.append("Timestamps cannot be in the future.")
+
+        return values
+
+
+def _text(row, key):
+    value = row.get(key)
+    return "" if value is None else str(value).strip()
+
+
+def _timestamp(row, key, errors):
+    """
+    Aware datetime from an ISO 8601 datetime or date (midnight) in the
+    current time zone, or None when blank.
+    """
+    text = _text(row, key)
+    if not text:
+        return None
+
+    try:
+        value = parse_datetime(text)
+        if value is None:
+            date = parse_date(text)
+            value = date and datetime.combine(date, dt_time.min)
+    except ValueError:
+        value = None
+
+    if value is None:
+        errors.append(f"Invalid {key} {text!r}; use an ISO 8601 date or datetime.")
+        return None
+
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+
+    return value
+
+
+def _statuses_up_to(status):
+    current = Ticket.Status.CREATED
+
+    while current != status:
+        current = LIFECYCLE[current][0]
+        yield current
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+# ---------------------------------------------------
+# Entry point
+# ---------------------------------------------------
+def import_tickets(stream, fmt, batch_size=IMPORT_BATCH_SIZE, dry_run=False, user=None):
+    """
+    Import tickets from ``stream`` and return a report::
+
+        {"created": int, "failed": int, "errors": [{"row": n, "errors": [...]}],
+         "errors_truncated": bool}
+
+    Each batch is inserted with a single bulk_create in its own
+    transaction, plus one activity INSERT (changed by ``user``) for the
+    tickets imported past CREATED and one UPDATE restoring the given
+    ``created_at`` values (bulk_create stamps auto_now_add fields);
+    invalid rows are skipped and reported, never inserted.
+    With ``dry_run`` rows are validated and counted but nothing is written.
+    """
+    resolver = RowResolver()
+    report = {"created": 0, "failed": 0, "errors": [], "errors_truncated": False}
+
+    def valid_tickets():
+        for number, row, error in read_rows(stream, fmt):
+            ticket, errors = (None, [error]) if error else resolver.resolve(row)
+
+            if ticket is None:
+                report["failed"] += 1
+                if len(report["errors"]) < MAX_REPORTED_ERRORS:
+                    report["errors"].append({"row": number, "errors": errors})
+                else:
+                    report["errors_truncated"] = True
+                continue
+
+            yield ticket
+
+    for batch in batched(valid_tickets(), batch_size):
+        if not dry_run:
+            with activity_batch(batch_size=batch_size):
+                historical = [(ticket, ticket.created_at) for ticket in batch if ticket.created_at]
+
+                Ticket.objects.bulk_create(batch, batch_size=batch_size)
+
+                if historical:
+                    for ticket, created_at in historical:
+                        ticket.created_at = created_at
+                    Ticket.objects.bulk_update(
+                        [ticket for ticket, _ in historical], ["created_at"], batch_size=batch_size
+                    )
+
+                record_created(batch)
+
+                for ticket in batch:
+                    if ticket.status != Ticket.Status.CREATED:
+                        log_activity(ticket, user, Ticket.Status.CREATED, ticket.status)
+
+        report["created"] += len(batch)
+
+    return report
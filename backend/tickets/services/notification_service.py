@@ -0,0 +1,296 @@
+"""
+Client notifications (email / WhatsApp) when a ticket is assigned,
+started or resolved.
+
+ticket_change_service reports every ticket write here; status changes
+into NOTIFY_STATUSES add one ClientNotification row per channel in the
+same transaction (an outbox), so a rolled-back transition sends nothing and a
+committed one is never lost. ``python manage.py send_notifications``
+then delivers them in batches:
+
+- due rows are claimed with SELECT ... FOR UPDATE SKIP LOCKED, so
+  several senders can run side by side without sending twice;
+- each channel's backend (settings.NOTIFICATION_BACKENDS) is opened
+  once per batch and its connection reused for every message;
+- sends are paced per channel (settings.NOTIFICATION_RATE_LIMITS);
+- failures are retried with exponential backoff up to MAX_ATTEMPTS.
+
+Recipient and wording are resolved at send time, from the client's
+current email / WhatsApp number.
+"""
+import random
+import time
+from collections import namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from tickets.models import ArchivedTicket, ClientNotification, Ticket
+from tickets.notification_backends import PermanentError
+
+
+NOTIFY_STATUSES = (
+    Ticket.Status.ASSIGNED,
+    Ticket.Status.STARTED,
+    Ticket.Status.RESOLVED,
+)
+
+BATCH_SIZE = 100
+
+# Claimed rows are left alone by other senders for this long
+LEASE_SECONDS = 300
+
+MAX_ATTEMPTS = 6
+BACKOFF_BASE_SECONDS = 30
+BACKOFF_MAX_SECONDS = 3600
+
+Message = namedtuple("Message", "recipient subject body")
+
+
+# ---------------------------------------------------
+# Enqueueing
+# ---------------------------------------------------
+def enqueue(transitions):
+    """
+    ``transitions`` is an iterable of ``(ticket_id, client_id, status)``.
+    """
+    channels = settings.CLIENT_NOTIFICATION_CHANNELS
+    now = timezone.now()
+
+    rows = [
+        ClientNotification(
+            ticket_id=ticket_id,
+            client_id=client_id,
+            channel=channel,
+            ticket_status=status,
+            next_attempt_at=now,
+        )
+        for ticket_id, client_id, status in transitions
+        if status in NOTIFY_STATUSES
+        for channel in channels
+    ]
+
+    if rows:
+        ClientNotification.objects.bulk_create(rows)
+
+
+def enqueue_for_moves(moves):
+    """
+    Called from ticket_change_service.record_moves. Creates (imports,
+    new tickets) are left out; the create view enqueues auto-assignments
+    itself.
+    """
+    enqueue(
+        (new_state["id"], new_state["client_id"], new_state["status"])
+        for old_state, new_state in moves
+        if old_state is not None
+        and new_state is not None
+        and new_state["id"] is not None
+        and old_state["status"] != new_state["status"]
+    )
+
+
+# ---------------------------------------------------
+# Sending
+# ---------------------------------------------------
+class RateLimiter:
+    """
+    Token bucket: ``rate`` sends per second, bursts of up to ``burst``.
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def acquire(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+        if self.tokens < 1:
+            time.sleep((1 - self.tokens) / self.rate)
+            self.tokens = 1
+            self.updated = time.monotonic()
+
+        self.tokens -= 1
+
+
+_limiters = {}
+
+
+def get_limiter(channel):
+    if channel not in _limiters:
+        rate = settings.NOTIFICATION_RATE_LIMITS.get(channel)
+        _limiters[channel] = RateLimiter(rate) if rate else None
+    return _limiters[channel]
+
+
+def backoff(attempts):
+    """
+    Delay before retry number ``attempts`` (1-based): exponential, capped,
+    with full jitter so failed batches don't retry in lockstep.
+    """
+    delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** (attempts - 1))
+    return timedelta(seconds=random.uniform(delay / 2, delay))
+
+
+def claim_batch(batch_size=BATCH_SIZE):
+    """
+    Due PENDING notifications, locked only long enough to push their due
+    time past the lease.
+    """
+    now = timezone.now()
+
+    with transaction.atomic():
+        batch = list(
+            ClientNotification.objects
+            .select_related("client")
+            .select_for_update(skip_locked=True, of=("self",))
+            .filter(state=ClientNotification.State.PENDING, next_attempt_at__lte=now)
+            .order_by("next_attempt_at")[:batch_size]
+        )
+
+        if batch:
+            ClientNotification.objects.filter(pk__in=[n.pk for n in batch]).update(
+                next_attempt_at=now + timedelta(seconds=LEASE_SECONDS)
+            )
+
+    return batch
+
+
+def build_message(notification, ticket):
+    client = notification.client
+
+    if notification.channel == ClientNotification.Channel.EMAIL:
+        recipient = client.email
+    else:
+        recipient = client.whatsapp_number
+
+    status = Ticket.Status(notification.ticket_status).label.lower()
+    subject = f"Ticket {ticket.ticket_number} is {status}"
+    body = (
+        f"Hello {client.company_name},\n\n"
+        f"Your ticket {ticket.ticket_number} ({ticket.issue.name} / "
+        f"{ticket.sub_issue.name}) is now {status}."
+    )
+
+    return Message(recipient, subject, body)
+
+
+def _tickets(notifications):
+    ids = {n.ticket_id for n in notifications}
+    tickets = {
+        t.pk: t for t in Ticket.objects.select_related("issue", "sub_issue").filter(pk__in=ids)
+    }
+
+    # Archived since the transition
+    missing = ids - tickets.keys()
+    if missing:
+        tickets.update(
+            (t.pk, t) for t in
+            ArchivedTicket.objects.select_related("issue", "sub_issue").filter(pk__in=missing)
+        )
+
+    return tickets
+
+
+def send_batch(batch_size=BATCH_SIZE):
+    """
+    Claim and deliver one batch. Returns the number of notifications
+    processed (0: nothing due).
+    """
+    batch = claim_batch(batch_size)
+    if not batch:
+        return 0
+
+    tickets = _tickets(batch)
+
+    by_channel = {}
+    for notification in batch:
+        by_channel.setdefault(notification.channel, []).append(notification)
+
+    for channel, notifications in by_channel.items():
+        _send_channel(channel, notifications, tickets)
+
+    return len(batch)
+
+
+def _send_channel(channel, notifications, tickets):
+    try:
+        backend = import_string(settings.NOTIFICATION_BACKENDS[channel])()
+    except (KeyError, ImportError, ImproperlyConfigured) as exc:
+        # A configuration error: retrying cannot help, and raising would
+        # leave the rest of the batch claimed until its lease expires
+        for notification in notifications:
+            _finish(
+                notification,
+                ClientNotification.State.FAILED,
+                f"No backend for {channel}: {type(exc).__name__}: {exc}",
+            )
+        return
+
+    limiter = get_limiter(channel)
+
+    try:
+        backend.open()
+    except Exception as exc:
+        for notification in notifications:
+            _failed(notification, exc)
+        return
+
+    try:
+        for notification in notifications:
+            ticket = tickets.get(notification.ticket_id)
+            if ticket is None:
+                _finish(notification, ClientNotification.State.SKIPPED, "Ticket no longer exists")
+                continue
+
+            message = build_message(notification, ticket)
+            if not message.recipient:
+                _finish(notification, ClientNotification.State.SKIPPED, f"Client has no {channel}")
+                continue
+
+            if limiter is not None:
+                limiter.acquire()
+
+            try:
+                backend.send(message)
+            except PermanentError as exc:
+                _finish(notification, ClientNotification.State.FAILED, str(exc))
+            except Exception as exc:
+                _failed(notification, exc)
+            else:
+                _finish(notification, ClientNotification.State.SENT)
+    finally:
+        backend.close()
+
+
+def _finish(notification, state, error=""):
+    notification.state = state
+    notification.last_error = error
+
+    if state != ClientNotification.State.SKIPPED:
+        notification.attempts += 1
+
+    if state == ClientNotification.State.SENT:
+        notification.sent_at = timezone.now()
+
+    notification.save()
+
+
+def _failed(notification, exc):
+    notification.attempts += 1
+    notification.last_error = f"{type(exc).__name__}: {exc}"
+
+    if notification.attempts >= MAX_ATTEMPTS:
+        notification.state = ClientNotification.State.FAILED
+    else:
+        notification.next_attempt_at = timezone.now() + backoff(notification.attempts)
+
+    notification.save()
@@ -0,0 +1,146 @@
+"""
+Incremental maintenance of TicketDailyRollup.
+
+ticket_change_service reports every ticket write as moves (the state a
+ticket leaves and enters); the resulting +1/-1 deltas are applied in the
+same transaction as the ticket write. Dashboard reads then aggregate
+over days instead of tickets.
+"""
+from collections import Counter, namedtuple
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from tickets.models import ArchivedTicket, Client, Staff, Ticket, TicketDailyRollup
+from tickets.services.dashboard_service import invalidate_dashboards
+
+
+RollupKey = namedtuple("RollupKey", "day status issue_id client_id assigned_to_id")
+
+
+def rollup_key(state):
+    return RollupKey(
+        day=timezone.localdate(state["created_at"]),
+        status=state["status"],
+        issue_id=state["issue_id"],
+        client_id=state["client_id"],
+        assigned_to_id=state["assigned_to_id"],
+    )
+
+
+# ---------------------------------------------------
+# Recording (called from ticket_change_service)
+# ---------------------------------------------------
+def apply_moves(moves):
+    """
+    ``moves`` is a list of ``(old_state, new_state)`` pairs; None stands
+    for "no row" (created / deleted).
+    """
+    deltas = Counter()
+
+    for old_state, new_state in moves:
+        if old_state is not None:
+            deltas[rollup_key(old_state)] -= 1
+        if new_state is not None:
+            deltas[rollup_key(new_state)] += 1
+
+    apply_deltas(deltas)
+
+
+def apply_deltas(deltas):
+    # Fixed order so concurrent writers lock rollup rows in the same order
+    keys = sorted(
+        (key for key, delta in deltas.items() if delta),
+        key=lambda key: (*key[:4], key.assigned_to_id or 0),
+    )
+
+    if not keys:
+        return
+
+    with transaction.atomic():
+        for key in keys:
+            _bump(key, deltas[key])
+
+
+def _bump(key, delta):
+    rows = TicketDailyRollup.objects.filter(**key._asdict())
+
+    if rows.update(count=F("count") + delta):
+        return
+
+    try:
+        with transaction.atomic():
+            TicketDailyRollup.objects.create(count=delta, **key._asdict())
+    except IntegrityError:
+        # Another transaction inserted the key first
+        rows.update(count=F("count") + delta)
+
+
+# ---------------------------------------------------
+# Rebuild / backfill
+# ---------------------------------------------------
+def rollup_rows(tickets):
+    return (
+        tickets
+        .annotate(day=TruncDate("created_at"))
+        .values("day", "status", "issue_id", "client_id", "assigned_to_id")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+
+
+def lock_for_rebuild(model):
+    """
+    Lock ``model``'s table against other writers until the transaction
+    ends (PostgreSQL). Ticket writes that already changed it commit
+    before the rebuild reads the tickets; later ones wait and apply their
+    deltas to the rebuilt rows. SQLite serialises writers anyway.
+    """
+    if connection.vendor != "postgresql":
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"LOCK TABLE {connection.ops.quote_name(model._meta.db_table)} "
+            "IN SHARE ROW EXCLUSIVE MODE"
+        )
+
+
+def rebuild_rollups(batch_size=1000):
+    """
+    Recompute every rollup row from the tickets and archived tickets
+    tables. Returns the number of rows written.
+
+    Runs under lock_for_rebuild, so concurrent ticket writes are counted
+    exactly once.
+    """
+    counts = Counter()
+
+    with transaction.atomic():
+        lock_for_rebuild(TicketDailyRollup)
+
+        TicketDailyRollup.objects.all().delete()
+
+        # Archived tickets keep counting in the dashboards
+        for tickets in (Ticket.objects.all(), ArchivedTicket.objects.all()):
+            for row in rollup_rows(tickets).iterator():
+                key = RollupKey(**{field: row[field] for field in RollupKey._fields})
+                counts[key] += row["count"]
+
+        created = TicketDailyRollup.objects.bulk_create(
+            (TicketDailyRollup(count=count, **key._asdict()) for key, count in counts.items()),
+            batch_size=batch_size,
+        )
+
+        transaction.on_commit(_invalidate_all)
+
+    return len(created)
+
+
+def _invalidate_all():
+    invalidate_dashboards(
+        client_ids=Client.objects.values_list("id", flat=True),
+        staff_ids=Staff.objects.values_list("id", flat=True),
+    )
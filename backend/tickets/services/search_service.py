@@ -0,0 +1,111 @@
+import re
+import uuid
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import Coalesce
+from django.db.models.expressions import RawSQL
+
+
+SEARCH_CONFIG = "english"
+FTS_TABLE = "tickets_ticket_fts"
+
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+# A ticket number or its first TICKET_NUMBER_MIN_DIGITS+ hex digits
+TICKET_NUMBER_RE = re.compile(r"[0-9a-f-]+")
+TICKET_NUMBER_MIN_DIGITS = 6
+
+
+def supports_full_text(queryset):
+    return connections[queryset.db].vendor in ("postgresql", "sqlite")
+
+
+def search_tickets(queryset, text):
+    """
+    Full-text search over ticket descriptions.
+
+    Filters ``queryset`` to matching tickets and annotates ``search_rank``
+    (higher is more relevant). The last word is matched as a prefix so
+    results keep up with a search box as the user types. A ticket number,
+    or its first few digits, matches those tickets too.
+    """
+    words = WORD_RE.findall(text)
+
+    if not words:
+        return queryset.none()
+
+    number_match = _ticket_number_match(text)
+
+    # supports_full_text(): PostgreSQL or SQLite
+    if connections[queryset.db].vendor == "postgresql":
+        return _search_postgres(queryset, words, number_match)
+
+    return _search_sqlite(queryset, words, number_match)
+
+
+def _ticket_number_match(text):
+    """
+    Q for tickets whose number starts with ``text`` (hex digits, hyphens
+    optional), or None when ``text`` cannot be one. A prefix is the range
+    of UUIDs between it padded with 0s and with fs, so the lookup is a
+    range scan on the ticket_number unique index on every backend.
+    """
+    text = text.strip().lower()
+
+    if not TICKET_NUMBER_RE.fullmatch(text):
+        return None
+
+    digits = text.replace("-", "")
+    if not TICKET_NUMBER_MIN_DIGITS <= len(digits) <= 32:
+        return None
+
+    low = uuid.UUID(digits.ljust(32, "0"))
+    high = uuid.UUID(digits.ljust(32, "f"))
+
+    return Q(ticket_number__range=(low, high))
+
+
+def _search_postgres(queryset, words, number_match):
+    raw = " & ".join(words[:-1] + [f"{words[-1]}:*"])
+    query = SearchQuery(raw, config=SEARCH_CONFIG, search_type="raw")
+
+    match = Q(search_vector=query)
+    if number_match:
+        match |= number_match
+
+    return (
+        queryset
+        .filter(match)
+        .annotate(search_rank=Coalesce(
+            SearchRank(F("search_vector"), query),
+            Value(0.0),
+            output_field=FloatField(),
+        ))
+    )
+
+
+def _search_sqlite(queryset, words, number_match):
+    phrases = [f'"{word}"' for word in words]
+    phrases[-1] += " *"
+    query = " ".join(phrases)
+
+    table = queryset.model._meta.db_table
+
+    match = Q(id__in=RawSQL(
+        f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+        [query],
+    ))
+    if number_match:
+        match |= number_match
+
+    # bm25() is lower-is-better; negate it so both backends rank descending.
+    rank = RawSQL(
+        f"coalesce((SELECT -bm25({FTS_TABLE}) FROM {FTS_TABLE} "
+        f"WHERE {FTS_TABLE} MATCH %s AND rowid = {table}.id), 0)",
+        [query],
+        output_field=FloatField(),
+    )
+
+    return queryset.filter(match).annotate(search_rank=rank)
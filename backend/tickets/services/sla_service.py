@@ -0,0 +1,305 @@
+"""
+SLA analytics: time-to-assign and time-to-resolve percentiles per staff,
+per issue and per month.
+
+Requests read mergeable quantile sketches (tickets.quantile_sketch) kept
+per month / metric / issue / staff bucket from ticket_change_service
+moves, so a request merges a bounded number of buckets instead of
+sorting every ticket. On PostgreSQL, ``percentile_cont`` over the
+tickets and archived tickets tables gives the exact values, which
+``verify_sketches`` compares them against (rebuild_rollups repairs
+drift).
+"""
+from collections import Counter, defaultdict, namedtuple
+from datetime import datetime
+
+from django.db import IntegrityError, NotSupportedError, connection, transaction
+from django.db.models import DateField, F
+from django.db.models.functions import Extract, TruncMonth
+from django.utils import timezone
+
+from accounts.models import User
+from tickets.models import ArchivedTicket, Ticket, TicketSlaSketch
+from tickets.quantile_sketch import QuantileSketch, bin_index
+from tickets.services.rollup_service import lock_for_rebuild
+
+
+PERCENTILES = {"p50": 0.5, "p90": 0.9, "p99": 0.99}
+
+Metric = TicketSlaSketch.Metric
+
+# Metric -> (start, end) timestamps of the interval it measures
+METRICS = {
+    Metric.TIME_TO_ASSIGN: ("created_at", "assigned_at"),
+    Metric.TIME_TO_RESOLVE: ("created_at", "resolved_at"),
+}
+
+# Dimension -> label lookup (months are bucketed on the interval's end)
+DIMENSIONS = {
+    "staff": "assigned_to__user__username",
+    "issue": "issue__name",
+    "month": None,
+}
+
+SketchKey = namedtuple("SketchKey", "month metric issue_id assigned_to_id")
+
+
+def supports_exact():
+    return connection.vendor == "postgresql"
+
+
+# ---------------------------------------------------
+# Sketch maintenance (called from ticket_change_service)
+# ---------------------------------------------------
+def apply_moves(moves):
+    """
+    Move the samples of each ``(old_state, new_state)`` pair between
+    sketch buckets.
+    """
+    deltas = Counter()
+
+    for old_state, new_state in moves:
+        if old_state is not None:
+            deltas.subtract(samples(old_state))
+        if new_state is not None:
+            deltas.update(samples(new_state))
+
+    apply_sample_deltas(deltas)
+
+
+def samples(state):
+    """
+    ``(SketchKey, bin index)`` for every SLA interval a ticket state has
+    completed.
+    """
+    for metric, (start, end) in METRICS.items():
+        if state[end] is None:
+            continue
+
+        seconds = (state[end] - state[start]).total_seconds()
+        key = SketchKey(
+            month=timezone.localdate(state[end]).replace(day=1),
+            metric=metric,
+            issue_id=state["issue_id"],
+            assigned_to_id=state["assigned_to_id"],
+        )
+
+        yield key, bin_index(seconds)
+
+
+def apply_sample_deltas(deltas):
+    """
+    ``deltas`` maps ``(SketchKey, bin index)`` to a +/- sample count.
+    """
+    by_key = defaultdict(Counter)
+
+    for (key, index), delta in deltas.items():
+        if delta:
+            by_key[key][index] += delta
+
+    # Fixed order so concurrent writers lock sketch rows in the same order
+    for key in sorted(by_key, key=lambda key: (*key[:3], key.assigned_to_id or 0)):
+        _update_sketch(key, by_key[key])
+
+
+def _update_sketch(key, bin_deltas):
+    lookup = key._asdict()
+    rows = TicketSlaSketch.objects.select_for_update().filter(**lookup)
+
+    row = rows.first()
+    if row is None:
+        try:
+            with transaction.atomic():
+                row = TicketSlaSketch.objects.create(**lookup)
+        except IntegrityError:
+            # Another transaction created the bucket first
+            row = rows.get()
+
+    sketch = QuantileSketch(row.bins)
+    for index, delta in bin_deltas.items():
+        sketch.add_bin(index, delta)
+
+    row.bins = sketch.to_json()
+    row.save(update_fields=["bins"])
+
+
+def rebuild_sketches():
+    """
+    Recompute every sketch from the tickets table, under the same lock
+    as rebuild_rollups. Returns the number of buckets written.
+    """
+    from tickets.services.ticket_change_service import STATE_FIELDS
+
+    deltas = Counter()
+
+    with transaction.atomic():
+        lock_for_rebuild(TicketSlaSketch)
+
+        TicketSlaSketch.objects.all().delete()
+
+        for tickets in (Ticket.objects.all(), ArchivedTicket.objects.all()):
+            for values in tickets.values_list(*STATE_FIELDS).iterator():
+                deltas.update(samples(dict(zip(STATE_FIELDS, values))))
+
+        apply_sample_deltas(deltas)
+
+    return TicketSlaSketch.objects.count()
+
+
+# ---------------------------------------------------
+# Reads
+# ---------------------------------------------------
+def get_sla_summary(user, dimension):
+    """
+    ``[{"<dimension>": label, "time_to_assign": {...}, "time_to_resolve":
+    {...}}]`` where each metric is ``{"count", "p50", "p90", "p99"}`` in
+    seconds, or None when no ticket in the group has completed it.
+    """
+    return _summary(_sketched_percentiles(user, dimension), dimension)
+
+
+def get_exact_sla_summary(user, dimension):
+    """
+    get_sla_summary computed with ``percentile_cont`` over every ticket
+    (PostgreSQL only): for verification, not for requests.
+    """
+    if not supports_exact():
+        raise NotSupportedError("Exact SLA percentiles need PostgreSQL.")
+
+    return _summary(_exact_percentiles(user, dimension), dimension)
+
+
+def get_sla_by_staff(user):
+    return get_sla_summary(user, "staff")
+
+
+def get_sla_by_issue(user):
+    return get_sla_summary(user, "issue")
+
+
+def get_sla_by_month(user):
+    return get_sla_summary(user, "month")
+
+
+def verify_sketches(dimension, tolerance=0.05):
+    """
+    Compare the sketched SLA summary of every ticket with the exact one.
+    Returns ``(label, metric, field, sketched, exact)`` for each count
+    that differs and each percentile further than ``tolerance``
+    (relative, at least a second) from its exact value.
+    """
+    sketched = {row[dimension]: row for row in get_sla_summary(None, dimension)}
+    exact = {row[dimension]: row for row in get_exact_sla_summary(None, dimension)}
+    labels = sorted(sketched.keys() | exact.keys(), key=lambda label: (label is None, label or ""))
+    mismatches = []
+
+    for label in labels:
+        for metric in METRICS:
+            left = sketched.get(label, {}).get(metric) or {"count": 0}
+            right = exact.get(label, {}).get(metric) or {"count": 0}
+
+            if left["count"] != right["count"]:
+                mismatches.append((label, metric, "count", left["count"], right["count"]))
+                continue
+
+            if not right["count"]:
+                continue
+
+            for name in PERCENTILES:
+                if abs(left[name] - right[name]) > max(tolerance * right[name], 1.0):
+                    mismatches.append((label, metric, name, left[name], right[name]))
+
+    return mismatches
+
+
+def _summary(groups, dimension):
+    return [
+        {dimension: label, **{metric: groups[label].get(metric) for metric in METRICS}}
+        for label in sorted(groups, key=lambda label: (label is None, label or ""))
+    ]
+
+
+def _exact_percentiles(user, dimension):
+    groups = defaultdict(dict)
+    fractions = ", ".join(str(q) for q in PERCENTILES.values())
+
+    for metric, (start, end) in METRICS.items():
+        label = (
+            TruncMonth(end, output_field=DateField())
+            if dimension == "month"
+            else F(DIMENSIONS[dimension])
+        )
+
+        # (label, seconds) from the hot and archived tickets, scoped alike
+        parts, params = [], []
+        for model in (Ticket, ArchivedTicket):
+            tickets = model.objects.all() if user is None else model.objects.for_user(user)
+            sql, part_params = (
+                tickets
+                .filter(**{f"{end}__isnull": False})
+                .annotate(label=label, seconds=Extract(F(end) - F(start), "epoch"))
+                .values_list("label", "seconds")
+                .order_by()
+                .query.sql_with_params()
+            )
+            parts.append(sql)
+            params.extend(part_params)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT label, COUNT(*), "
+                f"percentile_cont(ARRAY[{fractions}]) WITHIN GROUP (ORDER BY seconds) "
+                f"FROM ({' UNION ALL '.join(parts)}) AS durations (label, seconds) "
+                f"GROUP BY label",
+                params,
+            )
+
+            for label, count, values in cursor.fetchall():
+                if isinstance(label, datetime):
+                    label = label.date()
+                groups[label][metric] = _metric(count, values)
+
+    return groups
+
+
+def _sketched_percentiles(user, dimension):
+    sketches = TicketSlaSketch.objects.all()
+
+    # Sketches are bucketed by staff, so only ADMIN and STAFF scopes apply
+    # (None: every ticket)
+    if user is None or user.role == User.Role.ADMIN:
+        pass
+    elif user.role == User.Role.STAFF:
+        staff_id = getattr(user, "staff_id", None)
+        sketches = (
+            sketches.filter(assigned_to_id=staff_id)
+            if staff_id is not None
+            else sketches.filter(assigned_to__user_id=user.pk)
+        )
+    else:
+        return {}
+
+    merged = defaultdict(QuantileSketch)
+
+    for label, metric, bins in sketches.values_list(
+        DIMENSIONS[dimension] or "month", "metric", "bins"
+    ):
+        merged[(label, metric)].merge(QuantileSketch(bins))
+
+    groups = defaultdict(dict)
+
+    for (label, metric), sketch in merged.items():
+        if sketch.count > 0:
+            groups[label][metric] = _metric(
+                sketch.count,
+                [sketch.quantile(q) for q in PERCENTILES.values()],
+            )
+
+    return groups
+
+
+def _metric(count, values):
+    return {
+        "count": count,
+        **{name: round(value, 1) for name, value in zip(PERCENTILES, values)},
+    }
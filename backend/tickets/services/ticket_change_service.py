@@ -0,0 +1,110 @@
+"""
+Fan-out of ticket changes.
+
+Every code path that writes tickets (Ticket.save/delete, the transition,
+bulk and import services, the admin) reports the state a ticket leaves
+and enters as a move. Each consumer derives what it keeps from the same
+moves:
+
+- in the write's transaction: the daily rollups (rollup_service), the
+  SLA sketches (sla_service), the live events (event_service) and the
+  client notification outbox (notification_service);
+- once it commits: the dashboard cache versions (dashboard_service) and
+  the staff loads of the assignment index (assignment_service).
+"""
+from django.db import transaction
+from django.db.models import Model
+
+from tickets.models import Ticket
+from tickets.services import (
+    assignment_service,
+    event_service,
+    notification_service,
+    rollup_service,
+    sla_service,
+)
+from tickets.services.dashboard_service import invalidate_dashboards
+
+
+# Ticket columns the consumers derive their data from
+STATE_FIELDS = (
+    "id",
+    "created_at",
+    "status",
+    "issue_id",
+    "client_id",
+    "assigned_to_id",
+    "assigned_at",
+    "resolved_at",
+)
+
+
+def ticket_state(ticket, **changes):
+    """
+    ``STATE_FIELDS`` of ``ticket``, with ``changes`` (field name or
+    attname -> value, as passed to ``QuerySet.update()``) applied on top.
+    """
+    state = {field: getattr(ticket, field) for field in STATE_FIELDS}
+
+    for name, value in changes.items():
+        field = Ticket._meta.get_field(name)
+        if field.is_relation and isinstance(value, Model):
+            value = value.pk
+        state[field.attname] = value
+
+    return state
+
+
+def stored_ticket_state(ticket):
+    """
+    State of the row as it is in the database, from the values tracked
+    on load when they are all available.
+    """
+    loaded = getattr(ticket, "_loaded_values", None) or {}
+
+    if all(field in loaded for field in STATE_FIELDS):
+        return {field: loaded[field] for field in STATE_FIELDS}
+
+    values = Ticket.objects.values_list(*STATE_FIELDS).get(pk=ticket.pk)
+    return dict(zip(STATE_FIELDS, values))
+
+
+# ---------------------------------------------------
+# Recording
+# ---------------------------------------------------
+def record_created(tickets):
+    record_moves((None, ticket_state(ticket)) for ticket in tickets)
+
+
+def record_deleted(states):
+    record_moves((state, None) for state in states)
+
+
+def record_moves(moves):
+    """
+    ``moves`` is an iterable of ``(old_state, new_state)`` pairs; None
+    stands for "no row" (created / deleted).
+    """
+    # Saves that touched none of STATE_FIELDS concern no consumer
+    moves = [(old, new) for old, new in moves if old != new]
+
+    if not moves:
+        return
+
+    with transaction.atomic():
+        rollup_service.apply_moves(moves)
+        sla_service.apply_moves(moves)
+        event_service.publish_moves(moves)
+        notification_service.enqueue_for_moves(moves)
+
+        transaction.on_commit(lambda: _after_commit(moves))
+
+
+def _after_commit(moves):
+    states = [state for move in moves for state in move if state is not None]
+
+    invalidate_dashboards(
+        client_ids={state["client_id"] for state in states},
+        staff_ids={state["assigned_to_id"] for state in states},
+    )
+    assignment_service.apply_load_moves(moves)
@@ -0,0 +1,51 @@
+from django.utils import timezone
+
+from tickets.exceptions import TicketConflict
+from tickets.models import Ticket
+from tickets.services.activity_service import activity_batch, log_activity
+from tickets.services.ticket_change_service import record_moves, ticket_state
+from tickets.state_machine import transition_values
+
+
+def apply_ticket_update(ticket, user, changes):
+    """
+    Apply a validated status/assignment change as a single conditional
+    ``UPDATE ... WHERE id = ? AND status = ?``, stamping the lifecycle
+    timestamp of the new status in the same statement.
+
+    The activity row is written in the same transaction. If another
+    request changed the status since ``ticket`` was read, nothing is
+    written and TicketConflict (HTTP 409) is raised. No row locks are
+    taken.
+    """
+    old_status = ticket.status
+    new_status = changes.get("status", old_status)
+
+    now = timezone.now()
+    values = dict(changes, updated_at=now)
+
+    if new_status != old_status:
+        values.update(transition_values(new_status, now))
+
+    with activity_batch():
+        updated = (
+            Ticket.objects
+            .filter(pk=ticket.pk, status=old_status)
+            .update(**values)
+        )
+
+        if not updated:
+            raise TicketConflict()
+
+        if new_status != old_status:
+            log_activity(ticket, user, old_status, new_status)
+
+        record_moves([(ticket_state(ticket), ticket_state(ticket, **values))])
+
+    for field, value in values.items():
+        setattr(ticket, field, value)
+
+    # The row now matches the instance; keep change tracking in sync.
+    ticket._snapshot([ticket._meta.get_field(field).attname for field in values])
+
+    return ticket
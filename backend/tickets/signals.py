@@ -0,0 +1,21 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.services.catalog_service import bump_version
+from tickets.services.assignment_service import index as assignment_index
+
+
+# Activation, specialty or membership changes reshape the assignment heaps
+@receiver(post_save, sender="tickets.Staff")
+@receiver(post_delete, sender="tickets.Staff")
+def invalidate_assignment_index(sender, **kwargs):
+    transaction.on_commit(assignment_index.invalidate)
+
+
+# The issue catalog counts active staff per specialty (core.signals
+# covers the catalog's own rows)
+@receiver(post_save, sender="tickets.Staff")
+@receiver(post_delete, sender="tickets.Staff")
+def invalidate_catalog(sender, **kwargs):
+    transaction.on_commit(bump_version)
@@ -0,0 +1,103 @@
+"""
+Ticket lifecycle state machine.
+
+The transition table is compiled once at import into a read-only mapping
+keyed by (status, role), so every caller (model, API serializer, admin)
+shares the same rules and a lookup is a single dict access.
+"""
+from types import MappingProxyType
+
+from django.utils import timezone
+
+from accounts.models import User
+from tickets.models import Ticket
+
+
+Status = Ticket.Status
+
+# Forward-only lifecycle
+LIFECYCLE = {
+    Status.CREATED: (Status.ASSIGNED,),
+    Status.ASSIGNED: (Status.STARTED,),
+    Status.STARTED: (Status.RESOLVED,),
+    Status.RESOLVED: (Status.CLOSED,),
+    Status.CLOSED: (),
+}
+
+# Target statuses each role may never move a ticket into
+FORBIDDEN_TARGETS = {
+    User.Role.ADMIN: frozenset(),
+    User.Role.STAFF: frozenset({Status.CLOSED}),  # STAFF cannot close tickets
+    User.Role.CLIENT: frozenset(LIFECYCLE),  # CLIENT cannot change status
+}
+
+# Lifecycle timestamp stamped when a ticket enters each status
+TIMESTAMP_FIELDS = MappingProxyType({
+    Status.ASSIGNED: "assigned_at",
+    Status.STARTED: "started_at",
+    Status.RESOLVED: "resolved_at",
+    Status.CLOSED: "closed_at",
+})
+
+
+def _compile():
+    table = {}
+
+    for status, targets in LIFECYCLE.items():
+        for role, forbidden in FORBIDDEN_TARGETS.items():
+            table[(status, role)] = tuple(t for t in targets if t not in forbidden)
+
+    return MappingProxyType(table)
+
+
+TRANSITIONS = _compile()
+
+
+def allowed_transitions(status, role):
+    return TRANSITIONS.get((status, role), ())
+
+
+def can_transition(status, new_status, role):
+    return new_status in allowed_transitions(status, role)
+
+
+def update_error(ticket, role, changes):
+    """
+    Why ``role`` may not apply ``changes`` (``status`` and/or
+    ``assigned_to``) to ``ticket``, or None. Single and bulk updates
+    accept exactly the same inputs.
+    """
+    if ticket.status == Status.CLOSED:
+        return "Closed tickets cannot be modified."
+
+    if "status" in changes:
+        if role == User.Role.CLIENT:
+            return "Clients cannot update ticket status."
+
+        if not can_transition(ticket.status, changes["status"], role):
+            return f"Transition from {ticket.status} to {changes['status']} not allowed."
+
+    assigned_to = changes.get("assigned_to")
+
+    if assigned_to:
+        if not assigned_to.is_active:
+            return "Assigned staff is not active."
+
+        if assigned_to.specialty_id != ticket.issue_id:
+            return "Assigned staff does not match ticket issue."
+
+    return None
+
+
+def transition_values(new_status, now=None):
+    """
+    Column values for moving a ticket into ``new_status``: the status
+    itself plus its lifecycle timestamp, so both land in the same write.
+    """
+    values = {"status": new_status}
+
+    field = TIMESTAMP_FIELDS.get(new_status)
+    if field:
+        values[field] = now or timezone.now()
+
+    return values
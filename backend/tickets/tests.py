@@ -1,3 +1,2103 @@
-from django.test import TestCase
+import asyncio
+import base64
+import csv
+import io
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta
+from unittest import mock, skipIf, skipUnless
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core import mail
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import NotSupportedError, connection, transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+from django.db.transaction import TransactionManagementError
+from django.test import AsyncClient, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from accounts.services.revocation_service import index as revocation_index
+from accounts.tokens import ClaimsRefreshToken
+from core.models import CompanyType, Issue, SubIssue
+from core.services import catalog_service
+from tickets.models import (
+    ArchivedTicket,
+    ArchivedTicketActivity,
+    Client,
+    ClientNotification,
+    Staff,
+    Ticket,
+    TicketActivity,
+    TicketDailyRollup,
+    TicketSlaSketch,
+)
+from tickets.event_brokers import InProcessBroker
+from tickets.exceptions import TicketConflict
+from tickets.notification_backends import FakeWhatsAppBackend, PermanentError, whatsapp_outbox
+from tickets.quantile_sketch import RELATIVE_ACCURACY, QuantileSketch
+from tickets.services import (
+    archive_service,
+    bulk_service,
+    dashboard_service,
+    event_service,
+    notification_service,
+    rollup_service,
+    sla_service,
+)
+from tickets.services.activity_service import activity_batch, log_activity
+from tickets.services.assignment_service import index as assignment_index
+from tickets.services.import_service import import_tickets
+from tickets.services.search_service import search_tickets
+from tickets.services.transition_service import apply_ticket_update
+
+
+# ---------------------------------------------------
+# Query budgets
+# ---------------------------------------------------
+# Maximum number of SQL statements each /api/tickets/... endpoint may run,
+# independent of how many tickets the caller can see. Savepoint bookkeeping
+# from atomic() blocks is not counted.
+QUERY_BUDGETS = {
+    "list": 3,  # + conditional GET validators (max updated_at, count)
+    "list-keyset": 1,  # the page itself is the validator: no COUNT
+    "export": 1,
+    "detail": 1,
+    "activity": 3,  # + conditional GET validators
+    "allowed-transitions": 1,
+    "eligible-staff": 2,
+    # includes first-of-the-day rollup UPDATE + INSERT, the auto-assignment
+    # activity and client notification INSERTs and the time-to-assign
+    # sketch SELECT / INSERT / UPDATE
+    "create": 10,
+    # + rollup decrement, increment (UPDATE + INSERT on a new key) and the
+    # client notification INSERT
+    "update": 7,
+}
+
+SAVEPOINT_SQL = re.compile(r"^(RELEASE |ROLLBACK TO )?SAVEPOINT ", re.IGNORECASE)
+
+
+class TicketTestCase(TestCase):
+    """
+    An issue with one staff member and one client holding 12 ASSIGNED
+    tickets.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        company_type = CompanyType.objects.create(name="Retail")
+        cls.issue = Issue.objects.create(name="Network")
+        cls.sub_issue = SubIssue.objects.create(issue=cls.issue, name="VPN")
+
+        cls.admin = User.objects.create_user("admin", role=User.Role.ADMIN)
+        cls.staff_user = User.objects.create_user("agent", role=User.Role.STAFF)
+        cls.client_user = User.objects.create_user("acme", role=User.Role.CLIENT)
+
+        cls.staff = Staff.objects.create(user=cls.staff_user, specialty=cls.issue)
+        cls.client_profile = Client.objects.create(
+            user=cls.client_user,
+            company_name="Acme",
+            company_type=company_type,
+            email="ops@acme.test",
+            whatsapp_number="+10000000000",
+        )
+
+        cls.tickets = [
+            Ticket.objects.create(
+                client=cls.client_profile,
+                issue=cls.issue,
+                sub_issue=cls.sub_issue,
+                description=f"Ticket {i}",
+                assigned_to=cls.staff,
+                status=Ticket.Status.ASSIGNED,
+            )
+            for i in range(12)
+        ]
+
+    def api(self, user):
+        api = APIClient()
+        api.force_authenticate(user)
+        return api
+
+
+class QueryBudgetTests(TicketTestCase):
+
+    def assertWithinBudget(self, endpoint, user, method, url, data=None, headers=None, token=None):
+        api = APIClient()
+
+        if token:
+            api.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        else:
+            api.force_authenticate(user)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = getattr(api, method)(url, data, format="json", headers=headers)
+            # Streaming bodies run their queries while being consumed
+            content = (
+                b"".join(response.streaming_content)
+                if response.streaming else response.content
+            )
+
+        queries = [
+            q["sql"] for q in ctx.captured_queries
+            if not SAVEPOINT_SQL.match(q["sql"])
+        ]
+
+        self.assertLess(response.status_code, 400, content)
+        self.assertLessEqual(
+            len(queries),
+            QUERY_BUDGETS[endpoint],
+            f"{method.upper()} {url} as {user.role} ran "
+            f"{len(queries)} queries:\n" + "\n".join(queries),
+        )
+
+        return response
+
+    def test_read_endpoints(self):
+        ticket = self.tickets[0]
+
+        # The assignment index loads once per process, not per request
+        assignment_index.load()
+
+        for user in (self.admin, self.staff_user, self.client_user):
+            self.assertWithinBudget("list", user, "get", "/api/tickets/")
+            self.assertWithinBudget("export", user, "get", "/api/tickets/export/")
+            self.assertWithinBudget("detail", user, "get", f"/api/tickets/{ticket.id}/")
+            self.assertWithinBudget("activity", user, "get", f"/api/tickets/{ticket.id}/activity/")
+            self.assertWithinBudget(
+                "allowed-transitions", user, "get",
+                f"/api/tickets/{ticket.id}/allowed-transitions/",
+            )
+
+        for user in (self.admin, self.staff_user):
+            self.assertWithinBudget(
+                "eligible-staff", user, "get",
+                f"/api/tickets/{ticket.id}/eligible-staff/",
+            )
+
+    def test_read_endpoints_with_access_token(self):
+        # Claims tokens authenticate without loading the User row
+        ticket = self.tickets[0]
+
+        for user in (self.admin, self.staff_user, self.client_user):
+            token = ClaimsRefreshToken.for_user(user).access_token
+
+            # The revocation index loads once per process, not per request
+            revocation_index.rebuild()
+
+            self.assertWithinBudget("list", user, "get", "/api/tickets/", token=token)
+            self.assertWithinBudget("detail", user, "get", f"/api/tickets/{ticket.id}/", token=token)
+            self.assertWithinBudget(
+                "activity", user, "get", f"/api/tickets/{ticket.id}/activity/", token=token,
+            )
+
+    def test_async_read_endpoints(self):
+        # /api/async/ serves the same reads from async views (ASGI)
+        ticket = self.tickets[0]
+
+        for user in (self.admin, self.staff_user, self.client_user):
+            token = ClaimsRefreshToken.for_user(user).access_token
+            revocation_index.rebuild()
+
+            self.assertWithinBudget("list", user, "get", "/api/async/tickets/", token=token)
+            self.assertWithinBudget(
+                "detail", user, "get", f"/api/async/tickets/{ticket.id}/", token=token,
+            )
+            self.assertWithinBudget(
+                "activity", user, "get", f"/api/async/tickets/{ticket.id}/activity/", token=token,
+            )
+
+    def test_write_endpoints(self):
+        assignment_index.load()
+
+        self.assertWithinBudget(
+            "create", self.client_user, "post", "/api/tickets/create/",
+            {
+                "issue": self.issue.id,
+                "sub_issue": self.sub_issue.id,
+                "description": "Printer on fire",
+            },
+        )
+        self.assertWithinBudget(
+            "update", self.staff_user, "patch",
+            f"/api/tickets/{self.tickets[0].id}/update/",
+            {"status": Ticket.Status.STARTED},
+        )
+
+    def test_conditional_get(self):
+        ticket = self.tickets[0]
+        etags = {}
+
+        for endpoint, url in (
+            ("list", "/api/tickets/"),
+            ("detail", f"/api/tickets/{ticket.id}/"),
+            ("activity", f"/api/tickets/{ticket.id}/activity/"),
+        ):
+            response = self.assertWithinBudget(endpoint, self.admin, "get", url)
+            etag = etags[endpoint] = response.headers["ETag"]
+
+            response = self.assertWithinBudget(
+                endpoint, self.admin, "get", url, headers={"If-None-Match": etag},
+            )
+            self.assertEqual(response.status_code, 304, url)
+            self.assertEqual(response.headers["ETag"], etag)
+
+        # A write in scope changes the validators
+        ticket.description = "Changed"
+        ticket.save()
+
+        for endpoint, url in (
+            ("list", "/api/tickets/"),
+            ("detail", f"/api/tickets/{ticket.id}/"),
+        ):
+            response = self.assertWithinBudget(
+                endpoint, self.admin, "get", url, headers={"If-None-Match": etags[endpoint]},
+            )
+            self.assertEqual(response.status_code, 200, url)
+
+    def test_if_modified_since(self):
+        ticket = self.tickets[0]
+
+        for url in (
+            "/api/tickets/",
+            f"/api/tickets/{ticket.id}/",
+            "/api/async/tickets/",
+            f"/api/async/tickets/{ticket.id}/",
+        ):
+            token = ClaimsRefreshToken.for_user(self.admin).access_token
+            revocation_index.rebuild()
+            api = APIClient()
+            api.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+            last_modified = api.get(url).headers["Last-Modified"]
+            response = api.get(url, headers={"If-Modified-Since": last_modified})
+            self.assertEqual(response.status_code, 304, url)
+
+    def test_keyset_list(self):
+        url = "/api/tickets/?pagination=keyset"
+
+        for user in (self.admin, self.staff_user, self.client_user):
+            response = self.assertWithinBudget("list-keyset", user, "get", url)
+
+        etag = response.headers["ETag"]
+        self.assertNotIn("Last-Modified", response.headers)
+
+        response = self.assertWithinBudget(
+            "list-keyset", self.client_user, "get", url, headers={"If-None-Match": etag},
+        )
+        self.assertEqual(response.status_code, 304)
+
+        # Deleting a row on the page changes it
+        self.tickets[-1].delete()
+        response = self.assertWithinBudget(
+            "list-keyset", self.client_user, "get", url, headers={"If-None-Match": etag},
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_async_list_matches_sync(self):
+        token = ClaimsRefreshToken.for_user(self.admin).access_token
+        revocation_index.rebuild()
+        api = APIClient()
+        api.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        for query in ("?page=2", "?pagination=keyset&page_size=4", "?ordering=status"):
+            sync = api.get(f"/api/tickets/{query}").json()
+            asynchronous = api.get(f"/api/async/tickets/{query}").json()
+
+            self.assertEqual(
+                [row["id"] for row in sync["results"]],
+                [row["id"] for row in asynchronous["results"]],
+                query,
+            )
+            self.assertEqual(sync.get("count"), asynchronous.get("count"), query)
+
+        self.assertEqual(api.get("/api/async/tickets/?page=99").status_code, 404)
+
+
+class KeysetPaginationTests(TicketTestCase):
+    """
+    Tickets an hour apart, except pairs sharing a created_at so the id
+    tie-breaker decides; every third one STARTED.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        start = timezone.now() - timedelta(days=1)
+        for i, ticket in enumerate(cls.tickets):
+            Ticket.objects.filter(pk=ticket.pk).update(
+                created_at=start + timedelta(hours=i // 2),
+                status=Ticket.Status.STARTED if i % 3 == 0 else Ticket.Status.ASSIGNED,
+                description=" ".join(["vpn"] * (1 + i % 4)) + f" outage {i}",
+            )
+
+    def walk(self, url, **params):
+        """
+        Follow ``next`` links from the first page, then ``previous`` links
+        back; returns the ids of each page in both directions.
+        """
+        api = self.api(self.admin)
+        response = api.get(url, {"pagination": "keyset", "page_size": 5, **params})
+        forward, backward = [], []
+
+        while True:
+            self.assertEqual(response.status_code, 200, response.content)
+            page = response.json()
+            forward.append([row["id"] for row in page["results"]])
+            if not page["next"]:
+                break
+            response = api.get(page["next"])
+
+        self.assertIsNone(api.get(url, {"pagination": "keyset", "page_size": 5, **params}).json()["previous"])
+
+        while page["previous"]:
+            page = api.get(page["previous"]).json()
+            backward.append([row["id"] for row in page["results"]])
+
+        return forward, backward
+
+    def assertWalks(self, expected, url="/api/tickets/", **params):
+        forward, backward = self.walk(url, **params)
+
+        self.assertEqual([ticket_id for page in forward for ticket_id in page], expected)
+        self.assertEqual([len(page) for page in forward], [5, 5, 2])
+        self.assertEqual(backward, forward[-2::-1])
+
+    def test_next_and_previous(self):
+        expected = list(
+            Ticket.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+        self.assertWalks(expected)
+
+    def test_status_ordering(self):
+        ascending = list(
+            Ticket.objects.order_by("status", "created_at", "id").values_list("id", flat=True)
+        )
+        self.assertWalks(ascending, ordering="status")
+
+        descending = list(
+            Ticket.objects.order_by("-status", "-created_at", "-id").values_list("id", flat=True)
+        )
+        self.assertWalks(descending, ordering="-status")
+
+    def test_search_rank_ordering(self):
+        # Relevance first, then newest: rank ties span page boundaries
+        expected = list(
+            search_tickets(Ticket.objects.all(), "vpn")
+            .order_by("-search_rank", "-created_at", "-id")
+            .values_list("id", flat=True)
+        )
+        self.assertEqual(len(expected), 12)
+
+        self.assertWalks(expected, search="vpn")
+
+    def test_rejects_bad_cursors(self):
+        def encode(payload):
+            return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+        api = self.api(self.admin)
+
+        for cursor in (
+            "not base64!",
+            encode({"values": []}),
+            encode({"v": ["2026-01-01T00:00:00Z"]}),  # created_at without id
+            encode({"v": ["yesterday", 1]}),
+        ):
+            response = api.get("/api/tickets/", {"cursor": cursor})
+            self.assertEqual(response.status_code, 404, cursor)
+            self.assertEqual(response.json()["detail"], "Invalid cursor.")
+
+
+class IndexAdvisorTests(TicketTestCase):
+
+    def test_explains_every_endpoint(self):
+        out = io.StringIO()
+        call_command("index_advisor", "--verbose-plans", stdout=out, no_color=True)
+        output = out.getvalue()
+
+        self.assertNotIn("skipped", output)
+
+        for role in User.Role.values:
+            self.assertIn(f"[{role}] GET /api/tickets/:", output)
+            self.assertIn(f"[{role}] GET /api/tickets/?pagination=keyset:", output)
+            self.assertIn(f"[{role}] GET /api/dashboard/all/:", output)
+
+        self.assertIn("[STAFF] GET /api/tickets/<id>/eligible-staff/:", output)
+        self.assertNotIn("[CLIENT] GET /api/tickets/<id>/eligible-staff/:", output)
+
+        # The real views' queries, including the conditional GET aggregate
+        # and the dashboards' rollup sums
+        self.assertIn('MAX("tickets_ticket"."updated_at")', output)
+        self.assertIn('SUM("tickets_ticketdailyrollup"."count")', output)
+
+
+# ---------------------------------------------------
+# Auto-assignment
+# ---------------------------------------------------
+class AssignmentTests(TicketTestCase):
+    """
+    Besides the base staff member (12 open tickets), "light" has one open
+    ticket and "busy" two; an inactive and an other-issue staff member
+    have none and are never eligible.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        def staff(username, **fields):
+            user = User.objects.create_user(username, role=User.Role.STAFF)
+            return Staff.objects.create(user=user, **{"specialty": cls.issue, **fields})
+
+        # Created first: wins ties on the staff id
+        cls.busy = staff("busy")
+        cls.light = staff("light")
+        staff("inactive", is_active=False)
+        cls.printers = staff("printers", specialty=Issue.objects.create(name="Printers"))
+
+        cls.busy_tickets = [
+            Ticket.objects.create(
+                client=cls.client_profile,
+                issue=cls.issue,
+                sub_issue=cls.sub_issue,
+                description=f"Busy {i}",
+                assigned_to=staff_member,
+                status=Ticket.Status.ASSIGNED,
+            )
+            for i, staff_member in enumerate((cls.busy, cls.busy, cls.light))
+        ]
+
+    def setUp(self):
+        assignment_index.load()
+
+    def create(self):
+        # Loads follow the ticket once the create commits
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.api(self.client_user).post(
+                "/api/tickets/create/",
+                {"issue": self.issue.id, "sub_issue": self.sub_issue.id, "description": "New"},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 201, response.content)
+        return Ticket.objects.latest("id")
+
+    def move(self, ticket, status):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.api(self.admin).patch(
+                f"/api/tickets/{ticket.id}/update/", {"status": status}, format="json",
+            )
+        self.assertEqual(response.status_code, 200, response.content)
+
+    def eligible(self):
+        response = self.api(self.admin).get(f"/api/tickets/{self.tickets[0].id}/eligible-staff/")
+        self.assertEqual(response.status_code, 200)
+        return [(row["username"], row["load"]) for row in response.json()]
+
+    def test_least_loaded_first(self):
+        ticket = self.create()
+
+        self.assertEqual(ticket.assigned_to_id, self.light.id)
+        self.assertEqual(ticket.status, Ticket.Status.ASSIGNED)
+        self.assertIsNotNone(ticket.assigned_at)
+        self.assertEqual(
+            list(TicketActivity.objects.filter(ticket=ticket).values_list("old_status", "new_status")),
+            [(Ticket.Status.CREATED, Ticket.Status.ASSIGNED)],
+        )
+
+        # 2 / 2: the tie goes to the lower staff id, then the other one
+        self.assertEqual(
+            [self.create().assigned_to_id for _ in range(2)],
+            [self.busy.id, self.light.id],
+        )
+
+    def test_completion_frees_capacity(self):
+        for status in (Ticket.Status.STARTED, Ticket.Status.RESOLVED):
+            self.move(self.busy_tickets[0], status)
+
+        # Started tickets still count; resolved ones don't
+        self.assertEqual(self.eligible(), [("busy", 1), ("light", 1), ("agent", 12)])
+        self.assertEqual(self.create().assigned_to_id, self.busy.id)
+
+    def test_eligible_staff_payload(self):
+        response = self.api(self.staff_user).get(f"/api/tickets/{self.tickets[0].id}/eligible-staff/")
+
+        self.assertEqual(response.json(), [
+            {"id": self.light.user_id, "staff_id": self.light.id, "username": "light", "load": 1},
+            {"id": self.busy.user_id, "staff_id": self.busy.id, "username": "busy", "load": 2},
+            {"id": self.staff_user.id, "staff_id": self.staff.id, "username": "agent", "load": 12},
+        ])
+
+        response = self.api(self.client_user).get(f"/api/tickets/{self.tickets[0].id}/eligible-staff/")
+        self.assertEqual(response.status_code, 403)
+
+    def test_staff_changes_reload(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.light.is_active = False
+            self.light.save()
+
+        self.assertEqual(self.eligible(), [("busy", 2), ("agent", 12)])
+        self.assertEqual(self.create().assigned_to_id, self.busy.id)
+
+    def test_stale_heap_entries_are_compacted_per_issue(self):
+        heap = assignment_index.heaps[self.printers.specialty_id]
+
+        for i in range(100):
+            assignment_index.apply({self.printers.id: 1 if i % 2 else -1})
+
+        # Bounded by the issue's one staff member, not all active staff
+        self.assertLessEqual(len(heap), 2 * 1 + 16)
+        self.assertEqual(assignment_index.least_loaded(self.printers.specialty_id), self.printers.id)
+
+    @override_settings(TICKET_AUTO_ASSIGN=False)
+    def test_disabled(self):
+        ticket = self.create()
+
+        self.assertIsNone(ticket.assigned_to_id)
+        self.assertEqual(ticket.status, Ticket.Status.CREATED)
+
+
+# ---------------------------------------------------
+# Ticket writes
+# ---------------------------------------------------
+@override_settings(CLIENT_NOTIFICATION_CHANNELS=["email"])
+class TicketWriteTests(TicketTestCase):
+
+    def rollup_counts(self):
+        return dict(
+            TicketDailyRollup.objects
+            .values_list("status")
+            .annotate(total=Sum("count"))
+            .filter(total__gt=0)
+        )
+
+    def update_sql(self, ctx):
+        return [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("UPDATE \"tickets_ticket\"")]
+
+    def test_update_applies_transition(self):
+        ticket = self.tickets[0]
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.api(self.staff_user).patch(
+                f"/api/tickets/{ticket.id}/update/", {"status": Ticket.Status.STARTED}, format="json",
+            )
+        self.assertEqual(response.status_code, 200, response.content)
+
+        # One conditional UPDATE stamps the lifecycle timestamp too
+        [update] = self.update_sql(ctx)
+        self.assertIn('"started_at"', update)
+        self.assertIn('"status" = ', update.split("WHERE")[1])
+
+        ticket.refresh_from_db()
+        self.assertEqual(ticket.status, Ticket.Status.STARTED)
+        self.assertIsNotNone(ticket.started_at)
+        self.assertEqual(
+            list(TicketActivity.objects.filter(ticket=ticket).values_list("changed_by", "old_status", "new_status")),
+            [(self.staff_user.id, Ticket.Status.ASSIGNED, Ticket.Status.STARTED)],
+        )
+        self.assertEqual(self.rollup_counts(), {Ticket.Status.ASSIGNED: 11, Ticket.Status.STARTED: 1})
+        self.assertEqual(
+            list(ClientNotification.objects.values_list("ticket_id", "channel", "ticket_status")),
+            [(ticket.id, "email", Ticket.Status.STARTED)],
+        )
+
+    def test_rejected_updates_write_nothing(self):
+        ticket = self.tickets[0]
+
+        for user, status in (
+            (self.staff_user, Ticket.Status.CLOSED),  # staff cannot close
+            (self.staff_user, Ticket.Status.RESOLVED),  # skips STARTED
+            (self.client_user, Ticket.Status.STARTED),
+        ):
+            response = self.api(user).patch(
+                f"/api/tickets/{ticket.id}/update/", {"status": status}, format="json",
+            )
+            self.assertIn(response.status_code, (400, 403, 404), (user, status))
+
+        ticket.refresh_from_db()
+        self.assertEqual(ticket.status, Ticket.Status.ASSIGNED)
+        self.assertFalse(TicketActivity.objects.exists())
+        self.assertFalse(ClientNotification.objects.exists())
+        self.assertEqual(self.rollup_counts(), {Ticket.Status.ASSIGNED: 12})
+
+    def test_lost_race_conflicts(self):
+        ticket = Ticket.objects.get(pk=self.tickets[0].pk)
+
+        # Another request started the ticket after this one read it
+        Ticket.objects.filter(pk=ticket.pk).update(status=Ticket.Status.STARTED)
+
+        with self.assertRaises(TicketConflict):
+            apply_ticket_update(ticket, self.admin, {"status": Ticket.Status.STARTED})
+
+        self.assertFalse(TicketActivity.objects.exists())
+        self.assertEqual(self.rollup_counts(), {Ticket.Status.ASSIGNED: 12})
+
+    @override_settings(TICKET_AUTO_ASSIGN=False)
+    def test_create(self):
+        response = self.api(self.client_user).post(
+            "/api/tickets/create/",
+            {"issue": self.issue.id, "sub_issue": self.sub_issue.id, "description": "Printer on fire"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+
+        ticket = Ticket.objects.latest("id")
+        self.assertEqual(ticket.client_id, self.client_profile.id)
+        self.assertEqual(ticket.status, Ticket.Status.CREATED)
+        self.assertIsNotNone(ticket.ticket_number)
+        self.assertEqual(self.rollup_counts(), {Ticket.Status.ASSIGNED: 12, Ticket.Status.CREATED: 1})
+
+        # Nothing to tell the client until the ticket is assigned
+        self.assertFalse(TicketActivity.objects.exists())
+        self.assertFalse(ClientNotification.objects.exists())
+
+        response = self.api(self.staff_user).post(
+            "/api/tickets/create/",
+            {"issue": self.issue.id, "sub_issue": self.sub_issue.id, "description": "Staff"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_create_with_auto_assignment_notifies(self):
+        assignment_index.load()
+
+        response = self.api(self.client_user).post(
+            "/api/tickets/create/",
+            {"issue": self.issue.id, "sub_issue": self.sub_issue.id, "description": "Printer on fire"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+
+        ticket = Ticket.objects.latest("id")
+        self.assertEqual(self.rollup_counts(), {Ticket.Status.ASSIGNED: 13})
+        self.assertEqual(
+            list(ClientNotification.objects.values_list("ticket_id", "ticket_status")),
+            [(ticket.id, Ticket.Status.ASSIGNED)],
+        )
+
+    def test_save_writes_changed_columns_only(self):
+        ticket = Ticket.objects.get(pk=self.tickets[0].pk)
+        ticket.description = "Changed"
+
+        with CaptureQueriesContext(connection) as ctx:
+            ticket.save()
+
+        # No SELECT for the closed-ticket guard; only the changed column
+        # (and updated_at) is written
+        self.assertFalse([q for q in ctx.captured_queries if q["sql"].startswith("SELECT \"tickets_ticket\"")])
+        [update] = self.update_sql(ctx)
+        self.assertIn('"description"', update)
+        self.assertNotIn('"status"', update)
+        self.assertEqual(Ticket.objects.get(pk=ticket.pk).description, "Changed")
+
+        # Unchanged: no write at all
+        with self.assertNumQueries(0):
+            ticket.save()
+
+    def test_closed_tickets_are_read_only(self):
+        Ticket.objects.filter(pk=self.tickets[0].pk).update(status=Ticket.Status.CLOSED)
+        ticket = Ticket.objects.get(pk=self.tickets[0].pk)
+        ticket.description = "Changed"
+
+        with self.assertNumQueries(0), self.assertRaises(ValueError):
+            ticket.save()
+
+        response = self.api(self.admin).patch(
+            f"/api/tickets/{ticket.id}/update/", {"assigned_to": self.staff.id}, format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+# ---------------------------------------------------
+# Bulk updates
+# ---------------------------------------------------
+class BulkUpdateTests(TicketTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        cls.other_staff_user = User.objects.create_user("agent2", role=User.Role.STAFF)
+        cls.other_staff = Staff.objects.create(user=cls.other_staff_user, specialty=cls.issue)
+
+        printers = Issue.objects.create(name="Printers")
+        cls.printer_staff = Staff.objects.create(
+            user=User.objects.create_user("printers", role=User.Role.STAFF),
+            specialty=printers,
+        )
+
+    def bulk_update(self, user, data):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.api(user).post("/api/tickets/bulk-update/", data, format="json")
+
+    def results(self, response):
+        self.assertEqual(response.status_code, 200, response.content)
+        return {row["id"]: (row["result"], row["detail"]) for row in response.json()["results"]}
+
+    def test_mixed_results(self):
+        started, closed, raced = self.tickets[0], self.tickets[1], self.tickets[2]
+        Ticket.objects.filter(pk=closed.pk).update(status=Ticket.Status.CLOSED)
+
+        validate = bulk_service._validate
+
+        def validate_then_race(ticket, *args):
+            error = validate(ticket, *args)
+            if ticket is not None and ticket.pk == raced.pk:
+                # Another request starts it between the check and the write
+                Ticket.objects.filter(pk=raced.pk).update(status=Ticket.Status.STARTED)
+            return error
+
+        with mock.patch.object(bulk_service, "_validate", side_effect=validate_then_race):
+            response = self.bulk_update(self.admin, {
+                "ids": [started.id, closed.id, raced.id, 99999, started.id],
+                "status": Ticket.Status.STARTED,
+            })
+
+        self.assertEqual(self.results(response), {
+            started.id: ("updated", None),
+            closed.id: ("failed", "Closed tickets cannot be modified."),
+            raced.id: ("conflict", "Ticket was modified concurrently."),
+            99999: ("failed", "Ticket not found."),
+        })
+        self.assertEqual((response.json()["updated"], response.json()["failed"]), (1, 3))
+
+        # Duplicate ids are applied once; the conflicting ticket is untouched
+        self.assertEqual(
+            list(TicketActivity.objects.values_list("ticket_id", "old_status", "new_status")),
+            [(started.id, Ticket.Status.ASSIGNED, Ticket.Status.STARTED)],
+        )
+        raced.refresh_from_db()
+        self.assertIsNone(raced.started_at)
+
+    def test_roles_and_rules(self):
+        mine, theirs = self.tickets[0], self.tickets[1]
+        Ticket.objects.filter(pk=theirs.pk).update(assigned_to=self.other_staff)
+
+        response = self.bulk_update(self.client_user, {"ids": [mine.id], "status": Ticket.Status.STARTED})
+        self.assertEqual(response.status_code, 403)
+
+        # Staff only see their own tickets
+        self.assertEqual(
+            self.results(self.bulk_update(self.staff_user, {"ids": [theirs.id], "status": Ticket.Status.STARTED})),
+            {theirs.id: ("failed", "Ticket not found.")},
+        )
+
+        for status in (Ticket.Status.RESOLVED, Ticket.Status.CLOSED):
+            self.assertEqual(
+                self.results(self.bulk_update(self.staff_user, {"ids": [mine.id], "status": status})),
+                {mine.id: ("failed", f"Transition from ASSIGNED to {status} not allowed.")},
+            )
+
+        self.assertEqual(
+            self.results(self.bulk_update(self.admin, {"ids": [mine.id], "assigned_to": self.printer_staff.id})),
+            {mine.id: ("failed", "Assigned staff does not match ticket issue.")},
+        )
+
+        self.assertEqual(set(Ticket.objects.values_list("status", flat=True)), {Ticket.Status.ASSIGNED})
+        self.assertEqual(Ticket.objects.filter(assigned_to=self.staff).count(), 11)
+        self.assertFalse(TicketActivity.objects.exists())
+
+    def test_chunked_writes(self):
+        tickets = self.tickets[:10]
+        Ticket.objects.filter(pk__in=[t.pk for t in tickets[:2]]).update(status=Ticket.Status.STARTED)
+
+        with mock.patch.object(bulk_service, "record_moves") as record_moves:
+            # The ticket SELECT, then per chunk: SAVEPOINT, the locking
+            # SELECT, one UPDATE per status moved away from, one activity
+            # INSERT and RELEASE. Already STARTED tickets are rejected.
+            with self.assertNumQueries(1 + 5 + 5) as ctx:
+                results = bulk_service.bulk_update_tickets(
+                    self.admin,
+                    [t.id for t in tickets],
+                    status=Ticket.Status.STARTED,
+                    assigned_to=self.other_staff,
+                    chunk_size=5,
+                )
+
+        self.assertEqual([row["result"] for row in results], ["failed"] * 2 + ["updated"] * 8)
+
+        locked = [
+            re.search(r"IN \(([^)]*)\)", q["sql"]).group(1).split(", ")
+            for q in ctx.captured_queries if '"status" FROM "tickets_ticket"' in q["sql"]
+        ]
+        self.assertEqual(locked, [[str(t.id) for t in tickets[2:7]], [str(t.id) for t in tickets[7:]]])
+        inserts = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith('INSERT INTO "tickets_ticketactivity"')]
+        self.assertEqual(len(inserts), 2)
+
+        self.assertEqual([len(call.args[0]) for call in record_moves.call_args_list], [5, 3])
+        self.assertEqual(TicketActivity.objects.count(), 8)
+        self.assertEqual(Ticket.objects.filter(assigned_to=self.other_staff, status=Ticket.Status.STARTED).count(), 8)
+
+    def test_same_rules_as_single_updates(self):
+        ticket = self.tickets[0]
+        inactive = Staff.objects.create(
+            user=User.objects.create_user("retired", role=User.Role.STAFF),
+            specialty=self.issue,
+            is_active=False,
+        )
+
+        for changes, error in (
+            ({"status": Ticket.Status.ASSIGNED}, "Transition from ASSIGNED to ASSIGNED not allowed."),
+            ({"assigned_to": inactive.id}, "Assigned staff is not active."),
+            ({"assigned_to": self.printer_staff.id}, "Assigned staff does not match ticket issue."),
+        ):
+            with self.subTest(**changes):
+                response = self.api(self.admin).patch(
+                    f"/api/tickets/{ticket.id}/update/", changes, format="json",
+                )
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json()["non_field_errors"], [error])
+
+                self.assertEqual(
+                    self.results(self.bulk_update(self.admin, {"ids": [ticket.id], **changes})),
+                    {ticket.id: ("failed", error)},
+                )
+
+        ticket.refresh_from_db()
+        self.assertEqual((ticket.status, ticket.assigned_to_id), (Ticket.Status.ASSIGNED, self.staff.id))
+        self.assertFalse(TicketActivity.objects.exists())
+
+    def test_consumers_follow_moves(self):
+        tickets = self.tickets[:3]
+        ids = [t.id for t in tickets]
+
+        broker = mock.Mock()
+        previous = event_service._broker
+        event_service._broker = broker
+        self.addCleanup(setattr, event_service, "_broker", previous)
+
+        self.results(self.bulk_update(self.admin, {"ids": ids, "status": Ticket.Status.STARTED}))
+        self.results(self.bulk_update(self.admin, {
+            "ids": ids, "status": Ticket.Status.RESOLVED, "assigned_to": self.other_staff.id,
+        }))
+
+        rollups = dict(
+            TicketDailyRollup.objects
+            .values_list("status")
+            .annotate(total=Sum("count"))
+            .filter(total__gt=0)
+        )
+        self.assertEqual(rollups, {Ticket.Status.ASSIGNED: 9, Ticket.Status.RESOLVED: 3})
+
+        # Time to resolve, counted against the new assignee
+        self.assertEqual(
+            [
+                (row.metric, row.assigned_to_id, QuantileSketch(row.bins).count)
+                for row in TicketSlaSketch.objects.all()
+            ],
+            [(TicketSlaSketch.Metric.TIME_TO_RESOLVE, self.other_staff.id, 3)],
+        )
+
+        [started], [resolved] = [call.args for call in broker.publish.call_args_list]
+        self.assertEqual([(e["ticket"], e["status"]) for e in started], [(i, Ticket.Status.STARTED) for i in ids])
+        self.assertEqual(
+            {(e["ticket"], e["assigned_to"], tuple(e["audience"]["staff"])) for e in resolved},
+            {(i, self.other_staff.id, (self.staff.id, self.other_staff.id)) for i in ids},
+        )
+
+
+# ---------------------------------------------------
+# Activity batching
+# ---------------------------------------------------
+class ActivityBatchTests(TicketTestCase):
+
+    def log(self, old_status, new_status):
+        log_activity(self.tickets[0], self.staff_user, old_status, new_status)
+
+    def test_flushes_in_batches(self):
+        with CaptureQueriesContext(connection) as ctx:
+            with activity_batch(batch_size=3):
+                for _ in range(7):
+                    self.log(Ticket.Status.ASSIGNED, Ticket.Status.STARTED)
+
+        inserts = [q for q in ctx.captured_queries if "tickets_ticketactivity" in q["sql"]]
+        self.assertEqual(len(inserts), 3)  # 3 + 3 + 1 on exit
+        self.assertEqual(TicketActivity.objects.count(), 7)
+
+    def test_nested_rollback_keeps_outer_entries(self):
+        with activity_batch(batch_size=3):
+            self.log(Ticket.Status.CREATED, Ticket.Status.ASSIGNED)
+
+            with self.assertRaises(RuntimeError):
+                with activity_batch():
+                    # Reaches the batch size inside the savepoint
+                    self.log(Ticket.Status.ASSIGNED, Ticket.Status.STARTED)
+                    self.log(Ticket.Status.STARTED, Ticket.Status.RESOLVED)
+                    raise RuntimeError
+
+            self.log(Ticket.Status.ASSIGNED, Ticket.Status.STARTED)
+
+        self.assertEqual(
+            list(TicketActivity.objects.order_by("id").values_list("old_status", "new_status")),
+            [
+                (Ticket.Status.CREATED, Ticket.Status.ASSIGNED),
+                (Ticket.Status.ASSIGNED, Ticket.Status.STARTED),
+            ],
+        )
+
+    def test_outer_rollback_writes_nothing(self):
+        with self.assertRaises(RuntimeError):
+            with activity_batch(batch_size=2):
+                for _ in range(5):
+                    self.log(Ticket.Status.ASSIGNED, Ticket.Status.STARTED)
+                raise RuntimeError
+
+        self.assertFalse(TicketActivity.objects.exists())
+
+
+# ---------------------------------------------------
+# Import
+# ---------------------------------------------------
+class ImportTests(TicketTestCase):
+
+    header = "client,issue,sub_issue,description,status,assigned_to,created_at,assigned_at,resolved_at\n"
+
+    def run_import(self, rows, fmt="csv"):
+        body = self.header + rows if fmt == "csv" else rows
+        return import_tickets(io.StringIO(body), fmt, user=self.admin)
+
+    def test_imports_history(self):
+        report = self.run_import(
+            "acme,Network,VPN,Old outage,RESOLVED,agent,2024-01-10,2024-01-10T09:30:00,2024-01-12\n"
+            "acme,Network,VPN,Still open,,,,,\n"
+        )
+
+        self.assertEqual((report["created"], report["failed"]), (2, 0), report)
+
+        resolved = Ticket.objects.get(description="Old outage")
+        self.assertEqual(resolved.created_at.date(), date(2024, 1, 10))
+        self.assertEqual(resolved.assigned_at.hour, 9)
+        # Reached but not given: the previous lifecycle timestamp
+        self.assertEqual(resolved.started_at, resolved.assigned_at)
+        self.assertEqual(resolved.resolved_at.date(), date(2024, 1, 12))
+        self.assertIsNone(resolved.closed_at)
+
+        # Counted on the day it was created, not the import day
+        self.assertTrue(TicketDailyRollup.objects.filter(
+            day=date(2024, 1, 10), status=Ticket.Status.RESOLVED, count=1,
+        ).exists())
+        self.assertEqual(
+            list(resolved.activities.values_list("old_status", "new_status")),
+            [(Ticket.Status.CREATED, Ticket.Status.RESOLVED)],
+        )
+
+        fresh = Ticket.objects.get(description="Still open")
+        self.assertEqual(fresh.status, Ticket.Status.CREATED)
+        self.assertEqual(fresh.created_at.date(), timezone.localdate())
+
+    def test_stamps_lifecycle_without_dates(self):
+        report = self.run_import(
+            '{"client": "acme", "issue": "Network", "sub_issue": "VPN", '
+            '"description": "Closed", "status": "CLOSED", "assigned_to": "agent"}\n',
+            fmt="ndjson",
+        )
+        self.assertEqual(report["created"], 1, report)
+
+        ticket = Ticket.objects.get(description="Closed")
+        for field in ("assigned_at", "started_at", "resolved_at", "closed_at"):
+            self.assertIsNotNone(getattr(ticket, field), field)
+
+    def test_rejects_invalid_rows(self):
+        report = self.run_import(
+            # Past CREATED without a staff member
+            "acme,Network,VPN,No staff,ASSIGNED,,,,\n"
+            # Out of order
+            "acme,Network,VPN,Backwards,RESOLVED,agent,2024-01-10,2024-01-12,2024-01-11\n"
+            # Timestamp for a status not reached
+            "acme,Network,VPN,Premature,ASSIGNED,agent,,2024-01-10,2024-01-11\n"
+            # Not a date
+            "acme,Network,VPN,Garbled,,,yesterday,,\n"
+            # In the future
+            "acme,Network,VPN,Future,,,2999-01-01,,\n"
+        )
+
+        self.assertEqual((report["created"], report["failed"]), (0, 5), report)
+        self.assertEqual([error["row"] for error in report["errors"]], [2, 3, 4, 5, 6])
+
+    def test_view_status(self):
+        def upload(rows):
+            return self.api(self.admin).post(
+                "/api/tickets/import/",
+                {"file": SimpleUploadedFile("tickets.csv", (self.header + rows).encode())},
+                format="multipart",
+            )
+
+        self.assertEqual(upload("acme,Network,VPN,Fine,,,,,\n").status_code, 201)
+
+        response = upload("nobody,Network,VPN,Unknown client,,,,,\n")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["failed"], 1)
+
+
+# ---------------------------------------------------
+# Export
+# ---------------------------------------------------
+class ExportTests(TicketTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        cls.other_staff_user = User.objects.create_user("agent-2", role=User.Role.STAFF)
+        cls.other_staff = Staff.objects.create(user=cls.other_staff_user, specialty=cls.issue)
+        cls.other_client_user = User.objects.create_user("globex", role=User.Role.CLIENT)
+        cls.other_client = Client.objects.create(
+            user=cls.other_client_user,
+            company_name="Globex",
+            company_type=cls.client_profile.company_type,
+        )
+
+        cls.other_tickets = [
+            Ticket.objects.create(
+                client=cls.other_client,
+                issue=cls.issue,
+                sub_issue=cls.sub_issue,
+                description=f"Printer {i}",
+                assigned_to=cls.other_staff,
+                status=Ticket.Status.ASSIGNED,
+            )
+            for i in range(3)
+        ]
+
+        # Distinct timestamps keep list and export orderings free of ties
+        now = timezone.now()
+        for i, ticket in enumerate(cls.tickets + cls.other_tickets):
+            Ticket.objects.filter(pk=ticket.pk).update(created_at=now - timedelta(hours=i))
+        Ticket.objects.filter(pk__in=[t.pk for t in cls.tickets[:4]]).update(
+            status=Ticket.Status.STARTED,
+        )
+
+    def export(self, export_format, user=None, **params):
+        response = self.api(user or self.admin).get(
+            "/api/tickets/export/", {"export_format": export_format, **params},
+        )
+        self.assertEqual(response.status_code, 200)
+        return b"".join(response.streaming_content).decode()
+
+    def export_ids(self, user, **params):
+        return [json.loads(line)["id"] for line in self.export("ndjson", user, **params).splitlines()]
+
+    def list_ids(self, user, **params):
+        api = self.api(user)
+        response = api.get("/api/tickets/", params)
+        ids = []
+
+        while True:
+            self.assertEqual(response.status_code, 200, response.content)
+            body = response.json()
+            ids += [row["id"] for row in body["results"]]
+            if not body["next"]:
+                return ids
+            response = api.get(body["next"])
+
+    def test_scoped_to_the_client(self):
+        self.assertCountEqual(
+            self.export_ids(self.client_user), [ticket.id for ticket in self.tickets],
+        )
+        self.assertCountEqual(
+            self.export_ids(self.other_client_user), [ticket.id for ticket in self.other_tickets],
+        )
+
+    def test_scoped_to_the_staff_member(self):
+        for user in (self.staff_user, self.other_staff_user):
+            expected = Ticket.objects.for_user(user).values_list("id", flat=True)
+            self.assertCountEqual(self.export_ids(user), expected)
+
+        self.assertNotIn(self.other_tickets[0].id, self.export_ids(self.staff_user))
+
+    def test_same_filters_search_and_ordering_as_the_list(self):
+        for user in (self.admin, self.staff_user, self.client_user):
+            for params in (
+                {},
+                {"status": Ticket.Status.STARTED},
+                {"assigned_to": self.other_staff.id},
+                {"created_after": (timezone.now() - timedelta(hours=5)).date().isoformat()},
+                {"search": "printer"},
+                {"ordering": "created_at"},
+                {"ordering": "-created_at", "status": Ticket.Status.ASSIGNED},
+            ):
+                with self.subTest(user=user.username, **params):
+                    self.assertEqual(self.export_ids(user, **params), self.list_ids(user, **params))
+
+        self.assertEqual(
+            self.export_ids(self.admin, search="printer"),
+            [ticket.id for ticket in self.other_tickets],
+        )
+        self.assertEqual(
+            self.export_ids(self.admin, ordering="created_at")[0], self.other_tickets[-1].id,
+        )
+
+    def test_csv_neutralises_formulas(self):
+        formulas = ["=HYPERLINK(\"http://evil.test\")", "+1+1", "-2+3", "@SUM(A1)"]
+        for ticket, description in zip(self.tickets, formulas):
+            Ticket.objects.filter(pk=ticket.pk).update(description=description)
+
+        rows = {row["id"]: row for row in csv.DictReader(io.StringIO(self.export("csv")))}
+
+        for ticket, description in zip(self.tickets, formulas):
+            self.assertEqual(rows[str(ticket.id)]["description"], "'" + description)
+
+        plain = rows[str(self.tickets[-1].id)]
+        self.assertEqual(plain["description"], "Ticket 11")
+        self.assertEqual(plain["client_phone"], "'+10000000000")
+        self.assertEqual(len(rows), 15)
+
+        # NDJSON is data, not a spreadsheet: values are kept as stored
+        [first] = [
+            row for row in map(json.loads, self.export("ndjson").splitlines())
+            if row["id"] == self.tickets[0].id
+        ]
+        self.assertEqual(first["description"], formulas[0])
+
+
+# ---------------------------------------------------
+# Search
+# ---------------------------------------------------
+class SearchTests(TicketTestCase):
+    """
+    Runs against the test database's full-text backend: the tsvector
+    column on PostgreSQL, the FTS5 table on SQLite.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        for ticket, description in zip(cls.tickets, (
+            "VPN tunnel drops every hour",
+            "Printer jammed on floor two",
+            "VPN client cannot reach the VPN gateway",
+        )):
+            ticket.description = description
+            ticket.save()
+
+    def search(self, text, **params):
+        response = self.api(self.admin).get("/api/tickets/", {"search": text, **params})
+        self.assertEqual(response.status_code, 200, response.content)
+        return [row["id"] for row in response.json()["results"]]
+
+    def test_words_and_prefix(self):
+        self.assertEqual(self.search("printer jammed"), [self.tickets[1].id])
+        # The last word is a prefix while typing
+        self.assertEqual(self.search("print"), [self.tickets[1].id])
+        self.assertEqual(self.search("nothing like this"), [])
+
+    def test_ranked_by_relevance(self):
+        # Two mentions outrank one
+        self.assertEqual(self.search("vpn"), [self.tickets[2].id, self.tickets[0].id])
+        self.assertEqual(
+            self.search("vpn", pagination="keyset"), [self.tickets[2].id, self.tickets[0].id],
+        )
+
+    def test_ticket_number(self):
+        ticket = self.tickets[5]
+        number = str(ticket.ticket_number)
+
+        self.assertEqual(self.search(number), [ticket.id])
+        self.assertEqual(self.search(number.upper()), [ticket.id])
+        self.assertIn(ticket.id, self.search(number[:8]))
+        self.assertIn(ticket.id, self.search(number[:13]))
+        self.assertIn(ticket.id, self.search(ticket.ticket_number.hex[:10]))
+
+        # Too short to tell a number prefix from a word
+        self.assertNotIn(ticket.id, self.search(number[:4]))
+
+
+# ---------------------------------------------------
+# Dashboard rollups
+# ---------------------------------------------------
+@override_settings(TICKET_AUTO_ASSIGN=False)
+class RollupTests(TicketTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        cls.other_staff_user = User.objects.create_user("agent2", role=User.Role.STAFF)
+        cls.other_staff = Staff.objects.create(user=cls.other_staff_user, specialty=cls.issue)
+        cls.other_client_user = User.objects.create_user("globex", role=User.Role.CLIENT)
+        Client.objects.create(
+            user=cls.other_client_user,
+            company_name="Globex",
+            company_type=cls.client_profile.company_type,
+        )
+
+    def rollup_rows(self):
+        return Counter({
+            key: count
+            for *key, count in TicketDailyRollup.objects.values_list(
+                "day", "status", "issue_id", "client_id", "assigned_to_id", "count",
+            )
+            if count
+        })
+
+    def grouped(self, user):
+        """
+        The dashboard summaries, grouped over the tickets themselves.
+        """
+        tickets = Ticket.objects.for_user(user)
+
+        summary = {"total_tickets": tickets.count()}
+        summary.update({
+            status.lower(): tickets.filter(status=status).count() for status in Ticket.Status.values
+        })
+
+        monthly = [
+            {"month": timezone.localtime(row["month"]).date(), "count": row["count"]}
+            for row in tickets.annotate(month=TruncMonth("created_at"))
+            .values("month").annotate(count=Count("id")).order_by("month")
+        ]
+
+        def by(field):
+            return Counter(dict(tickets.values_list(field).annotate(count=Count("id")).order_by()))
+
+        return summary, monthly, by("client__user__username"), by("assigned_to__user__username")
+
+    def summaries(self, user):
+        def by(rows, field):
+            return Counter({row[field]: row["count"] for row in rows})
+
+        return (
+            dashboard_service.get_status_summary(user),
+            list(dashboard_service.get_monthly_summary(user)),
+            by(dashboard_service.get_client_wise_summary(user), "client__user__username"),
+            by(dashboard_service.get_staff_wise_summary(user), "assigned_to__user__username"),
+        )
+
+    def test_incremental_rollups_match_the_tickets(self):
+        # Import: legacy tickets counted on their own days and months
+        report = import_tickets(io.StringIO(
+            "client,issue,sub_issue,description,status,assigned_to,created_at,assigned_at,resolved_at\n"
+            "acme,Network,VPN,Old,RESOLVED,agent,2024-01-10,2024-01-10,2024-01-12\n"
+            "globex,Network,VPN,Older,ASSIGNED,agent2,2023-11-03,2023-11-04,\n"
+            "globex,Network,VPN,Unassigned,,,2024-02-20,,\n"
+        ), "csv", user=self.admin)
+        self.assertEqual(report["failed"], 0, report)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            # Create
+            response = self.api(self.other_client_user).post(
+                "/api/tickets/create/",
+                {"issue": self.issue.id, "sub_issue": self.sub_issue.id, "description": "New"},
+                format="json",
+            )
+            self.assertEqual(response.status_code, 201, response.content)
+
+            # Single transition and reassignment
+            for changes in (
+                {"status": Ticket.Status.STARTED},
+                {"assigned_to": self.other_staff.id},
+            ):
+                response = self.api(self.admin).patch(
+                    f"/api/tickets/{self.tickets[0].id}/update/", changes, format="json",
+                )
+                self.assertEqual(response.status_code, 200, response.content)
+
+            # Bulk
+            response = self.api(self.admin).post("/api/tickets/bulk-update/", {
+                "ids": [t.id for t in self.tickets[1:5]],
+                "status": Ticket.Status.STARTED,
+                "assigned_to": self.other_staff.id,
+            }, format="json")
+            self.assertEqual(response.json()["updated"], 4, response.content)
+
+            # Delete
+            Ticket.objects.get(pk=self.tickets[5].pk).delete()
+            Ticket.objects.get(description="Older").delete()
+
+        for user in (
+            self.admin, self.staff_user, self.other_staff_user, self.client_user, self.other_client_user,
+        ):
+            with self.subTest(user=user.username):
+                self.assertEqual(self.summaries(user), self.grouped(user))
+
+        incremental = self.rollup_rows()
+        rollup_service.rebuild_rollups()
+        self.assertEqual(self.rollup_rows(), incremental)
+
+
+# ---------------------------------------------------
+# Dashboard cache
+# ---------------------------------------------------
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+class DashboardCacheTests(TicketTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def total(self, user):
+        return self.api(user).get("/api/dashboard/summary/").json()["total_tickets"]
+
+    def move(self, ticket, **changes):
+        # Versions are bumped once the write commits
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.api(self.admin).patch(
+                f"/api/tickets/{ticket.id}/update/", changes, format="json",
+            )
+        self.assertEqual(response.status_code, 200, response.content)
+
+    @override_settings(DASHBOARD_CACHE_ENABLED=False)
+    def test_disabled_without_cache_server(self):
+        self.total(self.admin)
+
+        # Every request reads the rollups; invalidation is free
+        with self.assertNumQueries(1):
+            self.assertEqual(self.total(self.admin), 12)
+
+        with self.assertNumQueries(0):
+            dashboard_service.invalidate_dashboards([self.client_profile.id], [self.staff.id])
+
+        self.assertIsNone(cache.get(dashboard_service._version_key(dashboard_service.ADMIN_SCOPE)))
+
+    @override_settings(DASHBOARD_CACHE_ENABLED=True, CACHES=LOCMEM_CACHE)
+    def test_writes_bump_touched_scopes(self):
+        other_user = User.objects.create_user("globex", role=User.Role.CLIENT)
+        other = Client.objects.create(
+            user=other_user, company_name="Globex", company_type=self.client_profile.company_type,
+        )
+
+        for user in (self.admin, self.staff_user, self.client_user, other_user):
+            self.total(user)
+
+        versions = {
+            scope: cache.get(dashboard_service._version_key(scope))
+            for scope in ("admin", f"staff:{self.staff.id}", f"client:{self.client_profile.id}", f"client:{other.id}")
+        }
+
+        # Cache hits: no rollup query
+        with self.assertNumQueries(0):
+            self.assertEqual(self.total(self.admin), 12)
+
+        self.move(self.tickets[0], status=Ticket.Status.STARTED)
+
+        for scope, version in versions.items():
+            bumped = cache.get(dashboard_service._version_key(scope)) != version
+            self.assertEqual(bumped, scope != f"client:{other.id}", scope)
+
+        self.assertEqual(
+            self.api(self.staff_user).get("/api/dashboard/summary/").json()["started"], 1,
+        )
+
+        # Bumping looks nothing up
+        with self.assertNumQueries(0):
+            dashboard_service.invalidate_dashboards([self.client_profile.id], [self.staff.id])
+
+    @override_settings(DASHBOARD_CACHE_ENABLED=True, CACHES=LOCMEM_CACHE)
+    def test_combined_dashboard_per_role(self):
+        other_user = User.objects.create_user("globex", role=User.Role.CLIENT)
+        other = Client.objects.create(
+            user=other_user, company_name="Globex", company_type=self.client_profile.company_type,
+        )
+        Ticket.objects.create(
+            client=other, issue=self.issue, sub_issue=self.sub_issue, description="Globex",
+        )
+
+        def dashboard(user):
+            response = self.api(user).get("/api/dashboard/all/")
+            self.assertEqual(response.status_code, 200)
+            return response.json()
+
+        # Twice each: computed, then served from the scope's cache entry
+        for _ in range(2):
+            admin = dashboard(self.admin)
+            self.assertEqual(set(admin), {"summary", "monthly", "client_wise", "staff_wise"})
+            self.assertEqual(admin["summary"]["total_tickets"], 13)
+            self.assertEqual(
+                {row["assigned_to__user__username"]: row["count"] for row in admin["staff_wise"]},
+                {"agent": 12, None: 1},
+            )
+
+            staff = dashboard(self.staff_user)
+            self.assertEqual(set(staff), {"summary", "monthly", "client_wise"})
+            self.assertEqual(staff["client_wise"], [{"client__user__username": "acme", "count": 12}])
+
+            mine = dashboard(self.client_user)
+            self.assertEqual(set(mine), {"summary", "monthly"})
+            self.assertEqual(mine["summary"]["total_tickets"], 12)
+            self.assertEqual(mine["summary"]["assigned"], 12)
+
+            # Another client's entry never carries acme's numbers
+            theirs = dashboard(other_user)
+            self.assertEqual(set(theirs), {"summary", "monthly"})
+            self.assertEqual(theirs["summary"]["total_tickets"], 1)
+            self.assertEqual(theirs["summary"]["created"], 1)
+            self.assertEqual(sum(row["count"] for row in theirs["monthly"]), 1)
+
+        self.assertIsNotNone(cache.get(dashboard_service._version_key(f"client:{other.id}")))
+
+    @override_settings(DASHBOARD_CACHE_ENABLED=True, CACHES=LOCMEM_CACHE)
+    def test_coalesces_concurrent_misses(self):
+        calls = []
+        results = []
+
+        def compute(user):
+            calls.append(user)
+            time.sleep(0.2)
+            return {"total_tickets": 12}
+
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(dashboard_service.get_cached_summary(compute, self.admin)),
+            )
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"total_tickets": 12}] * 8)
+
+        dashboard_service.bump_versions([dashboard_service.ADMIN_SCOPE])
+        dashboard_service.get_cached_summary(compute, self.admin)
+        self.assertEqual(len(calls), 2)
+
+    @override_settings(DASHBOARD_CACHE_ENABLED=True, CACHES=LOCMEM_CACHE)
+    def test_waits_for_another_process_lease(self):
+        calls = []
+
+        def compute(user):
+            calls.append(user)
+            return {"total_tickets": 12}
+
+        scope = dashboard_service.ADMIN_SCOPE
+        key = dashboard_service._summary_key(compute, scope, dashboard_service._get_version(scope))
+        stripe = dashboard_service._LOCKS[hash(key) % len(dashboard_service._LOCKS)]
+        wait_for = dashboard_service._wait_for
+
+        def waiting(key):
+            # Other keys on the stripe are not blocked meanwhile
+            self.assertFalse(stripe.locked())
+            return wait_for(key)
+
+        # Held by a slow worker in another process
+        cache.add(f"{key}:lease", 1, timeout=60)
+
+        with mock.patch.object(dashboard_service, "COMPUTE_LEASE_TIMEOUT", 0.2), \
+                mock.patch.object(dashboard_service, "_wait_for", waiting):
+            data = dashboard_service.get_cached_summary(compute, self.admin)
+
+        # Computed after the wait, leaving the other worker's lease alone
+        self.assertEqual(data, {"total_tickets": 12})
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.get(f"{key}:lease"), 1)
+
+        async def get():
+            return await dashboard_service.aget_cached_summary(compute, self.admin)
+
+        self.assertEqual(asyncio.run(get()), {"total_tickets": 12})
+        self.assertEqual(len(calls), 1)
+
+
+# ---------------------------------------------------
+# Issue catalog
+# ---------------------------------------------------
+@override_settings(CACHES=LOCMEM_CACHE)
+class CatalogTests(TicketTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+        token = ClaimsRefreshToken.for_user(self.client_user).access_token
+        revocation_index.rebuild()
+        self.api_client = APIClient()
+        self.api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def get(self, url="/api/issues/catalog/", **headers):
+        return self.api_client.get(url, headers=headers)
+
+    def test_tree(self):
+        response = self.get()
+
+        self.assertEqual(response.json(), [{
+            "id": self.issue.id,
+            "name": "Network",
+            "eligible_staff": 1,
+            "sub_issues": [{"id": self.sub_issue.id, "name": "VPN"}],
+        }])
+        self.assertIn("private", response.headers["Cache-Control"])
+
+        # Built once per version
+        with self.assertNumQueries(0):
+            catalog_service.get_catalog()
+
+    def test_etag_changes_with_catalog_rows(self):
+        etag = self.get().headers["ETag"]
+
+        for url in ("/api/issues/catalog/", "/api/async/issues/catalog/"):
+            response = self.get(url, If_None_Match=etag)
+            self.assertEqual(response.status_code, 304, url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            SubIssue.objects.create(issue=self.issue, name="Wi-Fi")
+
+        for url in ("/api/issues/catalog/", "/api/async/issues/catalog/"):
+            response = self.get(url, If_None_Match=etag)
+            self.assertEqual(response.status_code, 200, url)
+            self.assertNotEqual(response.headers["ETag"], etag)
+            self.assertEqual(
+                [row["name"] for row in response.json()[0]["sub_issues"]], ["VPN", "Wi-Fi"], url,
+            )
+
+    def test_staff_changes_invalidate(self):
+        etag = self.get().headers["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.staff.is_active = False
+            self.staff.save()
+
+        response = self.get(If_None_Match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]["eligible_staff"], 0)
+
+    def test_sub_issue_labels(self):
+        SubIssue.objects.create(issue=self.issue, name="Wi-Fi")
+
+        with self.assertNumQueries(1):
+            labels = [str(sub_issue) for sub_issue in SubIssue.objects.with_issue().order_by("name")]
+
+        self.assertEqual(labels, ["Network - VPN", "Network - Wi-Fi"])
+
+
+# ---------------------------------------------------
+# Live events
+# ---------------------------------------------------
+class EventStreamTests(TicketTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.other_staff_user = User.objects.create_user("agent2", role=User.Role.STAFF)
+        cls.other_staff = Staff.objects.create(user=cls.other_staff_user, specialty=cls.issue)
+
+    def setUp(self):
+        broker = event_service._broker
+        event_service._broker = InProcessBroker()
+        self.addCleanup(setattr, event_service, "_broker", broker)
+
+    def connect_token(self, user):
+        response = self.api(user).post("/api/events/connect/")
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()["connect_token"]
+
+    def test_requires_asgi(self):
+        token = self.connect_token(self.admin)
+        response = self.client.get("/api/async/events/", {"connect_token": token})
+        self.assertEqual(response.status_code, 501)
+
+    def test_connect_token_is_single_use(self):
+        token = self.connect_token(self.staff_user)
+
+        self.assertEqual(
+            event_service.redeem_connect_token(token),
+            ((User.Role.STAFF, self.staff.id), None),
+        )
+        self.assertIsNone(event_service.redeem_connect_token(token))
+        self.assertIsNone(event_service.redeem_connect_token("junk"))
+
+    def test_visibility(self):
+        event = event_service.ticket_event(
+            {"id": 1, "status": "ASSIGNED", "client_id": self.client_profile.id, "assigned_to_id": self.staff.id},
+            {"id": 1, "status": "ASSIGNED", "client_id": self.client_profile.id, "assigned_to_id": self.other_staff.id},
+        )
+        scope = event_service.subscriber_scope
+
+        # A reassignment reaches the staff on both sides
+        self.assertTrue(event_service.is_visible(event, scope(self.admin)))
+        self.assertTrue(event_service.is_visible(event, scope(self.staff_user)))
+        self.assertTrue(event_service.is_visible(event, scope(self.other_staff_user)))
+        self.assertTrue(event_service.is_visible(event, scope(self.client_user)))
+        self.assertFalse(event_service.is_visible(event, (User.Role.CLIENT, self.client_profile.id + 1)))
+
+    async def test_fan_out(self):
+        broker = event_service.get_broker()
+        event = {"event": "ticket.updated", "ticket": 1}
+
+        async with broker.subscribe() as first, broker.subscribe() as second:
+            broker.publish([event])
+
+            self.assertEqual(await asyncio.wait_for(first.get(), 1), event)
+            self.assertEqual(await asyncio.wait_for(second.get(), 1), event)
+
+        self.assertEqual(broker.subscriptions, set())
+
+    async def test_closing_the_stream_unsubscribes(self):
+        broker = event_service.get_broker()
+
+        with self.assertNoLogs("asyncio", "ERROR"):
+            stream = event_service.sse_stream((User.Role.ADMIN, None))
+            self.assertIn("event: ready", await anext(stream))
+            self.assertEqual(len(broker.subscriptions), 1)
+
+            # Client disconnected
+            await stream.aclose()
+            self.assertEqual(broker.subscriptions, set())
+
+            # Still open when the event loop shuts down
+            stream = event_service.sse_stream((User.Role.ADMIN, None))
+            await anext(stream)
+            await asyncio.get_running_loop().shutdown_asyncgens()
+            self.assertEqual(broker.subscriptions, set())
+
+    async def test_stream_only_carries_events_in_scope(self):
+        ticket = self.tickets[0]
+        api = AsyncClient()
+
+        staff_stream = aiter((await api.get(
+            "/api/async/events/",
+            {"connect_token": await sync_to_async(self.connect_token)(self.staff_user)},
+        )).streaming_content)
+        other_stream = aiter((await api.get(
+            "/api/async/events/",
+            {"connect_token": await sync_to_async(self.connect_token)(self.other_staff_user)},
+        )).streaming_content)
+
+        self.assertIn(b"event: ready", await anext(staff_stream))
+        self.assertIn(b"event: ready", await anext(other_stream))
+
+        def start():
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.api(self.staff_user).patch(
+                    f"/api/tickets/{ticket.id}/update/", {"status": "STARTED"}, format="json",
+                )
+            self.assertEqual(response.status_code, 200, response.content)
+
+        await sync_to_async(start)()
+
+        received = await asyncio.wait_for(anext(staff_stream), 1)
+        self.assertIn(b"event: ticket.updated", received)
+        self.assertNotIn(b"audience", received)
+
+        with self.assertRaises(TimeoutError):
+            await asyncio.wait_for(anext(other_stream), 0.2)
+
+        # Only connect tokens open a stream
+        response = await api.get("/api/async/events/", {"connect_token": "junk"})
+        self.assertEqual(response.status_code, 401)
+
+
+# ---------------------------------------------------
+# Client notifications
+# ---------------------------------------------------
+@override_settings(
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    CLIENT_NOTIFICATION_CHANNELS=["email", "whatsapp"],
+    NOTIFICATION_BACKENDS={
+        "email": "tickets.notification_backends.EmailBackend",
+        "whatsapp": "tickets.notification_backends.FakeWhatsAppBackend",
+    },
+    NOTIFICATION_RATE_LIMITS={},
+)
+class NotificationTests(TicketTestCase):
+
+    def setUp(self):
+        whatsapp_outbox.clear()
+        notification_service._limiters.clear()
+        self.addCleanup(notification_service._limiters.clear)
+
+    def start(self, ticket):
+        response = self.api(self.staff_user).patch(
+            f"/api/tickets/{ticket.id}/update/", {"status": "STARTED"}, format="json",
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+
+    def test_enqueued_with_the_transition(self):
+        ticket = self.tickets[0]
+        self.start(ticket)
+
+        self.assertEqual(
+            sorted(ClientNotification.objects.values_list("channel", "ticket_status", "state")),
+            [("email", "STARTED", "PENDING"), ("whatsapp", "STARTED", "PENDING")],
+        )
+
+        # No status change, no notification
+        ticket.refresh_from_db()
+        ticket.description = "Still broken"
+        ticket.save()
+        self.assertEqual(ClientNotification.objects.count(), 2)
+
+    def test_sends_and_marks_sent(self):
+        self.start(self.tickets[0])
+
+        self.assertEqual(notification_service.send_batch(), 2)
+
+        self.assertEqual([m.to for m in mail.outbox], [["ops@acme.test"]])
+        self.assertEqual([m.recipient for m in whatsapp_outbox], ["+10000000000"])
+        self.assertEqual(set(ClientNotification.objects.values_list("state", flat=True)), {"SENT"})
+        self.assertEqual(notification_service.send_batch(), 0)
+
+    def test_retries_with_backoff(self):
+        self.start(self.tickets[0])
+        failing = mock.patch.object(FakeWhatsAppBackend, "send", side_effect=RuntimeError("down"))
+
+        before = timezone.now()
+        with failing:
+            notification_service.send_batch()
+
+        notification = ClientNotification.objects.get(channel="whatsapp")
+        self.assertEqual((notification.state, notification.attempts), ("PENDING", 1))
+        self.assertEqual(notification.last_error, "RuntimeError: down")
+        # Full jitter over the first delay
+        delay = timedelta(seconds=notification_service.BACKOFF_BASE_SECONDS)
+        self.assertGreaterEqual(notification.next_attempt_at, before + delay / 2)
+        self.assertLessEqual(notification.next_attempt_at, timezone.now() + delay)
+
+        # Not due again yet
+        self.assertEqual(notification_service.send_batch(), 0)
+
+        for _ in range(notification_service.MAX_ATTEMPTS - 1):
+            ClientNotification.objects.update(next_attempt_at=timezone.now())
+            with failing:
+                notification_service.send_batch()
+
+        notification.refresh_from_db()
+        self.assertEqual(notification.state, "FAILED")
+        self.assertEqual(notification.attempts, notification_service.MAX_ATTEMPTS)
+
+    def test_permanent_error_is_not_retried(self):
+        self.start(self.tickets[0])
+
+        with mock.patch.object(FakeWhatsAppBackend, "send", side_effect=PermanentError("bad number")):
+            notification_service.send_batch()
+
+        notification = ClientNotification.objects.get(channel="whatsapp")
+        self.assertEqual((notification.state, notification.attempts), ("FAILED", 1))
+        self.assertEqual(ClientNotification.objects.get(channel="email").state, "SENT")
+
+    def test_unconfigured_channel_fails_permanently(self):
+        self.start(self.tickets[0])
+
+        with override_settings(NOTIFICATION_BACKENDS={"email": "tickets.notification_backends.EmailBackend"}):
+            self.assertEqual(notification_service.send_batch(), 2)
+
+        self.assertEqual(ClientNotification.objects.get(channel="whatsapp").state, "FAILED")
+        self.assertEqual(ClientNotification.objects.get(channel="email").state, "SENT")
+
+    @override_settings(WHATSAPP_API_URL="", WHATSAPP_API_TOKEN="")
+    def test_whatsapp_without_credentials_fails(self):
+        self.start(self.tickets[0])
+
+        backends = {
+            "email": "tickets.notification_backends.EmailBackend",
+            "whatsapp": "tickets.notification_backends.WhatsAppCloudBackend",
+        }
+        with override_settings(NOTIFICATION_BACKENDS=backends):
+            self.assertEqual(notification_service.send_batch(), 2)
+
+        notification = ClientNotification.objects.get(channel="whatsapp")
+        self.assertEqual(notification.state, "FAILED")
+        self.assertIn("ImproperlyConfigured", notification.last_error)
+        self.assertEqual(whatsapp_outbox, [])
+
+    @override_settings(NOTIFICATION_RATE_LIMITS={"email": 1.0})
+    def test_rate_limited_per_channel(self):
+        for ticket in self.tickets[:3]:
+            self.start(ticket)
+
+        with mock.patch.object(notification_service.time, "sleep") as sleep:
+            notification_service.send_batch()
+
+        # One email a second, WhatsApp unlimited: the 2nd and 3rd email wait
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(len(whatsapp_outbox), 3)
+        self.assertEqual(sleep.call_count, 2)
+        for call in sleep.call_args_list:
+            self.assertAlmostEqual(call.args[0], 1.0, places=2)
+
+
+# ---------------------------------------------------
+# SLA sketches
+# ---------------------------------------------------
+class SlaSketchTests(TicketTestCase):
+
+    def sketch_rows(self):
+        return sorted(
+            (row.month, row.metric, row.issue_id, row.assigned_to_id, sorted(row.bins.items()))
+            for row in TicketSlaSketch.objects.all()
+        )
+
+    def summary(self):
+        response = self.api(self.admin).get("/api/dashboard/sla/staff/")
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_quantiles_within_relative_accuracy(self):
+        rng = random.Random(7)
+        values = sorted(rng.lognormvariate(8, 1.5) for _ in range(5000))
+        sketch = QuantileSketch()
+        for value in values:
+            sketch.add(value)
+
+        for q in (0.5, 0.9, 0.99):
+            # percentile_cont: linear interpolation between ranks
+            rank = q * (len(values) - 1)
+            lower = int(rank)
+            exact = values[lower] + (values[lower + 1] - values[lower]) * (rank - lower)
+            self.assertLess(abs(sketch.quantile(q) - exact) / exact, RELATIVE_ACCURACY * 1.1, q)
+
+        # Merging adds counts; removing samples restores the sketch
+        merged = QuantileSketch(sketch.to_json()).merge(sketch)
+        self.assertEqual(merged.count, 10000)
+        for value in values:
+            merged.add(value, -1)
+        self.assertEqual(merged.bins, sketch.bins)
+
+    def test_maintained_by_ticket_writes(self):
+        ticket = self.tickets[0]
+        now = timezone.now()
+
+        # Raw updates bypass maintenance; a rebuild picks them up
+        Ticket.objects.filter(pk=ticket.pk).update(
+            created_at=now - timedelta(hours=2), assigned_at=now - timedelta(hours=1),
+        )
+        sla_service.rebuild_sketches()
+
+        for status in ("STARTED", "RESOLVED"):
+            response = self.api(self.staff_user).patch(
+                f"/api/tickets/{ticket.id}/update/", {"status": status}, format="json",
+            )
+            self.assertEqual(response.status_code, 200, response.content)
+
+        (row,) = self.summary()
+        self.assertEqual(row["staff"], "agent")
+        self.assertEqual(row["time_to_assign"]["count"], 1)
+        self.assertAlmostEqual(row["time_to_assign"]["p50"], 3600, delta=3600 * RELATIVE_ACCURACY)
+        self.assertEqual(row["time_to_resolve"]["count"], 1)
+        self.assertAlmostEqual(row["time_to_resolve"]["p50"], 7200, delta=7200 * RELATIVE_ACCURACY)
+
+        # Incremental maintenance matches a rebuild from the tickets
+        maintained = self.sketch_rows()
+        sla_service.rebuild_sketches()
+        self.assertEqual(self.sketch_rows(), maintained)
+
+        Ticket.objects.get(pk=ticket.pk).delete()
+        self.assertEqual(self.summary(), [])
+
+    def test_sketched_summary_within_accuracy_of_exact(self):
+        """
+        Sketched percentiles against percentile_cont computed in Python over
+        the same tickets, so the bound holds on every database.
+        """
+        printers = Issue.objects.create(name="Printers")
+        jammed = SubIssue.objects.create(issue=printers, name="Jammed")
+        other_staff = Staff.objects.create(
+            user=User.objects.create_user("agent2", role=User.Role.STAFF), specialty=printers,
+        )
+
+        rng = random.Random(11)
+        now = timezone.now()
+        tickets = self.tickets + [
+            Ticket.objects.create(
+                client=self.client_profile, issue=printers, sub_issue=jammed, description=f"Printer {i}",
+            )
+            for i in range(48)
+        ]
+
+        for ticket in tickets:
+            created_at = now - timedelta(days=rng.uniform(20, 80))
+            assigned_at = created_at + timedelta(seconds=rng.lognormvariate(7, 1.5))
+            resolved_at = (
+                assigned_at + timedelta(seconds=min(rng.lognormvariate(9, 1.5), 10 ** 6))
+                if rng.random() < 0.7 else None
+            )
+            Ticket.objects.filter(pk=ticket.pk).update(
+                status=Ticket.Status.RESOLVED if resolved_at else Ticket.Status.ASSIGNED,
+                assigned_to=self.staff if ticket.issue_id == self.issue.id else other_staff,
+                created_at=created_at,
+                assigned_at=assigned_at,
+                resolved_at=resolved_at,
+            )
+
+        sla_service.rebuild_sketches()
+
+        def percentile_cont(values, q):
+            values = sorted(values)
+            rank = q * (len(values) - 1)
+            lower = int(rank)
+            upper = min(lower + 1, len(values) - 1)
+            return values[lower] + (values[upper] - values[lower]) * (rank - lower)
+
+        durations = defaultdict(list)
+        for row in Ticket.objects.values(
+            "created_at", "assigned_at", "resolved_at", "issue__name", "assigned_to__user__username",
+        ):
+            for metric, (start, end) in sla_service.METRICS.items():
+                if row[end] is None:
+                    continue
+
+                labels = {
+                    "staff": row["assigned_to__user__username"],
+                    "issue": row["issue__name"],
+                    "month": timezone.localdate(row[end]).replace(day=1),
+                }
+                for dimension, label in labels.items():
+                    durations[(dimension, label, metric)].append(
+                        (row[end] - row[start]).total_seconds()
+                    )
+
+        for dimension in sla_service.DIMENSIONS:
+            summary = {row[dimension]: row for row in sla_service.get_sla_summary(self.admin, dimension)}
+            self.assertEqual(
+                set(summary), {label for (dim, label, _) in durations if dim == dimension}, dimension,
+            )
+
+            for label, row in summary.items():
+                for metric in sla_service.METRICS:
+                    values = durations[(dimension, label, metric)]
+                    if not values:
+                        self.assertIsNone(row[metric])
+                        continue
+
+                    self.assertEqual(row[metric]["count"], len(values), (dimension, label, metric))
+
+                    for name, q in sla_service.PERCENTILES.items():
+                        exact = percentile_cont(values, q)
+                        # Plus the summary's rounding to 0.1s
+                        self.assertLessEqual(
+                            abs(row[metric][name] - exact), exact * RELATIVE_ACCURACY + 0.05,
+                            (dimension, label, metric, name),
+                        )
+
+    @skipIf(connection.vendor == "postgresql", "exact percentiles are available")
+    def test_exact_needs_postgresql(self):
+        with self.assertRaises(NotSupportedError):
+            sla_service.get_exact_sla_summary(self.admin, "staff")
+
+        with self.assertRaises(CommandError):
+            call_command("verify_sla_sketches", stdout=io.StringIO())
+
+    @skipUnless(connection.vendor == "postgresql", "percentile_cont needs PostgreSQL")
+    def test_sketches_match_exact_percentiles(self):
+        for dimension in sla_service.DIMENSIONS:
+            self.assertEqual(sla_service.verify_sketches(dimension), [], dimension)
+
+
+# ---------------------------------------------------
+# Archive
+# ---------------------------------------------------
+class ArchiveTests(TicketTestCase):
+
+    def setUp(self):
+        if connection.vendor == "postgresql":
+            # ensure_partitions refuses DDL inside the test transaction
+            with connection.cursor() as cursor:
+                archive_service._create_partition(cursor, timezone.localdate().replace(day=1))
+
+    def close(self, ticket):
+        for user, status in (
+            (self.staff_user, "STARTED"),
+            (self.staff_user, "RESOLVED"),
+            (self.admin, "CLOSED"),
+        ):
+            response = self.api(user).patch(
+                f"/api/tickets/{ticket.id}/update/", {"status": status}, format="json",
+            )
+            self.assertEqual(response.status_code, 200, response.content)
+
+    def test_archive_and_restore_round_trip(self):
+        ticket, recent = self.tickets[:2]
+        self.close(ticket)
+        self.close(recent)
+        Ticket.objects.filter(pk=ticket.pk).update(closed_at=timezone.now() - timedelta(days=400))
+
+        columns = archive_service.TICKET_COLUMNS
+        original = Ticket.objects.values(*columns).get(pk=ticket.pk)
+        activities = list(
+            TicketActivity.objects.filter(ticket=ticket).order_by("id").values(*archive_service.ACTIVITY_COLUMNS)
+        )
+        rollups = list(TicketDailyRollup.objects.order_by("id").values())
+        dashboard = self.api(self.admin).get("/api/dashboard/all/").json()
+
+        self.assertEqual(archive_service.archive_closed_tickets(180), 1)
+
+        self.assertFalse(Ticket.objects.filter(pk=ticket.pk).exists())
+        self.assertEqual(ArchivedTicket.objects.values(*columns).get(pk=ticket.pk), original)
+        self.assertEqual(ArchivedTicketActivity.objects.filter(ticket_id=ticket.pk).count(), len(activities))
+
+        # Still readable, still counted
+        response = self.api(self.client_user).get(f"/api/tickets/{ticket.id}/")
+        self.assertEqual(response.json()["status"], "CLOSED")
+        self.assertEqual(self.api(self.admin).get("/api/dashboard/all/").json(), dashboard)
+
+        self.assertEqual(archive_service.restore_tickets([ticket.pk, recent.pk]), 1)
+
+        self.assertEqual(Ticket.objects.values(*columns).get(pk=ticket.pk), original)
+        self.assertEqual(
+            list(TicketActivity.objects.filter(ticket=ticket).order_by("id").values(*archive_service.ACTIVITY_COLUMNS)),
+            activities,
+        )
+        self.assertFalse(ArchivedTicket.objects.exists())
+        self.assertFalse(ArchivedTicketActivity.objects.exists())
+        self.assertEqual(list(TicketDailyRollup.objects.order_by("id").values()), rollups)
+
+
+@skipUnless(connection.vendor == "postgresql", "archive partitions need PostgreSQL")
+class ArchivePartitionTests(TransactionTestCase):
+
+    def partitions(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT inhrelid::regclass::text FROM pg_inherits "
+                "WHERE inhparent = 'tickets_archivedticket'::regclass ORDER BY 1"
+            )
+            return [name.strip('"') for name, in cursor.fetchall()]
+
+    def test_created_idempotently_outside_transactions(self):
+        months = [date(2024, 1, 15), date(2024, 1, 3), date(2024, 2, 1)]
+
+        archive_service.ensure_partitions(months)
+        archive_service.ensure_partitions(months)
+
+        self.assertEqual(self.partitions(), [
+            "tickets_archivedticket_default",
+            "tickets_archivedticket_p2024_01",
+            "tickets_archivedticket_p2024_02",
+        ])
+
+        with self.assertRaises(TransactionManagementError), transaction.atomic():
+            archive_service.ensure_partitions([date(2024, 3, 1)])
+
+        # Nothing to create: fine inside a transaction
+        with transaction.atomic():
+            archive_service.ensure_partitions(months)
+
+    def test_moves_default_rows_into_new_partition(self):
+        company_type = CompanyType.objects.create(name="Retail")
+        issue = Issue.objects.create(name="Network")
+        sub_issue = SubIssue.objects.create(issue=issue, name="VPN")
+        client = Client.objects.create(
+            user=User.objects.create_user("acme", role=User.Role.CLIENT),
+            company_name="Acme",
+            company_type=company_type,
+        )
+        stamp = timezone.make_aware(datetime(2023, 5, 10))
+        ArchivedTicket.objects.create(
+            id=1, ticket_number=uuid.uuid4(), client=client, issue=issue, sub_issue=sub_issue,
+            description="Old", created_at=stamp, updated_at=stamp,
+        )
+
+        archive_service.ensure_partitions([stamp])
+
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT COUNT(*) FROM "tickets_archivedticket_default"')
+            self.assertEqual(cursor.fetchone()[0], 0)
+            cursor.execute('SELECT COUNT(*) FROM "tickets_archivedticket_p2023_05"')
+            self.assertEqual(cursor.fetchone()[0], 1)
+
+        self.assertEqual(ArchivedTicket.objects.get(pk=1).description, "Old")
@@ -8,19 +8,42 @@ from tickets.views import (
     TicketAllowedTransitionsView,
     FilterStaffByIssueView,
     LogoutView,
+    TicketBulkUpdateView,
+    TicketImportView,
+    TicketExportView,
+    SlaAnalyticsView,
+    AsyncTicketListView,
+    AsyncTicketDetailView,
+    AsyncTicketActivityListView,
+    AsyncDashboardView,
+    TicketEventConnectView,
+    TicketEventStreamView,
 )
 from .views.dashboard_view import (
     DashboardSummaryView,
     MonthlyAnalyticsView,
     ClientWiseAnalyticsView,
     StaffWiseAnalyticsView,
+    DashboardAllView,
 )
 from .views.ticket_views import TicketDetailView
+from .permissions import IsAdminOrStaff, IsAdminUserRole
+from .services.dashboard_service import (
+    get_status_summary,
+    get_monthly_summary,
+    get_client_wise_summary,
+    get_staff_wise_summary,
+    get_dashboard,
+)
+from rest_framework.permissions import IsAuthenticated
 
 urlpatterns = [
     path("tickets/", TicketListView.as_view()),
     path("tickets/create/", TicketCreateView.as_view()),
     path("tickets/<int:pk>/update/", TicketStatusUpdateView.as_view()),
+    path("tickets/bulk-update/", TicketBulkUpdateView.as_view()),
+    path("tickets/import/", TicketImportView.as_view()),
+    path("tickets/export/", TicketExportView.as_view()),
     path("dashboard/", DashboardSummaryView.as_view()),
     path("tickets/<int:ticket_id>/activity/", TicketActivityListView.as_view()),
     path("tickets/<int:ticket_id>/allowed-transitions/", TicketAllowedTransitionsView.as_view()),
@@ -29,6 +52,35 @@ urlpatterns = [
     path("dashboard/monthly/", MonthlyAnalyticsView.as_view()),
     path("dashboard/client-wise/", ClientWiseAnalyticsView.as_view()),
     path("dashboard/staff-wise/", StaffWiseAnalyticsView.as_view()),
+    path("dashboard/all/", DashboardAllView.as_view()),
+    path("dashboard/sla/<str:dimension>/", SlaAnalyticsView.as_view()),
     path("logout/", LogoutView.as_view()),
     path("tickets/<int:pk>/", TicketDetailView.as_view()),
+
+    # Async (ASGI) read paths: same responses as their sync counterparts
+    path("async/tickets/", AsyncTicketListView.as_view()),
+    path("async/tickets/<int:pk>/", AsyncTicketDetailView.as_view()),
+    path("async/tickets/<int:ticket_id>/activity/", AsyncTicketActivityListView.as_view()),
+    path("async/dashboard/", AsyncDashboardView.as_view(compute=get_status_summary)),
+    path("async/dashboard/summary/", AsyncDashboardView.as_view(compute=get_status_summary)),
+    path("async/dashboard/monthly/", AsyncDashboardView.as_view(compute=get_monthly_summary)),
+    path(
+        "async/dashboard/client-wise/",
+        AsyncDashboardView.as_view(
+            compute=get_client_wise_summary,
+            permission_classes=[IsAuthenticated, IsAdminOrStaff],
+        ),
+    ),
+    path(
+        "async/dashboard/staff-wise/",
+        AsyncDashboardView.as_view(
+            compute=get_staff_wise_summary,
+            permission_classes=[IsAuthenticated, IsAdminUserRole],
+        ),
+    ),
+    path("async/dashboard/all/", AsyncDashboardView.as_view(compute=get_dashboard)),
+
+    # Live ticket events (server-sent events; WebSocket in config.asgi)
+    path("events/connect/", TicketEventConnectView.as_view()),
+    path("async/events/", TicketEventStreamView.as_view()),
 ]
\ No newline at end of file
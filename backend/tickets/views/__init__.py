@@ -3,4 +3,10 @@ from .dashboard_view import *
 from .activity_view import *
 from .status_transition_view import *
 from .staff_filter_view import *
-from .auth_view import *
\ No newline at end of file
+from .auth_view import *
+from .bulk_view import *
+from .import_view import *
+from .export_view import *
+from .sla_view import *
+from .async_views import *
+from .event_view import *
@@ -2,13 +2,19 @@ from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import NotFound
 
-from tickets.models import TicketActivity, Ticket
+from tickets.conditional import ConditionalGetMixin
+from tickets.models import ArchivedTicket, ArchivedTicketActivity, TicketActivity, Ticket
+from tickets.pagination import TicketPagination
 from tickets.serializers import TicketActivitySerializer
 
 
-class TicketActivityListView(generics.ListAPIView):
+class TicketActivityListView(ConditionalGetMixin, generics.ListAPIView):
     serializer_class = TicketActivitySerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = TicketPagination
+
+    ordering_fields = ["created_at"]
+    ordering = ["-created_at", "-id"]
 
     def get_queryset(self):
         user = self.request.user
@@ -17,12 +23,16 @@ class TicketActivityListView(generics.ListAPIView):
         # 🔐 Secure ticket lookup using role-based filtering
         ticket = Ticket.objects.for_user(user).filter(id=ticket_id).first()
 
-        if not ticket:
+        if ticket:
+            activities = TicketActivity.objects.filter(ticket=ticket)
+        elif ArchivedTicket.objects.for_user(user).filter(id=ticket_id).exists():
+            activities = ArchivedTicketActivity.objects.filter(ticket_id=ticket_id)
+        else:
             raise NotFound("Ticket not found.")
 
         # Return activities only for accessible ticket
         return (
-            TicketActivity.objects
-            .filter(ticket=ticket)
-            .order_by("-created_at")
+            activities
+            .select_related("changed_by")
+            .order_by("-created_at", "-id")
         )
\ No newline at end of file
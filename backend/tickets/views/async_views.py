@@ -0,0 +1,55 @@
+from rest_framework.exceptions import NotFound
+
+from tickets.async_api import AsyncAPIView, AsyncListView
+from tickets.models import ArchivedTicket, Ticket
+from tickets.serializers import TicketSerializer
+from tickets.services.dashboard_service import aget_cached_summary
+from tickets.views.activity_view import TicketActivityListView
+from tickets.views.ticket_views import TicketListView
+
+
+# ---------------------------------------------------
+# Async (ASGI) read paths, mounted under /api/async/
+# ---------------------------------------------------
+class AsyncTicketListView(AsyncListView):
+    list_view = TicketListView
+
+
+class AsyncTicketActivityListView(AsyncListView):
+    list_view = TicketActivityListView
+
+
+class AsyncTicketDetailView(AsyncAPIView):
+    serializer_class = TicketSerializer
+
+    async def get(self, request, pk):
+        # Long-closed tickets live in the archive (read-only)
+        for model in (Ticket, ArchivedTicket):
+            ticket = await (
+                model.objects
+                .for_user(request.user)
+                .for_serializer(self.serializer_class)
+                .filter(id=pk)
+                .afirst()
+            )
+            if ticket:
+                break
+        else:
+            raise NotFound("Ticket not found.")
+
+        not_modified = self.not_modified(request, ticket.updated_at, ticket._meta.label)
+        if not_modified:
+            return not_modified
+
+        return self.render(self.serializer_class(ticket).data)
+
+
+class AsyncDashboardView(AsyncAPIView):
+    """
+    Any dashboard summary: ``as_view(compute=get_dashboard, ...)``.
+    """
+
+    compute = None
+
+    async def get(self, request):
+        return self.render(await aget_cached_summary(self.compute, request.user))
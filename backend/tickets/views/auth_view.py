@@ -4,11 +4,17 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from accounts.services.revocation_service import revoke_access_token
+
 
 class LogoutView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
+        # The access token used for this call stops working right away
+        if request.auth is not None:
+            revoke_access_token(request.auth)
+
         try:
             refresh_token = request.data.get("refresh")
             token = RefreshToken(refresh_token)
@@ -0,0 +1,31 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+
+from tickets.permissions import IsAdminOrStaff
+from tickets.serializers import TicketBulkUpdateSerializer
+from tickets.services.bulk_service import bulk_update_tickets, UNSET, UPDATED
+
+
+class TicketBulkUpdateView(APIView):
+    permission_classes = [IsAuthenticated, IsAdminOrStaff]
+
+    def post(self, request):
+        serializer = TicketBulkUpdateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        results = bulk_update_tickets(
+            request.user,
+            data["ids"],
+            status=data.get("status"),
+            assigned_to=data.get("assigned_to", UNSET),
+        )
+
+        updated = sum(1 for result in results if result["result"] == UPDATED)
+
+        return Response({
+            "updated": updated,
+            "failed": len(results) - updated,
+            "results": results,
+        })
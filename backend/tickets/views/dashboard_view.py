@@ -8,6 +8,8 @@ from tickets.services.dashboard_service import (
     get_monthly_summary,
     get_client_wise_summary,
     get_staff_wise_summary,
+    get_dashboard,
+    get_cached_summary,
 )
 
 
@@ -15,7 +17,7 @@ class DashboardSummaryView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        data = get_status_summary(request.user)
+        data = get_cached_summary(get_status_summary, request.user)
         return Response(data)
 
 
@@ -23,7 +25,7 @@ class MonthlyAnalyticsView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        data = get_monthly_summary(request.user)
+        data = get_cached_summary(get_monthly_summary, request.user)
         return Response(data)
 
 
@@ -31,7 +33,7 @@ class ClientWiseAnalyticsView(APIView):
     permission_classes = [IsAuthenticated, IsAdminOrStaff]
 
     def get(self, request):
-        data = get_client_wise_summary(request.user)
+        data = get_cached_summary(get_client_wise_summary, request.user)
         return Response(data)
 
 
@@ -39,5 +41,17 @@ class StaffWiseAnalyticsView(APIView):
     permission_classes = [IsAuthenticated, IsAdminUserRole]
 
     def get(self, request):
-        data = get_staff_wise_summary(request.user)
-        return Response(data)
\ No newline at end of file
+        data = get_cached_summary(get_staff_wise_summary, request.user)
+        return Response(data)
+
+
+class DashboardAllView(APIView):
+    """
+    Status counts plus every breakdown the user's role may see, in one
+    response (replaces four separate dashboard requests).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        data = get_cached_summary(get_dashboard, request.user)
+        return Response(data)
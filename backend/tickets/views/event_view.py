@@ -0,0 +1,65 @@
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from rest_framework import exceptions
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from tickets.async_api import AsyncAPIView
+from tickets.exceptions import AsgiRequired
+from tickets.services.event_service import (
+    CONNECT_TOKEN_SECONDS,
+    issue_connect_token,
+    redeem_connect_token,
+    sse_stream,
+)
+
+
+class TicketEventConnectView(APIView):
+    """
+    Trade the access token for a short-lived, single-use connect token
+    for the event stream (``?connect_token=``).
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        # The stream ends when the access token does
+        expires_at = request.auth.get("exp") if request.auth is not None else None
+
+        return Response({
+            "connect_token": issue_connect_token(request.user, expires_at),
+            "expires_in": CONNECT_TOKEN_SECONDS,
+        })
+
+
+class TicketEventStreamView(AsyncAPIView):
+    """
+    Server-sent events for the tickets in the user's scope. ASGI only:
+    under WSGI the open stream would hold a worker thread for its whole
+    life.
+    """
+
+    async def initial(self, request):
+        if not isinstance(request, ASGIRequest):
+            raise AsgiRequired()
+
+        authenticated = await sync_to_async(redeem_connect_token)(
+            request.GET.get("connect_token", "")
+        )
+        if authenticated is None:
+            raise exceptions.AuthenticationFailed("Invalid or expired connect token.")
+
+        self.subscriber_scope, self.expires_at = authenticated
+
+    async def get(self, request):
+        response = StreamingHttpResponse(
+            sse_stream(self.subscriber_scope, self.expires_at),
+            content_type="text/event-stream",
+        )
+        response.headers["Cache-Control"] = "no-cache"
+        # Stop nginx from buffering the stream
+        response.headers["X-Accel-Buffering"] = "no"
+
+        return response
@@ -0,0 +1,46 @@
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from tickets.models import Ticket
+from tickets.services.export_service import CONTENT_TYPES, STREAMERS, export_rows
+from tickets.views.ticket_views import TicketListView
+
+
+class TicketExportView(TicketListView):
+    """
+    Streams the full TicketListView result set (same filters, search and
+    ordering) as CSV or NDJSON, without pagination.
+    """
+
+    pagination_class = None
+
+    # DRF reserves ?format= for renderer selection
+    export_format_param = "export_format"
+
+    def get_queryset(self):
+        # Flat .values() projection; no need for the serializer's joins
+        return Ticket.objects.for_user(self.request.user)
+
+    def list(self, request, *args, **kwargs):
+        export_format = request.query_params.get(self.export_format_param, "csv")
+
+        if export_format not in STREAMERS:
+            raise ValidationError({
+                self.export_format_param: f"Choose one of: {', '.join(STREAMERS)}."
+            })
+
+        queryset = self.filter_queryset(self.get_queryset())
+
+        # Stable order across ties on the chosen ordering
+        queryset = queryset.order_by(*queryset.query.order_by, "-id")
+
+        response = StreamingHttpResponse(
+            STREAMERS[export_format](export_rows(queryset)),
+            content_type=CONTENT_TYPES[export_format],
+        )
+
+        filename = f"tickets-{timezone.now():%Y%m%d-%H%M%S}.{export_format}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+
+        return response
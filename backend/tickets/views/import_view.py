@@ -0,0 +1,48 @@
+import io
+
+from rest_framework import status
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import ValidationError
+
+from tickets.permissions import IsAdminUserRole
+from tickets.services.import_service import (
+    ImportFormatError,
+    detect_format,
+    import_tickets,
+)
+
+
+class TicketImportView(APIView):
+    permission_classes = [IsAuthenticated, IsAdminUserRole]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+
+        if not upload:
+            raise ValidationError({"file": "Upload a CSV or NDJSON file."})
+
+        fmt = request.data.get("format") or detect_format(upload.name)
+
+        # Stream the upload (spooled to disk when large) row by row
+        stream = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+
+        try:
+            report = import_tickets(stream, fmt, user=request.user)
+        except ImportFormatError as exc:
+            raise ValidationError({"format": str(exc)})
+        except UnicodeDecodeError:
+            raise ValidationError({"file": "File must be UTF-8 encoded."})
+
+        if report["created"]:
+            code = status.HTTP_201_CREATED
+        elif report["failed"]:
+            # Nothing imported: every row was rejected
+            code = status.HTTP_400_BAD_REQUEST
+        else:
+            code = status.HTTP_200_OK
+
+        return Response(report, status=code)
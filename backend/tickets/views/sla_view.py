@@ -0,0 +1,36 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import NotFound
+
+from tickets.permissions import IsAdminOrStaff
+from tickets.services.dashboard_service import get_cached_summary
+from tickets.services.sla_service import (
+    get_sla_by_staff,
+    get_sla_by_issue,
+    get_sla_by_month,
+)
+
+
+SLA_SUMMARIES = {
+    "staff": get_sla_by_staff,
+    "issue": get_sla_by_issue,
+    "month": get_sla_by_month,
+}
+
+
+class SlaAnalyticsView(APIView):
+    """
+    p50/p90/p99 time-to-assign and time-to-resolve (seconds) grouped by
+    staff, issue or month. STAFF see their own tickets only.
+    """
+    permission_classes = [IsAuthenticated, IsAdminOrStaff]
+
+    def get(self, request, dimension):
+        summary = SLA_SUMMARIES.get(dimension)
+
+        if summary is None:
+            raise NotFound(f"Unknown SLA breakdown {dimension!r}.")
+
+        data = get_cached_summary(summary, request.user)
+        return Response(data)
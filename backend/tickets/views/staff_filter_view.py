@@ -4,7 +4,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import PermissionDenied, NotFound
 
 from tickets.models import Ticket
-from tickets.models.staff import Staff  # adjust if needed
+from tickets.services.assignment_service import ranked_staff
 from accounts.models import User
 
 
@@ -29,17 +29,5 @@ class FilterStaffByIssueView(APIView):
         if not ticket:
             raise NotFound("Ticket not found.")
 
-        # 👇 Fetch Staff model (not User)
-        staff_queryset = Staff.objects.filter(
-            specialty=ticket.issue
-        ).select_related("user")
-
-        data = [
-            {
-                "id": staff.user.id,
-                "username": staff.user.username
-            }
-            for staff in staff_queryset
-        ]
-
-        return Response(data)
\ No newline at end of file
+        # Active staff for the ticket's issue, least loaded first
+        return Response(ranked_staff(ticket.issue_id))
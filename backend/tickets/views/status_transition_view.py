@@ -3,7 +3,7 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import NotFound
 
-from tickets.models import Ticket
+from tickets.models import ArchivedTicket, Ticket
 
 
 class TicketAllowedTransitionsView(APIView):
@@ -20,6 +20,10 @@ class TicketAllowedTransitionsView(APIView):
             .first()
         )
 
+        if not ticket:
+            # Archived tickets are CLOSED and read-only
+            ticket = ArchivedTicket.objects.for_user(user).filter(id=ticket_id).first()
+
         if not ticket:
             raise NotFound("Ticket not found.")
 
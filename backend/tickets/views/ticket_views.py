@@ -1,7 +1,14 @@
-from rest_framework import generics, permissions, filters
+from rest_framework import generics, permissions
 from django_filters.rest_framework import DjangoFilterBackend
 from django_filters import rest_framework as django_filters
-from tickets.models import Ticket, Client
+from tickets.conditional import ConditionalGetMixin
+from tickets.filters import TicketOrderingFilter, TicketSearchFilter
+from tickets.models import ArchivedTicket, Ticket, Client
+from tickets.pagination import TicketPagination
+from tickets.services.activity_service import activity_batch, log_activity
+from tickets.services import notification_service
+from tickets.services.assignment_service import auto_assignment
+from tickets.services.transition_service import apply_ticket_update
 from tickets.serializers import (
     TicketSerializer,
     TicketCreateSerializer,
@@ -12,11 +19,15 @@ from rest_framework.exceptions import PermissionDenied
 from rest_framework.exceptions import NotFound
 
 
-class TicketDetailView(generics.RetrieveAPIView):
+class TicketDetailView(ConditionalGetMixin, generics.RetrieveAPIView):
     serializer_class = TicketSerializer
 
     def get_queryset(self):
-        return Ticket.objects.for_user(self.request.user)
+        return (
+            Ticket.objects
+            .for_user(self.request.user)
+            .for_serializer(self.serializer_class)
+        )
 
     def get_object(self):
         queryset = self.get_queryset()
@@ -24,6 +35,16 @@ class TicketDetailView(generics.RetrieveAPIView):
 
         ticket = queryset.filter(id=ticket_id).first()
 
+        if not ticket:
+            # Long-closed tickets live in the archive (read-only)
+            ticket = (
+                ArchivedTicket.objects
+                .for_user(self.request.user)
+                .for_serializer(self.serializer_class)
+                .filter(id=ticket_id)
+                .first()
+            )
+
         if not ticket:
             raise NotFound("Ticket not found.")
 
@@ -43,13 +64,14 @@ class TicketFilter(django_filters.FilterSet):
         fields = ["status", "issue", "assigned_to"]
 
 
-class TicketListView(generics.ListAPIView):
+class TicketListView(ConditionalGetMixin, generics.ListAPIView):
     serializer_class = TicketSerializer
+    pagination_class = TicketPagination
 
     filter_backends = [
         DjangoFilterBackend,
-        filters.SearchFilter,
-        filters.OrderingFilter,
+        TicketSearchFilter,
+        TicketOrderingFilter,
     ]
 
     filterset_class = TicketFilter
@@ -59,7 +81,11 @@ class TicketListView(generics.ListAPIView):
     ordering = ["-created_at"]
 
     def get_queryset(self):
-        return Ticket.objects.for_user(self.request.user)
+        return (
+            Ticket.objects
+            .for_user(self.request.user)
+            .for_serializer(self.serializer_class)
+        )
 
 
 class TicketCreateView(generics.CreateAPIView):
@@ -69,10 +95,22 @@ class TicketCreateView(generics.CreateAPIView):
         user = self.request.user
 
         if user.role != User.Role.CLIENT:
-            raise permissions.PermissionDenied("Only clients can create tickets.")
+            raise PermissionDenied("Only clients can create tickets.")
+
+        # Claims-authenticated users carry their client id
+        client_id = getattr(user, "client_id", None)
+        if client_id is None:
+            client_id = Client.objects.values_list("id", flat=True).get(user_id=user.pk)
+
+        # Least-loaded eligible staff, if any (TICKET_AUTO_ASSIGN)
+        assignment = auto_assignment(serializer.validated_data["issue"].id)
+
+        with activity_batch():
+            ticket = serializer.save(client_id=client_id, **assignment)
 
-        client = Client.objects.get(user=user)
-        serializer.save(client=client)
+            if assignment:
+                log_activity(ticket, None, Ticket.Status.CREATED, ticket.status)
+                notification_service.enqueue([(ticket.pk, client_id, ticket.status)])
 
 
 
@@ -84,7 +122,7 @@ class TicketStatusUpdateView(generics.UpdateAPIView):
         return Ticket.objects.for_user(self.request.user)
 
     def perform_update(self, serializer):
-        ticket = self.get_object()
+        ticket = serializer.instance
         user = self.request.user
 
         # CLIENT cannot update
@@ -95,19 +133,5 @@ class TicketStatusUpdateView(generics.UpdateAPIView):
         if user.role == User.Role.STAFF and serializer.validated_data.get("status") == Ticket.Status.CLOSED:
             raise PermissionDenied("Staff cannot close tickets.")
 
-        # Get old status before saving
-        old_status = ticket.status
-        
-        # Save the updated ticket
-        serializer.save()
-        
-        # Log activity if status changed
-        new_status = serializer.validated_data.get("status", ticket.status)
-        if old_status != new_status:
-            from tickets.models import TicketActivity
-            TicketActivity.objects.create(
-                ticket=ticket,
-                changed_by=user,
-                old_status=old_status,
-                new_status=new_status
-            )
\ No newline at end of file
+        # Conditional UPDATE + activity log in one transaction (409 on a lost race)
+        apply_ticket_update(ticket, user, serializer.validated_data)
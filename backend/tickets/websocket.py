@@ -0,0 +1,98 @@
+"""
+WebSocket flavour of the live ticket event stream, for clients that
+prefer it to SSE. Django has no WebSocket support of its own, so this is
+a bare ASGI application routed from config.asgi: it accepts the socket
+after redeeming ``?connect_token=`` (see event_service), then sends
+each event in the user's scope as a JSON text frame.
+"""
+import asyncio
+import json
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
+from tickets.services.event_service import get_broker, redeem_connect_token, scoped_events
+
+
+PATH = "/api/async/events/ws/"
+
+# Close codes in the private 4000-4999 range, mirroring HTTP statuses
+UNAUTHORIZED = 4401
+NOT_FOUND = 4404
+
+
+def authenticate(connect_token):
+    """
+    ``(scope, expires_at)`` for a connect token, or None.
+    """
+    try:
+        return redeem_connect_token(connect_token)
+    finally:
+        # Not inside a request: nothing else closes this thread's connection
+        close_old_connections()
+
+
+async def ticket_events_socket(scope, receive, send):
+    message = await receive()
+    if message["type"] != "websocket.connect":
+        return
+
+    if scope["path"] != PATH:
+        await send({"type": "websocket.close", "code": NOT_FOUND})
+        return
+
+    connect_token = parse_qs(scope["query_string"].decode()).get("connect_token", [""])[0]
+    authenticated = await sync_to_async(authenticate)(connect_token) if connect_token else None
+
+    if authenticated is None:
+        await send({"type": "websocket.close", "code": UNAUTHORIZED})
+        return
+
+    async with get_broker().subscribe() as subscription:
+        # Subscribed first: clients refetch once accepted and miss nothing
+        await send({"type": "websocket.accept"})
+
+        # Incoming frames are ignored; we only watch for the disconnect
+        disconnected = asyncio.ensure_future(_wait_for_disconnect(receive))
+
+        try:
+            events = scoped_events(subscription, *authenticated)
+
+            async for event in _until(disconnected, events):
+                if event is not None:
+                    await send({"type": "websocket.send", "text": json.dumps(event)})
+
+            if not disconnected.done():
+                # The token expired: clients reconnect with a fresh one
+                await send({"type": "websocket.close", "code": UNAUTHORIZED})
+        finally:
+            disconnected.cancel()
+
+
+async def _wait_for_disconnect(receive):
+    while (await receive())["type"] != "websocket.disconnect":
+        pass
+
+
+async def _until(done, events):
+    """
+    Items of ``events`` until it ends or the ``done`` future completes.
+    """
+    events = aiter(events)
+
+    while True:
+        next_event = asyncio.ensure_future(anext(events))
+        await asyncio.wait({next_event, done}, return_when=asyncio.FIRST_COMPLETED)
+
+        if not next_event.done():
+            next_event.cancel()
+            await asyncio.gather(next_event, return_exceptions=True)
+            return
+
+        try:
+            event = next_event.result()
+        except StopAsyncIteration:
+            return
+
+        yield event
@@ -1,7 +1,7 @@
 "use client";
 
 import { useEffect, useState } from "react";
-import { apiGet } from "@/lib/api";
+import { apiGet, subscribeTicketEvents } from "@/lib/api";
 import {
   BarChart,
   Bar,
@@ -23,54 +23,25 @@ export default function DashboardPage() {
     setRole(localStorage.getItem("user_role"));
   }, []);
 
+  // One request returns every breakdown the user's role may see
+  const [dashboard, setDashboard] = useState<any>(null);
+
+  useEffect(() => {
+    fetchData();
+
+    // Live counts: refetch (without the spinner) when tickets change
+    return subscribeTicketEvents(() => fetchData(false));
+  }, []);
+
   useEffect(() => {
-    fetchData(activeTab);
-  }, [activeTab]);
+    if (dashboard) setChartData(formatData(activeTab, dashboard));
+  }, [activeTab, dashboard]);
 
-  async function fetchData(tab: string) {
-    setLoading(true);
+  async function fetchData(showLoading = true) {
+    if (showLoading) setLoading(true);
 
     try {
-      let endpoint = "";
-
-      if (tab === "status") endpoint = "/api/dashboard/summary/";
-      if (tab === "monthly") endpoint = "/api/dashboard/monthly/";
-      if (tab === "client") endpoint = "/api/dashboard/client-wise/";
-      if (tab === "staff") endpoint = "/api/dashboard/staff-wise/";
-
-      const data = await apiGet(endpoint);
-
-      // Transform data to common format for chart
-      let formatted: any[] = [];
-
-      if (tab === "status") {
-        formatted = [
-          { name: "CREATED", value: data.created },
-          { name: "ASSIGNED", value: data.assigned },
-          { name: "STARTED", value: data.started },
-          { name: "RESOLVED", value: data.resolved },
-          { name: "CLOSED", value: data.closed },
-        ];
-      } else if (tab === "monthly") {
-        formatted = data.map((item: any) => ({
-          name: new Date(item.month).toLocaleString("default", {
-            month: "short",
-          }),
-          value: item.count,
-        }));
-      } else if (tab === "client") {
-        formatted = data.map((item: any) => ({
-          name: item.client__user__username,
-          value: item.count,
-        }));
-      } else if (tab === "staff") {
-        formatted = data.map((item: any) => ({
-          name: item.assigned_to__user__username || "Unassigned",
-          value: item.count,
-        }));
-      }
-
-      setChartData(formatted);
+      setDashboard(await apiGet("/api/dashboard/all/"));
     } catch (error) {
       console.error("Dashboard fetch error:", error);
       setChartData([]);
@@ -79,6 +50,45 @@ export default function DashboardPage() {
     }
   }
 
+  // Transform data to common format for chart
+  function formatData(tab: string, dashboard: any) {
+    if (tab === "status") {
+      const data = dashboard.summary;
+      return [
+        { name: "CREATED", value: data.created },
+        { name: "ASSIGNED", value: data.assigned },
+        { name: "STARTED", value: data.started },
+        { name: "RESOLVED", value: data.resolved },
+        { name: "CLOSED", value: data.closed },
+      ];
+    }
+
+    if (tab === "monthly") {
+      return dashboard.monthly.map((item: any) => ({
+        name: new Date(item.month).toLocaleString("default", {
+          month: "short",
+        }),
+        value: item.count,
+      }));
+    }
+
+    if (tab === "client") {
+      return (dashboard.client_wise || []).map((item: any) => ({
+        name: item.client__user__username,
+        value: item.count,
+      }));
+    }
+
+    if (tab === "staff") {
+      return (dashboard.staff_wise || []).map((item: any) => ({
+        name: item.assigned_to__user__username || "Unassigned",
+        value: item.count,
+      }));
+    }
+
+    return [];
+  }
+
   return (
     <div className="space-y-10">
       <h1 className="text-3xl font-bold text-slate-800">
@@ -2,7 +2,7 @@
 
 import { useEffect, useState } from "react";
 import { useParams, useRouter } from "next/navigation";
-import { apiGet, apiPatch } from "@/lib/api";
+import { apiGet, apiPatch, subscribeTicketEvents } from "@/lib/api";
 
 interface Ticket {
   id: number;
@@ -34,7 +34,9 @@ interface Activity {
 
 interface Staff {
   id: number;
+  staff_id: number;
   username: string;
+  load: number;
 }
 
 export default function TicketDetailPage() {
@@ -69,6 +71,30 @@ export default function TicketDetailPage() {
     );
   }, [id]);
 
+  // Refresh when this ticket changes elsewhere (no polling)
+  useEffect(() => {
+    return subscribeTicketEvents((events) => {
+      if (
+        events.some(
+          (e) => e.event === "ready" || e.event === "resync" || e.ticket === Number(id)
+        )
+      ) {
+        refreshTicket();
+      }
+    });
+  }, [id]);
+
+  async function refreshTicket() {
+    setTicket(await apiGet(`/api/tickets/${id}/`));
+
+    const activitiesData = await apiGet(`/api/tickets/${id}/activity/`);
+    setActivities(activitiesData.results || activitiesData);
+
+    const transitionsData = await apiGet(`/api/tickets/${id}/allowed-transitions/`);
+    setAllowedStatuses(transitionsData.allowed_statuses);
+    setSelectedStatus(transitionsData.current_status);
+  }
+
   async function updateTicket() {
     setLoadingUpdate(true);
     try {
@@ -83,18 +109,8 @@ export default function TicketDetailPage() {
       
       await apiPatch(`/api/tickets/${id}/update/`, updateData);
 
-      // Refetch ticket data
-      const updatedTicket = await apiGet(`/api/tickets/${id}/`);
-      setTicket(updatedTicket);
-      
-      // Refetch activities
-      const activitiesData = await apiGet(`/api/tickets/${id}/activity/`);
-      setActivities(activitiesData.results || activitiesData);
-      
-      // Refetch allowed statuses
-      const transitionsData = await apiGet(`/api/tickets/${id}/allowed-transitions/`);
-      setAllowedStatuses(transitionsData.allowed_statuses);
-      setSelectedStatus(transitionsData.current_status);
+      // Refetch ticket, activities and allowed statuses
+      await refreshTicket();
       
       // Reset selected staff
       setSelectedStaff("");
@@ -288,8 +304,8 @@ export default function TicketDetailPage() {
               >
                 <option value="">Select staff</option>
                 {eligibleStaff.map((staff) => (
-                  <option key={staff.id} value={staff.id}>
-                    {staff.username}
+                  <option key={staff.staff_id} value={staff.staff_id}>
+                    {staff.username} ({staff.load} open)
                   </option>
                 ))}
               </select>
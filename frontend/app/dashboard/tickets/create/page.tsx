@@ -15,6 +15,11 @@ interface SubIssue {
   issue: number;
 }
 
+interface CatalogIssue extends Issue {
+  eligible_staff: number;
+  sub_issues: { id: number; name: string }[];
+}
+
 export default function CreateTicketPage() {
   const router = useRouter();
 
@@ -37,30 +42,17 @@ export default function CreateTicketPage() {
         setLoading(true);
         setError(null);
         
-        console.log("🔄 Fetching issues from /api/issues/...");
-        const issuesData = await apiGet("/api/issues/");
-        console.log("✅ Issues response:", issuesData);
-        console.log("   Type:", typeof issuesData);
-        console.log("   Is Array:", Array.isArray(issuesData));
-        
-        // Handle both array and paginated responses
-        const issuesList = Array.isArray(issuesData) ? issuesData : (issuesData.results || []);
-        console.log("📋 Issues list:", issuesList);
-        console.log("   Count:", issuesList.length);
-        setIssues(issuesList);
+        // One cached request: issues with their sub-issues nested
+        const catalog: CatalogIssue[] = await apiGet("/api/issues/catalog/");
 
-        console.log("Fetching sub-issues from /api/subissues/...");
-        const subIssuesData = await apiGet("/api/subissues/");
-        console.log("Sub-issues response:", subIssuesData);
-        console.log("   Type:", typeof subIssuesData);
-        console.log("   Is Array:", Array.isArray(subIssuesData));
-        
-        // Handle both array and paginated responses
-        const subIssuesList = Array.isArray(subIssuesData) ? subIssuesData : (subIssuesData.results || []);
-        console.log("📋 Sub-issues list:", subIssuesList);
-        console.log("   Count:", subIssuesList.length);
+        const issuesList = catalog.map(({ id, name }) => ({ id, name }));
+        const subIssuesList = catalog.flatMap((issue) =>
+          issue.sub_issues.map((sub) => ({ ...sub, issue: issue.id }))
+        );
+
+        setIssues(issuesList);
         setSubIssues(subIssuesList);
-        
+
         if (issuesList.length === 0) {
           const msg = "No issues available. Please create issues first in the admin panel.";
           console.error("⚠️", msg);
@@ -1,7 +1,7 @@
 "use client";
 
 import { useEffect, useState } from "react";
-import { apiGet } from "@/lib/api";
+import { apiGet, subscribeTicketEvents } from "@/lib/api";
 import { useRouter } from "next/navigation";
 
 interface Ticket {
@@ -17,7 +17,7 @@ export default function TicketsPage() {
   const [loading, setLoading] = useState(true);
   const router = useRouter();
 
-  useEffect(() => {
+  function fetchTickets() {
     apiGet("/api/tickets/")
       .then((data) => {
         setTickets(data.results);
@@ -27,6 +27,13 @@ export default function TicketsPage() {
         console.error(err);
         setLoading(false);
       });
+  }
+
+  useEffect(() => {
+    fetchTickets();
+
+    // Refetch when a ticket in scope is created or changes
+    return subscribeTicketEvents(fetchTickets);
   }, []);
 
   if (loading)
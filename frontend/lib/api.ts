@@ -1,5 +1,8 @@
 const API_BASE = process.env.NEXT_PUBLIC_API_URL;
 
+// Base URL of the ASGI app serving live events (unset: no live updates)
+const EVENTS_BASE = process.env.NEXT_PUBLIC_EVENTS_URL;
+
 function getAccessToken() {
   return localStorage.getItem("access");
 }
@@ -111,4 +114,101 @@ export async function apiPatch(endpoint: string, body: any) {
     throw new Error(errorMsg);
   }
   return res.json();
-}
\ No newline at end of file
+}
+export interface TicketEvent {
+  // "ready" (reconnected: changes may have been missed), "resync",
+  // "ticket.created", "ticket.updated" or "ticket.deleted"
+  event: string;
+  ticket?: number;
+  status?: string | null;
+  old_status?: string | null;
+  assigned_to?: number | null;
+}
+
+const TICKET_EVENT_TYPES = [
+  "ready",
+  "resync",
+  "ticket.created",
+  "ticket.updated",
+  "ticket.deleted",
+];
+
+// Live ticket events in the user's scope (server-sent events), delivered
+// in batches so a burst of changes triggers one refetch. The stream is
+// served by the ASGI app only, so nothing subscribes unless
+// NEXT_PUBLIC_EVENTS_URL points at it. Returns an unsubscribe function.
+export function subscribeTicketEvents(
+  onEvents: (events: TicketEvent[]) => void,
+  batchMs = 300
+) {
+  if (!EVENTS_BASE) return () => {};
+
+  let source: EventSource | null = null;
+  let pending: TicketEvent[] = [];
+  let timer: ReturnType<typeof setTimeout> | null = null;
+  let closed = false;
+  let connected = false;
+
+  function deliver(event: TicketEvent) {
+    pending.push(event);
+
+    if (!timer) {
+      timer = setTimeout(() => {
+        const events = pending;
+        pending = [];
+        timer = null;
+        if (!closed) onEvents(events);
+      }, batchMs);
+    }
+  }
+
+  function retry() {
+    if (!closed) setTimeout(connect, 3000);
+  }
+
+  async function connect() {
+    // EventSource cannot send headers and URLs end up in access logs, so
+    // the access token is traded for a short-lived, single-use connect
+    // token (refreshing the access token if needed)
+    let connectToken: string;
+    try {
+      connectToken = (await apiPost("/api/events/connect/", {})).connect_token;
+    } catch {
+      retry();
+      return;
+    }
+
+    if (closed) return;
+
+    source = new EventSource(
+      `${EVENTS_BASE}/api/async/events/?connect_token=${encodeURIComponent(connectToken)}`
+    );
+
+    TICKET_EVENT_TYPES.forEach((type) =>
+      source!.addEventListener(type, (e) => {
+        // The first connect follows the page's own initial fetch
+        if (type === "ready" && !connected) {
+          connected = true;
+          return;
+        }
+        deliver({ ...JSON.parse((e as MessageEvent).data), event: type });
+      })
+    );
+
+    source.onerror = () => {
+      // A connect token is good for one connection: every reconnect
+      // (dropped stream, expired access token) needs a new one
+      source?.close();
+      source = null;
+      retry();
+    };
+  }
+
+  connect();
+
+  return () => {
+    closed = true;
+    source?.close();
+    if (timer) clearTimeout(timer);
+  };
+}